@@ -10,3 +10,5 @@ from .models.financial import *
 from .models.supplier import *
 from .models.delivery import *
 from .models.marketing import *
+from .models.ledger import *
+from .models.customer_summary import *
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+# All caches, so commits can invalidate the ones that depend on written tables
+_registry = []
+# Committed writes per table since startup (the ETags in app/core/etag.py)
+_versions = Counter()
+_versions_lock = threading.Lock()
+
+
+class ResultCache:
+    """
+    In-process result cache with a TTL and size-bounded LRU eviction.
+
+    Entries are keyed by endpoint name plus parameters and are dropped whenever
+    a committed transaction wrote to one of the tables in `tables`.
+    """
+
+    def __init__(self, name: str, tables, maxsize: int = 128, ttl: float = 60.0):
+        self.name = name
+        self.tables = set(tables)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so results computed from pre-commit
+        # data are not stored after the cache was cleared
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        _registry.append(self)
+
+    @staticmethod
+    def make_key(endpoint: str, **params):
+        return (endpoint,) + tuple(sorted(params.items()))
+
+    def get_or_compute(self, compute, endpoint: str, **params):
+        key = self.make_key(endpoint, **params)
+        hit, value, generation = self._lookup(key)
+        if hit:
+            return value
+        value = compute()
+        self._store(key, value, generation)
+        return value
+
+    async def aget_or_compute(self, compute, endpoint: str, **params):
+        """Like get_or_compute, for a `compute` that returns an awaitable."""
+        key = self.make_key(endpoint, **params)
+        hit, value, generation = self._lookup(key)
+        if hit:
+            return value
+        value = await compute()
+        self._store(key, value, generation)
+        return value
+
+    def _lookup(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, entry[1], None
+            self.misses += 1
+            return False, None, self._generation
+
+    def _store(self, key, value, generation):
+        with self._lock:
+            if generation == self._generation:
+                self._data[key] = (time.monotonic() + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+# Dashboard and financial summary endpoints
+dashboard_cache = ResultCache(
+    "dashboard",
+    tables=["financial_records", "customers"],
+    maxsize=settings.CACHE_MAX_ENTRIES,
+    ttl=settings.CACHE_TTL_SECONDS
+)
+
+# Inventory analytics (valuation)
+inventory_cache = ResultCache(
+    "inventory",
+    tables=["inventory"],
+    maxsize=settings.CACHE_MAX_ENTRIES,
+    ttl=settings.CACHE_TTL_SECONDS
+)
+
+
+def mark_dirty(db: Session, *tables: str):
+    """Record that this session wrote to `tables`; caches are cleared on commit."""
+    # Rollback events only fire for a begun transaction; without one a rollback
+    # would leave these marks behind for the session's next commit
+    if not db.in_transaction():
+        db.begin()
+    db.info.setdefault("dirty_tables", set()).update(tables)
+
+def table_versions(*tables: str):
+    """How many committed transactions have written to each of `tables`."""
+    with _versions_lock:
+        return tuple(_versions[table] for table in tables)
+
+def cache_stats():
+    return [cache.stats() for cache in _registry]
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    dirty = session.info.pop("dirty_tables", None)
+    if not dirty:
+        return
+    with _versions_lock:
+        _versions.update(dirty)
+    for cache in _registry:
+        if cache.tables & dirty:
+            cache.clear()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("dirty_tables", None)
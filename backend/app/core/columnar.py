@@ -0,0 +1,145 @@
+"""
+Arrow IPC / Parquet exports for offline analytics.
+
+A table is read through a server-side cursor EXPORT_BATCH_SIZE rows at a
+time and written as typed Arrow record batches: dates stay dates, Numeric
+prices become decimals, ids stay integers. Partitioned exports write one file
+per month of the table's date column (hive style, month=2024-05/part-0.parquet)
+from a query ordered on that column, so only one file is open at a time.
+
+pyarrow is optional; without it the functions raise ColumnarUnavailable.
+Used by /exports and export_columnar.py.
+"""
+import os
+from itertools import groupby
+from typing import Literal, Optional
+from datetime import date
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric
+from sqlalchemy.orm import Session
+from app.core.export import EXPORT_BATCH_SIZE
+from app.crud import customer, delivery, financial, inventory
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+ColumnarFormat = Literal["parquet", "arrow"]
+# Partition for rows whose date is NULL (the name Hive and pyarrow use)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+class ColumnarUnavailable(RuntimeError):
+    pass
+
+
+# table name -> (export statement builder, date column used for month partitions)
+TABLES = {
+    "financial_records": (financial.export_statement, "date"),
+    "customers": (customer.export_statement, "purchase_date"),
+    "delivery_logs": (delivery.export_statement, "date"),
+    "inventory": (inventory.export_statement, "date_added"),
+}
+
+
+def require_pyarrow():
+    if pa is None:
+        raise ColumnarUnavailable("Columnar exports need pyarrow (pip install pyarrow)")
+
+def _arrow_type(column_type):
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Numeric) and not isinstance(column_type, Float):
+        return pa.decimal128(column_type.precision or 38, column_type.scale or 0)
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+def arrow_schema(stmt):
+    """Arrow schema for the columns of a select, from their SQLAlchemy types."""
+    require_pyarrow()
+    return pa.schema([pa.field(c.key, _arrow_type(c.type)) for c in stmt.selected_columns])
+
+def _batch(schema, rows):
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.record_batch(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema
+    )
+
+def _writer(path: str, schema, fmt: str):
+    if fmt == "parquet":
+        return pq.ParquetWriter(path, schema)
+    return pa.ipc.new_file(path, schema)
+
+def _month(value) -> str:
+    return value.strftime("%Y-%m") if value is not None else NULL_PARTITION
+
+def _statement(table: str, date_from: Optional[date], date_to: Optional[date], partition: bool):
+    if table not in TABLES:
+        raise ValueError(f"Unknown table {table!r}; expected one of {', '.join(TABLES)}")
+    build, date_column = TABLES[table]
+    stmt = build(date_from, date_to)
+    if partition:
+        # Month order, so each partition's rows arrive together
+        stmt = stmt.order_by(None).order_by(stmt.selected_columns[date_column], stmt.selected_columns.id)
+    return stmt, date_column
+
+def write_table(
+    db: Session,
+    table: str,
+    out_dir: str,
+    fmt: str = "parquet",
+    partition_by_month: bool = False,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """
+    Export `table` under `out_dir`: <table>.<fmt>, or with `partition_by_month`
+    <table>/month=YYYY-MM/part-0.<fmt>. Returns {path: row count}.
+    """
+    require_pyarrow()
+    stmt, date_column = _statement(table, date_from, date_to, partition_by_month)
+    schema = arrow_schema(stmt)
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+    written = {}
+
+    if not partition_by_month:
+        path = os.path.join(out_dir, f"{table}.{fmt}")
+        os.makedirs(out_dir, exist_ok=True)
+        with _writer(path, schema, fmt) as writer:
+            written[path] = 0
+            for rows in result.partitions():
+                writer.write_batch(_batch(schema, rows))
+                written[path] += len(rows)
+        return written
+
+    position = list(stmt.selected_columns.keys()).index(date_column)
+    writer, open_month, path = None, None, None
+    try:
+        for rows in result.partitions():
+            for month, group in groupby(rows, key=lambda row: _month(row[position])):
+                group = list(group)
+                if month != open_month:
+                    if writer is not None:
+                        writer.close()
+                    directory = os.path.join(out_dir, table, f"month={month}")
+                    os.makedirs(directory, exist_ok=True)
+                    path = os.path.join(directory, f"part-0.{fmt}")
+                    writer = _writer(path, schema, fmt)
+                    open_month = month
+                    written[path] = 0
+                writer.write_batch(_batch(schema, group))
+                written[path] += len(group)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
@@ -0,0 +1,154 @@
+"""
+Response compression: brotli when the client accepts it and the brotli
+package is installed, gzip otherwise.
+
+Responses under COMPRESS_MIN_BYTES go out as-is (the encoding costs more than
+it saves), as do partial responses, bodies that already have an encoding and
+already-compressed types such as zip and Parquet exports. Streaming bodies
+(the CSV/NDJSON exports) are compressed chunk by chunk, each chunk flushed so
+the client can decode it as it arrives.
+"""
+import zlib
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Fast settings suited to dynamic JSON; the top levels cost far more CPU for a few % smaller bodies
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Chunks this large are compressed on a worker thread instead of the event loop
+THREAD_MINIMUM_SIZE = 128 * 1024
+# Media types that are already compressed (or, for event streams, must not be buffered);
+# "type/*" excludes a whole family
+EXCLUDED_CONTENT_TYPES = (
+    "application/gzip", "application/x-gzip", "application/zip", "application/vnd.apache.parquet",
+    "application/grpc", "audio/*", "video/*", "font/woff", "font/woff2",
+    "image/avif", "image/gif", "image/jpeg", "image/png", "image/webp", "text/event-stream",
+)
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        if name.strip().lower() == coding:
+            # "br;q=0" means not acceptable
+            try:
+                return float(params.strip().removeprefix("q=") or 1) > 0
+            except ValueError:
+                return True
+    return False
+
+def _excluded(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    family = media_type.partition("/")[0] + "/*"
+    return media_type in EXCLUDED_CONTENT_TYPES or family in EXCLUDED_CONTENT_TYPES
+
+
+class GzipEncoder:
+    content_encoding = "gzip"
+
+    def __init__(self):
+        # wbits 16 + MAX_WBITS writes the gzip header and trailer
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        chunk = self._compressor.compress(body)
+        return chunk + (self._compressor.flush(zlib.Z_SYNC_FLUSH) if more_body else self._compressor.flush())
+
+
+class BrotliEncoder:
+    content_encoding = "br"
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        chunk = self._compressor.process(body)
+        return chunk + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+def choose_encoder(accept_encoding: str):
+    """The encoder class for an Accept-Encoding header, or None to send bodies as-is."""
+    if brotli is not None and _accepts(accept_encoding, "br"):
+        return BrotliEncoder
+    if _accepts(accept_encoding, "gzip"):
+        return GzipEncoder
+    return None
+
+
+class _Responder:
+    """Wraps one response's send(), holding back the start message until the
+    first body chunk shows whether the response is worth compressing."""
+
+    def __init__(self, send, encoder_class, minimum_size: int):
+        self.send = send
+        self.encoder_class = encoder_class
+        self.minimum_size = minimum_size
+        self.start = None
+        self.encoder = None
+        # None until decided; then whether bodies pass through unchanged
+        self.passthrough = None
+
+    async def __call__(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if (
+                "content-encoding" in headers or message["status"] == 206
+                or _excluded(headers.get("content-type", ""))
+            ):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start = message
+        elif message_type == "http.response.body" and self.passthrough is None:
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=self.start["headers"])
+            self.passthrough = len(body) < self.minimum_size and not more_body
+            if not self.passthrough:
+                self.encoder = self.encoder_class()
+                body = await self._compress(body, more_body)
+                headers["Content-Encoding"] = self.encoder.content_encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+            await self.send(self.start)
+            await self.send(message)
+        elif message_type == "http.response.body" and not self.passthrough:
+            body = await self._compress(message.get("body", b""), message.get("more_body", False))
+            await self.send({**message, "body": body})
+        else:
+            # Pass-through bodies, file sends, hints and trailers; a file send
+            # may arrive before any body, so release the held start first
+            if self.start is not None and self.passthrough is None:
+                self.passthrough = True
+                await self.send(self.start)
+            await self.send(message)
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(self.encoder.compress, body, more_body)
+        return self.encoder.compress(body, more_body)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        encoder_class = None
+        if scope["type"] == "http":
+            encoder_class = choose_encoder(Headers(scope=scope).get("Accept-Encoding", ""))
+        if encoder_class is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _Responder(send, encoder_class, self.minimum_size))
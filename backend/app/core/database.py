@@ -1,5 +1,10 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from contextlib import asynccontextmanager, contextmanager
+from typing import Union
+from fastapi import Request
+from fastapi.concurrency import contextmanager_in_threadpool, run_in_threadpool
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.core.config import settings
 
 engine = create_engine(
@@ -13,10 +18,96 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-# Get DB session for routes
+# Get DB session for routes.
+# The request is one unit of work: crud functions only flush, and the session
+# is committed once after the route returns (or rolled back if it raised).
+# Declare it with Depends(get_db, scope="function") so the commit happens
+# before the response is sent and a failed commit becomes an error response.
 def get_db():
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+# Same unit of work for scripts and startup code
+@contextmanager
+def session_scope():
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def async_database_url(url: str) -> str:
+    """Map DATABASE_URL onto the async driver for the same database."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    # asyncpg spells sslmode as ssl and rejects libpq-only options
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    query.pop("channel_binding", None)
+    return url.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+# Async engine for the read endpoints (get_read_db), enabled by ASYNC_DB
+# (or create_app(async_db=True)). Its sessions don't expire on commit:
+# responses are serialized outside the greenlet that can lazy-load.
+async_engine = None
+AsyncSessionLocal = None
+
+def configure_async_engine():
+    """Create the async engine and its session factory, once."""
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL),
+            pool_pre_ping=True,
+            pool_size=20,
+            max_overflow=10
+        )
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return async_engine
+
+if settings.ASYNC_DB:
+    configure_async_engine()
+
+# Async counterpart of get_db, same unit of work
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+# Session for the read endpoints: an AsyncSession when the app was built with
+# create_app(async_db=True), so the queries run on the event loop through the
+# async driver, else get_db's Session. Call the (sync) crud functions on it
+# with run_db, which works for either.
+ReadSession = Union[Session, AsyncSession]
+
+async def get_read_db(request: Request):
+    if request.app.state.async_db:
+        async with asynccontextmanager(get_async_db)() as db:
+            yield db
+    else:
+        async with contextmanager_in_threadpool(contextmanager(get_db)()) as db:
+            yield db
+
+async def run_db(db: ReadSession, fn, *args, **kwargs):
+    """fn(session, *args, **kwargs): through the async driver, or in the threadpool."""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
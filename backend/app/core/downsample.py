@@ -0,0 +1,33 @@
+def lttb(values, target: int):
+    """
+    Largest-Triangle-Three-Buckets: indices of `target` points of an evenly
+    spaced series that keep its visual shape (peaks and troughs survive,
+    unlike averaging or taking every n-th point). The first and last points
+    are always kept. Returns every index when the series is already short.
+    """
+    n = len(values)
+    if target >= n or target < 3:
+        return list(range(n))
+
+    every = (n - 2) / (target - 2)
+    kept = [0]
+    a = 0
+    for i in range(target - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        # Keep the point of this bucket forming the largest triangle
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (values[j] - values[a]) - (a - j) * (avg_y - values[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
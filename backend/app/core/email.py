@@ -1,22 +1,243 @@
+import atexit
+import os
+import queue
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import os
 from datetime import datetime
 
-def send_login_notification(email: str):
+# SMTP errors that will not go away by retrying the same message
+PERMANENT_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPAuthenticationError,
+    smtplib.SMTPNotSupportedError,
+)
+
+
+class MailQueue:
     """
-    Sends an email notification to the admin when a login occurs.
+    In-process outbound mail queue.
+
+    enqueue() returns immediately; a single background worker sends the
+    messages over one reused SMTP connection, in batches of up to
+    `batch_size` (collected for at most `batch_wait` seconds). Transient
+    failures reconnect and retry with exponential backoff; a message is
+    dropped after `max_attempts`. The connection is closed after
+    `idle_timeout` seconds without mail.
     """
-    sender_email = os.getenv("SMTP_USER")
-    sender_password = os.getenv("SMTP_PASSWORD")
-    smtp_server = os.getenv("SMTP_HOST", "smtp.gmail.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
 
-    if not sender_email or not sender_password:
-        print("Warning: SMTP credentials not found. Email notification skipped.")
-        return
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = None,
+        password: str = None,
+        starttls: bool = True,
+        batch_size: int = 20,
+        batch_wait: float = 0.5,
+        max_attempts: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        idle_timeout: float = 30.0,
+        maxsize: int = 1000,
+        timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._smtp = None
+        self._last_used = 0.0
+        self._worker = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.batches = 0
+        self.connections = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+            port=int(os.getenv("SMTP_PORT", "587")),
+            username=os.getenv("SMTP_USER"),
+            password=os.getenv("SMTP_PASSWORD"),
+            starttls=os.getenv("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes"),
+        )
+
+    def enqueue(self, message) -> bool:
+        """Queue a message for delivery; returns False if the queue is full."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            print(f"Mail queue full, dropped message to {message['To']}")
+            return False
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every queued message was sent or given up on."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        """Deliver what is queued (up to `timeout`), then stop the worker."""
+        if self._worker is None:
+            return
+        self.flush(timeout)
+        self._stopping.set()
+        self._worker.join(timeout)
+        self._worker = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "sent": self.sent,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "retries": self.retries,
+                "batches": self.batches,
+                "connections": self.connections
+            }
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._stopping.clear()
+                self._worker = threading.Thread(target=self._run, name="mail-queue", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=min(self.idle_timeout, 1.0))
+            except queue.Empty:
+                self._close_if_idle()
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._send_batch(batch)
+        self._disconnect()
+
+    def _send_batch(self, batch):
+        with self._lock:
+            self.batches += 1
+        for message in batch:
+            try:
+                self._send(message)
+            except Exception as e:
+                # Anything _send doesn't expect (a malformed message, a bug) costs
+                # this one message, not the worker and the rest of the queue
+                self._disconnect()
+                with self._lock:
+                    self.failed += 1
+                print(f"Failed to send email: {e!r}")
+            finally:
+                self._queue.task_done()
 
+    def _send(self, message):
+        attempts = 0
+        while True:
+            reused = self._smtp is not None
+            try:
+                self._connection().send_message(message)
+                self._last_used = time.monotonic()
+                with self._lock:
+                    self.sent += 1
+                return
+            except PERMANENT_ERRORS as e:
+                error = e
+                attempts = self.max_attempts
+            except smtplib.SMTPServerDisconnected as e:
+                self._disconnect()
+                if reused:
+                    # The server closed the idle connection; reconnect right away
+                    continue
+                error = e
+                attempts += 1
+            except (smtplib.SMTPException, OSError) as e:
+                error = e
+                # 5xx replies are permanent, 4xx and network errors are worth retrying
+                permanent = isinstance(e, smtplib.SMTPResponseException) and e.smtp_code >= 500
+                attempts = self.max_attempts if permanent else attempts + 1
+                # The connection may be half-dead; start afresh on the next try
+                self._disconnect()
+
+            if attempts >= self.max_attempts or self._stopping.is_set():
+                with self._lock:
+                    self.failed += 1
+                print(f"Failed to send email to {message['To']}: {error}")
+                return
+            with self._lock:
+                self.retries += 1
+            time.sleep(min(self.backoff * 2 ** (attempts - 1), self.max_backoff))
+
+    def _connection(self):
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.starttls:
+                    smtp.starttls()
+                if self.username and self.password:
+                    smtp.login(self.username, self.password)
+            except Exception:
+                smtp.close()
+                raise
+            self._smtp = smtp
+            self._last_used = time.monotonic()
+            with self._lock:
+                self.connections += 1
+        return self._smtp
+
+    def _close_if_idle(self):
+        if self._smtp is not None and time.monotonic() - self._last_used >= self.idle_timeout:
+            self._disconnect()
+
+    def _disconnect(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+
+mail_queue = MailQueue.from_env()
+atexit.register(mail_queue.stop)
+
+
+def build_login_notification(email: str, sender: str):
     subject = "New Login Alert - Pro Garden CRM"
     body = f"""
     <html>
@@ -31,16 +252,22 @@ def send_login_notification(email: str):
     """
 
     message = MIMEMultipart()
-    message["From"] = sender_email
+    message["From"] = sender
     message["To"] = email
     message["Subject"] = subject
     message.attach(MIMEText(body, "html"))
+    return message
+
+def send_login_notification(email: str):
+    """
+    Queues an email notification to the admin when a login occurs.
+    Returns as soon as the message is queued; delivery happens in the background.
+    """
+    sender_email = mail_queue.username
+    sender_password = mail_queue.password
+
+    if not sender_email or not sender_password:
+        print("Warning: SMTP credentials not found. Email notification skipped.")
+        return
 
-    try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(message)
-        print(f"Login notification sent to {email}")
-    except Exception as e:
-        print(f"Failed to send email: {e}")
+    mail_queue.enqueue(build_login_notification(email, sender_email))
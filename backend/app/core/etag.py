@@ -0,0 +1,80 @@
+"""
+Conditional GET (ETag / If-None-Match) for the list and dashboard endpoints.
+
+A route declares the tables its response is read from:
+
+    @router.get("/", dependencies=[Depends(conditional("customers"))])
+
+Its ETag hashes the write versions of those tables (app.core.cache
+table_versions, bumped after every commit whose crud writes called
+mark_dirty) together with the request URL. A matching If-None-Match is
+answered with 304 by the dependency, before the route body runs, so the query
+never executes. Otherwise the tag is added to the 200 response by
+ETagMiddleware.
+
+Versions are counted per process, like the result caches, so the tag also
+carries a per-process token and the CACHE_TTL_SECONDS window. A tag issued by
+one worker never validates on another, and writes made outside this process
+(scripts, another worker) show up within one window, the same bound the
+result caches accept.
+"""
+import hashlib
+import secrets
+import time
+from fastapi import HTTPException, Request, status
+from starlette.datastructures import MutableHeaders
+from app.core.cache import table_versions
+from app.core.config import settings
+
+_PROCESS_TOKEN = secrets.token_hex(8)
+
+
+def compute_etag(request: Request, tables) -> str:
+    window = int(time.time() // settings.CACHE_TTL_SECONDS) if settings.CACHE_TTL_SECONDS > 0 else 0
+    key = repr((_PROCESS_TOKEN, window, tables, table_versions(*tables), request.url.path, request.url.query))
+    # Weak: the gzip and brotli encodings of a response share its tag
+    return 'W/"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def conditional(*tables: str):
+    """Dependency answering 304 when the client's ETag for this URL is still current."""
+    def check(request: Request):
+        etag = compute_etag(request, tables)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": "no-cache"}
+            )
+        request.state.etag = etag
+    return check
+
+
+class ETagMiddleware:
+    """Adds the tag computed by `conditional` to successful responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # request.state lives in this dict, so the dependency's tag is visible here
+        state = scope.setdefault("state", {})
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200 and "etag" in state:
+                headers = MutableHeaders(raw=message["headers"])
+                headers["ETag"] = state["etag"]
+                # Revalidate on every use instead of trusting a heuristic lifetime
+                headers.setdefault("Cache-Control", "no-cache")
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,91 @@
+"""
+Fast read mode for the large list endpoints (?fast=true).
+
+The crud *_rows functions select only the response model's fields as plain
+rows, so no ORM objects are built. The rows are returned as-is, without
+re-validating them through the response model, and serialized with orjson.
+The stdlib json encoder is used when orjson isn't installed. The JSON matches
+the normal response field for field.
+
+The same plain-row path serves sparse fieldsets (?fields=name,phone_number on
+the list and detail endpoints): only the requested columns are selected and
+returned, plus whatever keyset pagination needs to build its cursor.
+"""
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from fastapi import HTTPException, Query, status
+from fastapi.responses import Response
+from app.core.pagination import set_next_cursor
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def response_columns(schema, model, **overrides):
+    """`schema`'s fields as labeled columns of `model` (or the given overrides), in field order."""
+    return [
+        (overrides[name] if name in overrides else getattr(model, name)).label(name)
+        for name in schema.model_fields
+    ]
+
+def pick_columns(columns, fields: Optional[list[str]], *keys: str):
+    """The `columns` named in `fields` or `keys` (all of them when `fields` is None)."""
+    if fields is None:
+        return columns
+    wanted = set(fields).union(keys)
+    return [column for column in columns if column.key in wanted]
+
+def _default(value):
+    # Numeric columns come back as Decimal; the response models declare float
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# The ?fast= parameter of the list endpoints
+FAST_MODE = Query(False, description="Plain rows serialized with orjson, skipping response-model validation")
+# The ?fields= parameter of the list and detail endpoints
+FIELDS = Query(None, description="Comma-separated response fields to return, e.g. customer_name,phone_number")
+
+def parse_fields(fields: Optional[str], schema) -> Optional[list[str]]:
+    """The field names in a ?fields= value (None when absent); 400 on unknown names."""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"msg": "Unknown fields", "fields": unknown, "allowed": list(schema.model_fields)}
+        )
+    return names
+
+def _values(row, fields: Optional[list[str]]) -> dict:
+    values = row._asdict()
+    return values if fields is None else {name: values[name] for name in fields}
+
+def rows_response(rows, next_cursor: Optional[str] = None, fields: Optional[list[str]] = None) -> FastJSONResponse:
+    response = FastJSONResponse([_values(row, fields) for row in rows])
+    set_next_cursor(response, next_cursor)
+    return response
+
+def row_response(row) -> FastJSONResponse:
+    return FastJSONResponse(row._asdict())
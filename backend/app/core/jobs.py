@@ -0,0 +1,68 @@
+import threading
+import time
+
+
+class PeriodicJob:
+    """
+    Runs `fn` every `interval` seconds in a background daemon thread.
+
+    start() is idempotent and stop() waits for a run in progress to finish.
+    A failing run is logged and retried on the next tick.
+    """
+
+    def __init__(self, name: str, fn, interval: float):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self._worker = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.runs = 0
+        self.failures = 0
+        self.last_result = None
+        self.last_duration = None
+
+    def start(self):
+        with self._lock:
+            if self.interval <= 0 or (self._worker is not None and self._worker.is_alive()):
+                return
+            self._stopping.clear()
+            self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        if self._worker is None:
+            return
+        self._stopping.set()
+        self._worker.join(timeout)
+        self._worker = None
+
+    def run_once(self):
+        started = time.monotonic()
+        try:
+            result = self.fn()
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+            print(f"{self.name} failed: {e}")
+            return None
+        with self._lock:
+            self.runs += 1
+            self.last_result = result
+            self.last_duration = time.monotonic() - started
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "running": self._worker is not None and self._worker.is_alive(),
+                "interval": self.interval,
+                "runs": self.runs,
+                "failures": self.failures,
+                "last_result": self.last_result,
+                "last_duration": self.last_duration
+            }
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.run_once()
@@ -0,0 +1,249 @@
+"""
+Schema migrations, tracked by a version stamp in the schema_version table.
+
+ensure_schema() is called at startup: when the stamp is current it costs a
+single SELECT and no DDL reflection. Otherwise the pending migrations run in
+order, each in its own transaction together with its stamp update.
+
+To change the schema, append a function to MIGRATIONS; never edit or reorder
+the ones already released. Run them by hand with `python migrate.py`.
+"""
+from sqlalchemy import Column, Integer, MetaData, Table, bindparam, inspect, select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
+from app.core.database import Base
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, nullable=False),
+)
+
+
+def _models():
+    # Register every model on Base.metadata
+    from app.models import customer, inventory, financial, supplier, delivery, marketing, user, ledger, customer_summary  # noqa: F401
+
+
+def create_tables(conn):
+    """Create any missing tables (fresh databases, or ones created before versioning)."""
+    _models()
+    Base.metadata.create_all(bind=conn)
+
+# Nullable columns of the tables as first released, which databases created
+# by older versions may lack; spelled out so later model changes don't leak in
+LEGACY_COLUMNS = {
+    "customers": {
+        "address": "VARCHAR", "product_purchased": "VARCHAR", "quantity": "INTEGER",
+        "total_amount": "FLOAT", "purchase_date": "DATE", "payment_status": "VARCHAR",
+        "payment_method": "VARCHAR", "delivery_status": "VARCHAR", "notes": "VARCHAR",
+        "customer_type": "VARCHAR", "channel": "VARCHAR", "preferred_product": "VARCHAR",
+        "follow_up_date": "DATE",
+    },
+    "delivery_logs": {
+        "location": "VARCHAR", "item_delivered": "VARCHAR", "quantity": "INTEGER",
+        "delivery_person": "VARCHAR", "delivery_cost": "FLOAT", "notes": "VARCHAR",
+    },
+    "financial_records": {
+        "description": "VARCHAR", "category": "VARCHAR", "payment_method": "VARCHAR",
+        "status": "VARCHAR", "notes": "VARCHAR", "customer_id": "INTEGER",
+    },
+    "inventory": {"category": "VARCHAR(50)", "unit": "VARCHAR(20)", "supplier": "VARCHAR(100)"},
+    "marketing_tracker": {
+        "post_date": "DATE", "content_type": "VARCHAR", "description": "VARCHAR",
+        "engagement": "INTEGER", "sales_from_post": "FLOAT", "notes": "VARCHAR",
+    },
+    "suppliers": {
+        "product_supplied": "VARCHAR", "contact": "VARCHAR", "payment_terms": "VARCHAR",
+        "last_purchase": "DATE", "amount_paid": "FLOAT", "balance": "FLOAT", "notes": "VARCHAR",
+    },
+    "users": {
+        "email": "VARCHAR", "is_active": "BOOLEAN", "is_admin": "BOOLEAN",
+        "created_at": "TIMESTAMP", "updated_at": "TIMESTAMP",
+    },
+}
+
+# NOT NULL columns of the first release: these can't be added to a table that
+# has rows, so a table without them has to be migrated by hand
+LEGACY_REQUIRED = {
+    "customers": ("customer_name", "phone_number"),
+    "delivery_logs": ("date", "customer_name"),
+    "financial_records": ("date", "transaction_type", "amount"),
+    "inventory": ("item_name", "quantity_in_stock", "cost_price", "selling_price", "restock_level", "status", "date_added"),
+    "marketing_tracker": ("platform",),
+    "suppliers": ("supplier_name",),
+    "users": ("username", "hashed_password"),
+}
+
+def _add_columns(conn, table: str, columns: dict):
+    """ALTER TABLE ... ADD COLUMN for each of `columns` ({name: SQL type}) the table lacks."""
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    for name, column_type in columns.items():
+        if name not in existing:
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN "{name}" {column_type}'))
+            print(f"Added column {table}.{name}")
+
+def add_missing_columns(conn):
+    """Bring tables created before versioning up to the first release (replaces migrate_customers.py)."""
+    for table, required in LEGACY_REQUIRED.items():
+        existing = {c["name"] for c in inspect(conn).get_columns(table)}
+        missing = [name for name in required if name not in existing]
+        if missing:
+            raise RuntimeError(
+                f"Table {table} lacks the NOT NULL column(s) {', '.join(missing)}, "
+                "which can't be added automatically; migrate it by hand"
+            )
+    for table, columns in LEGACY_COLUMNS.items():
+        _add_columns(conn, table, columns)
+
+def create_indexes(conn):
+    """create_all skips indexes on tables that already exist, so add any new ones.
+
+    Indexes on columns the table doesn't have yet are left to the migration
+    that adds those columns (it calls this again).
+    """
+    _models()
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if any(column.name not in existing for column in index.columns):
+                continue
+            # IF NOT EXISTS rather than checkfirst: reflection skips expression indexes
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+def backfill_ledger(conn):
+    """Populate the dashboard rollup the first time it is deployed."""
+    from sqlalchemy.orm import Session
+    from app.crud import ledger as crud_ledger
+    with Session(bind=conn) as db:
+        crud_ledger.backfill_if_empty(db)
+        db.flush()
+
+def add_restock_index(conn):
+    """Partial index for the low-stock feed; also bring every stored status up to date."""
+    from sqlalchemy.orm import Session
+    from app.crud import inventory as crud_inventory
+    create_indexes(conn)
+    with Session(bind=conn) as db:
+        crud_inventory.sync_status(db)
+        db.flush()
+
+def add_search_index(conn):
+    """FTS5 table and sync triggers (SQLite) or trigram indexes (Postgres) for /search."""
+    from app.crud import search as crud_search
+    crud_search.create_search_index(conn)
+
+def add_phone_key(conn):
+    """Normalized phone column and index for repeat-buyer matching, backfilled."""
+    from sqlalchemy import update
+    from app.models.customer import Customer, normalize_phone
+    _add_columns(conn, "customers", {"phone_key": "VARCHAR(20)"})
+    create_indexes(conn)
+    rows = conn.execute(select(Customer.id, Customer.phone_number)).all()
+    updates = [{"customer_id": id, "phone_key": normalize_phone(phone)} for id, phone in rows]
+    if updates:
+        conn.execute(
+            update(Customer.__table__)
+            .where(Customer.__table__.c.id == bindparam("customer_id"))
+            .values(phone_key=bindparam("phone_key")),
+            updates
+        )
+
+def add_customer_summaries(conn):
+    """Per-customer order aggregates, built from the existing records."""
+    from sqlalchemy.orm import Session
+    from app.crud import customer_summary as crud_customer_summary
+    create_tables(conn)
+    with Session(bind=conn) as db:
+        crud_customer_summary.backfill_if_empty(db)
+        db.flush()
+
+def add_primary_record(conn):
+    """Link each customer to its sale record (the latest linked one), for the update sync."""
+    from sqlalchemy import func, update
+    from sqlalchemy.schema import AddConstraint
+    from app.models.customer import Customer
+    from app.models.financial import FinancialRecord
+    _add_columns(conn, "customers", {"primary_record_id": "INTEGER"})
+    create_indexes(conn)
+    # SQLite can't add a foreign key to an existing table (and doesn't enforce it)
+    if conn.dialect.name != "sqlite":
+        existing = {fk["name"] for fk in inspect(conn).get_foreign_keys(Customer.__tablename__)}
+        for constraint in Customer.__table__.foreign_key_constraints:
+            if constraint.name and constraint.name not in existing:
+                conn.execute(AddConstraint(constraint))
+    latest = (
+        select(func.max(FinancialRecord.id))
+        .where(FinancialRecord.customer_id == Customer.id)
+        .scalar_subquery()
+    )
+    conn.execute(
+        update(Customer.__table__)
+        .where(Customer.__table__.c.primary_record_id.is_(None))
+        .values(primary_record_id=latest)
+    )
+
+def add_purchase_date_index(conn):
+    """Index for the customer list's purchase date filter."""
+    create_indexes(conn)
+
+
+# Applied in order; the schema version is the number of migrations applied
+MIGRATIONS = [
+    create_tables,
+    add_missing_columns,
+    create_indexes,
+    backfill_ledger,
+    add_restock_index,
+    add_search_index,
+    add_phone_key,
+    add_customer_summaries,
+    add_primary_record,
+    add_purchase_date_index,
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+
+def current_version(engine) -> int:
+    """The stamped schema version, or 0 if the database was never stamped."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(schema_version.c.version)).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return 0
+
+def _lock(conn):
+    # Several workers may start at once; only one should migrate
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('schema_version'))"))
+
+def _stamp(conn, version: int):
+    if conn.execute(select(schema_version.c.version)).first() is None:
+        conn.execute(schema_version.insert().values(version=version))
+    else:
+        conn.execute(schema_version.update().values(version=version))
+
+def upgrade(engine, verbose: bool = False) -> int:
+    """Apply pending migrations; returns how many were applied."""
+    schema_version.create(bind=engine, checkfirst=True)
+    applied = 0
+    while True:
+        with engine.begin() as conn:
+            _lock(conn)
+            version = conn.execute(select(schema_version.c.version)).scalar() or 0
+            if version >= LATEST_VERSION:
+                return applied
+            migration = MIGRATIONS[version]
+            if verbose:
+                print(f"Applying migration {version + 1}: {migration.__name__}")
+            migration(conn)
+            _stamp(conn, version + 1)
+            applied += 1
+
+def ensure_schema(engine) -> int:
+    """Startup check: one query when the schema is current, else upgrade()."""
+    if current_version(engine) >= LATEST_VERSION:
+        return 0
+    return upgrade(engine)
@@ -0,0 +1,125 @@
+import base64
+import json
+from datetime import date
+from typing import Literal, Optional
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Ids must fit the databases' signed 64-bit integers
+MAX_ID = 2 ** 63 - 1
+
+
+def encode_cursor(values) -> str:
+    payload = [v.isoformat() if isinstance(v, date) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("wrong cursor length")
+        values[-1] = int(values[-1])
+        if not -MAX_ID - 1 <= values[-1] <= MAX_ID:
+            raise ValueError("id out of range")
+        return values
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def _after(sort_column, id_column, sort_value, last_id, descending: bool):
+    """WHERE clause selecting rows strictly after (sort_value, last_id), NULLs last.
+
+    For a non-NULL sort_value only the non-NULL rows are selected; keyset_paginate
+    reads the NULL tail separately.
+    """
+    beyond = (lambda col, v: col < v) if descending else (lambda col, v: col > v)
+    if sort_column is None:
+        return beyond(id_column, last_id)
+    if sort_value is None:
+        return and_(sort_column.is_(None), beyond(id_column, last_id))
+    # The redundant bound lets the database seek into the (sort, id) index
+    # instead of walking it from the start
+    bound = sort_column <= sort_value if descending else sort_column >= sort_value
+    return and_(bound, or_(
+        beyond(sort_column, sort_value),
+        and_(sort_column == sort_value, beyond(id_column, last_id))
+    ))
+
+def keyset_paginate(
+    query,
+    id_column,
+    sort_column=None,
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+):
+    """
+    Apply keyset (cursor) pagination ordered by (sort_column, id) or id alone.
+
+    Returns (items, next_cursor); next_cursor is None on the last page. The
+    cursor is an opaque token encoding the sort key of the last row returned.
+    """
+    null_tail = None
+    if cursor:
+        if sort_column is None:
+            (last_id,) = decode_cursor(cursor, 1)
+            sort_value = None
+        else:
+            sort_value, last_id = decode_cursor(cursor, 2)
+            if sort_value is not None:
+                try:
+                    sort_value = date.fromisoformat(sort_value)
+                except (TypeError, ValueError):
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+                if sort_column.nullable:
+                    null_tail = query.filter(sort_column.is_(None))
+        query = query.filter(_after(sort_column, id_column, sort_value, last_id, descending))
+
+    order = []
+    if sort_column is not None:
+        direction = sort_column.desc() if descending else sort_column.asc()
+        order.append(direction.nulls_last() if sort_column.nullable else direction)
+    order.append(id_column.desc() if descending else id_column.asc())
+
+    items = query.order_by(*order).limit(limit + 1).all()
+    if null_tail is not None and len(items) <= limit:
+        # The NULL sort values come after every other row
+        items += null_tail.order_by(*order).limit(limit + 1 - len(items)).all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    key = [getattr(last, id_column.key)]
+    if sort_column is not None:
+        key.insert(0, getattr(last, sort_column.key))
+    return items, encode_cursor(key)
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+class PageParams:
+    """Common query parameters for paginated list endpoints."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} response header"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        order: Optional[Literal["asc", "desc"]] = Query(None, description="Sort direction (defaults per endpoint)"),
+        all_rows: bool = Query(False, alias="all", description="Return every matching row unpaginated"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.order = order
+        self.all_rows = all_rows
+
+    def descending(self, default: bool) -> bool:
+        return default if self.order is None else self.order == "desc"
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -53,6 +56,78 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
             detail=f"Error verifying password: {str(e)}"
         )
 
+
+class HashPool:
+    """
+    Bounded thread pool for PBKDF2 work.
+
+    hashlib releases the GIL while deriving keys, so `workers` threads hash in
+    parallel without stalling the event loop. At most `max_queue` jobs may
+    wait for a worker; beyond that callers get a 503 instead of queueing
+    without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent password operations, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        return self._executor.submit(self._run, fn, *args)
+
+    def _run(self, fn, *args):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self.running,
+                "queued": self.queued,
+                "max_queue": self.max_queue,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+
+hash_pool = HashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+# Use these from async routes so the event loop keeps serving other requests;
+# sync code (crud, scripts) calls hash_password / verify_password directly
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hash_pool.run(verify_password, plain_password, hashed_password)
+
 # JWT functions
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -0,0 +1,99 @@
+from typing import Callable, Optional
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, update, select, delete
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
+from app.schemas.bulk import BulkRowError
+
+
+def validate_rows(
+    rows: list,
+    schema: type[BaseModel],
+    prepare: Optional[Callable[[dict], dict]] = None,
+    partial: bool = False,
+):
+    """
+    Validate each raw row against `schema`; rows that aren't JSON objects are
+    rejected like any other invalid row.
+
+    Returns (valid, errors): `valid` is a list of (index, values) pairs ready
+    for insert/update, `errors` a list of BulkRowError for rejected rows.
+    With `partial` (bulk updates) only the fields present are kept and every
+    row must carry an integer "id". `prepare` may convert values further and
+    raise ValueError to reject a row.
+    """
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            values = schema.model_validate(row).model_dump(exclude_unset=partial)
+            if partial:
+                row_id = row.get("id")
+                if not isinstance(row_id, int) or isinstance(row_id, bool):
+                    raise ValueError("id must be an integer")
+                values["id"] = row_id
+            if prepare:
+                values = prepare(values)
+        except ValidationError as e:
+            errors.append(BulkRowError(index=index, errors=e.errors(include_url=False, include_context=False)))
+            continue
+        except ValueError as e:
+            errors.append(BulkRowError(index=index, errors=[{"msg": str(e)}]))
+            continue
+        valid.append((index, values))
+    return valid, errors
+
+def insert_rows(db: Session, model, rows: list[dict]):
+    """INSERT all rows in one executemany and return the new ORM objects in input order."""
+    if not rows:
+        return []
+    if db.get_bind().dialect.insertmanyvalues_implicit_sentinel & InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT:
+        return list(db.scalars(
+            insert(model).returning(model, sort_by_parameter_order=True),
+            rows
+        ))
+    # SQLite can't guarantee RETURNING order, and asking for it degrades to one
+    # statement per row. Autoincrement ids follow VALUES order, so sort by id.
+    return sorted(db.scalars(insert(model).returning(model), rows), key=lambda obj: obj.id)
+
+def existing_ids(db: Session, model, ids):
+    return set(db.scalars(select(model.id).where(model.id.in_(ids))))
+
+def split_update_rows(db: Session, model, valid: list[tuple[int, dict]], errors: list):
+    """Drop rows whose id does not exist (or repeats), recording an error for each."""
+    found = existing_ids(db, model, [values["id"] for _, values in valid]) if valid else set()
+    rows, seen = [], set()
+    for index, values in valid:
+        row_id = values["id"]
+        if row_id not in found:
+            errors.append(BulkRowError(index=index, errors=[{"msg": f"id {row_id} not found"}]))
+        elif row_id in seen:
+            errors.append(BulkRowError(index=index, errors=[{"msg": f"id {row_id} appears more than once"}]))
+        else:
+            seen.add(row_id)
+            rows.append(values)
+    errors.sort(key=lambda e: e.index)
+    return rows
+
+def update_rows(db: Session, model, rows: list[dict]):
+    """UPDATE rows by primary key in one executemany."""
+    if rows:
+        db.execute(update(model), rows)
+
+def reload(db: Session, model, ids: list[int], *options):
+    """Flush, then load the given rows back in one query, in the order of `ids`."""
+    db.flush()
+    if not ids:
+        return []
+    stmt = (
+        select(model).where(model.id.in_(ids)).options(*options)
+        .execution_options(populate_existing=True)
+    )
+    by_id = {obj.id: obj for obj in db.scalars(stmt).unique()}
+    return [by_id[i] for i in ids if i in by_id]
+
+def delete_rows(db: Session, model, ids: list[int]):
+    """DELETE rows by id in one statement; returns (deleted count, missing ids)."""
+    found = existing_ids(db, model, ids) if ids else set()
+    if found:
+        db.execute(delete(model).where(model.id.in_(found)))
+    return len(found), [i for i in ids if i not in found]
@@ -1,19 +1,100 @@
+import re
+from datetime import date
+from difflib import SequenceMatcher
+from itertools import groupby
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.models.customer import Customer
-from app.schemas.customer import CustomerCreate, CustomerUpdate
+from app.core.cache import mark_dirty
+from sqlalchemy import delete, func, select, update
+from app.core.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from app.crud import bulk, customer_summary
+from app.crud import financial as crud_financial
+from app.models.financial import FinancialRecord
+from app.models.customer import Customer, normalize_phone
+from app.core.fast_read import pick_columns, response_columns
+from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
 
+# CustomerResponse's fields as plain columns, for the fast read mode and ?fields=
+ROW_COLUMNS = response_columns(CustomerResponse, Customer)
 
-def list_customers(db: Session):
-    return db.query(Customer).all()
+# Names at least this similar (0-1) on the same phone are the same person
+NAME_MATCH_THRESHOLD = 0.8
+# Phone blocks larger than this are placeholders ("0000..."), not one person
+MAX_DUPLICATE_BLOCK = 100
+# Contact details a merge copies from the merged rows when the target lacks them
+MERGE_FILL_FIELDS = ("address", "notes", "channel", "preferred_product", "follow_up_date")
+
+
+def _filtered_customers(
+    db: Session,
+    payment_status: Optional[str] = None,
+    delivery_status: Optional[str] = None,
+    customer_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    columns=None,
+):
+    query = db.query(Customer) if columns is None else db.query(*columns)
+    if payment_status:
+        query = query.filter(Customer.payment_status == payment_status)
+    if delivery_status:
+        query = query.filter(Customer.delivery_status == delivery_status)
+    if customer_type:
+        query = query.filter(Customer.customer_type == customer_type)
+    if date_from:
+        query = query.filter(Customer.purchase_date >= date_from)
+    if date_to:
+        query = query.filter(Customer.purchase_date <= date_to)
+    return query
+
+def list_customers(db: Session, descending: bool = False, **filters):
+    order = Customer.id.desc() if descending else Customer.id
+    return _filtered_customers(db, **filters).order_by(order).all()
+
+def page_customers(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = False, **filters):
+    return keyset_paginate(
+        _filtered_customers(db, **filters), Customer.id,
+        descending=descending, cursor=cursor, limit=limit
+    )
+
+def list_rows(db: Session, descending: bool = False, fields: Optional[list[str]] = None, **filters):
+    """list_customers as plain rows of the response fields, or just `fields` (no ORM objects)."""
+    return list_customers(db, descending, columns=pick_columns(ROW_COLUMNS, fields), **filters)
+
+def page_rows(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = False, fields: Optional[list[str]] = None, **filters):
+    # The cursor is built from the row's id, so it is always selected
+    columns = pick_columns(ROW_COLUMNS, fields, "id")
+    return page_customers(db, cursor, limit, descending, columns=columns, **filters)
+
+# Columns written by /customers/export (phone_key and the record link are internal)
+EXPORT_COLUMNS = (
+    "id", "customer_name", "phone_number", "address", "product_purchased", "quantity",
+    "total_amount", "purchase_date", "payment_status", "payment_method", "delivery_status",
+    "notes", "customer_type", "channel", "preferred_product", "follow_up_date"
+)
+
+def export_statement(date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """Plain columns for /customers/export, filtered on purchase date, by id."""
+    stmt = select(*[getattr(Customer, c) for c in EXPORT_COLUMNS]).order_by(Customer.id)
+    if date_from:
+        stmt = stmt.where(Customer.purchase_date >= date_from)
+    if date_to:
+        stmt = stmt.where(Customer.purchase_date <= date_to)
+    return stmt
 
 def get_customer(db: Session, customer_id: int):
     return db.query(Customer).filter(Customer.id == customer_id).first()
 
+def get_row(db: Session, customer_id: int, fields: Optional[list[str]] = None):
+    """get_customer as a plain row of the response fields, or just `fields`."""
+    columns = pick_columns(ROW_COLUMNS, fields)
+    return _filtered_customers(db, columns=columns).filter(Customer.id == customer_id).first()
+
 def create_customer(db: Session, data: CustomerCreate):
     obj = Customer(**data.model_dump())
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    mark_dirty(db, "customers")
+    db.flush()
     return obj
 
 def update_customer(db: Session, customer_id: int, data: CustomerUpdate):
@@ -22,14 +103,213 @@ def update_customer(db: Session, customer_id: int, data: CustomerUpdate):
         return None
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(customer, k, v)
-    db.commit()
-    db.refresh(customer)
+    mark_dirty(db, "customers")
+    db.flush()
     return customer
 
 def delete_customer(db: Session, customer_id: int):
     customer = get_customer(db, customer_id)
     if not customer:
         return False
+    # Keep the customer's financial records for history, but unlink them
+    db.execute(
+        update(FinancialRecord)
+        .where(FinancialRecord.customer_id == customer_id)
+        .values(customer_id=None)
+    )
     db.delete(customer)
-    db.commit()
+    mark_dirty(db, "customers")
+    db.flush()
+    customer_summary.refresh(db, [customer_id])
     return True
+
+def _with_phone_keys(rows: list[dict]):
+    # Core-level bulk writes skip the model's phone_number validator
+    for row in rows:
+        if "phone_number" in row:
+            row["phone_key"] = normalize_phone(row["phone_number"])
+    return rows
+
+def bulk_create_customers(db: Session, rows: list[dict]):
+    """Insert customers and their automatic Income records in one transaction."""
+    customers = bulk.insert_rows(db, Customer, _with_phone_keys(rows))
+    mark_dirty(db, "customers")
+    sales = [c for c in customers if (c.total_amount or 0) > 0]
+    records = crud_financial.insert_records(db, [crud_financial.sale_record_values(c) for c in sales])
+    bulk.update_rows(db, Customer, [
+        {"id": c.id, "primary_record_id": r.id} for c, r in zip(sales, records)
+    ])
+    return bulk.reload(db, Customer, [c.id for c in customers])
+
+def bulk_update_customers(db: Session, rows: list[dict]):
+    """Update customers and keep each one's primary sale record in sync."""
+    ids = [row["id"] for row in rows]
+    bulk.update_rows(db, Customer, _with_phone_keys(rows))
+    mark_dirty(db, "customers")
+
+    customers = db.scalars(
+        select(Customer).where(Customer.id.in_(ids)).execution_options(populate_existing=True)
+    ).all()
+    # Primary records still linked to their customer
+    linked = {
+        (record_id, customer_id) for record_id, customer_id in db.execute(
+            select(FinancialRecord.id, FinancialRecord.customer_id)
+            .where(FinancialRecord.id.in_([c.primary_record_id for c in customers if c.primary_record_id]))
+        )
+    }
+    record_updates, sales = [], []
+    for c in customers:
+        values = crud_financial.sale_record_values(c)
+        if (c.primary_record_id, c.id) in linked:
+            if c.purchase_date is None:
+                values.pop("date")
+            for key in ("transaction_type", "category", "customer_id"):
+                values.pop(key)
+            record_updates.append({"id": c.primary_record_id, **values})
+        elif (c.total_amount or 0) > 0:
+            sales.append(c)
+    if record_updates:
+        crud_financial.update_records(db, record_updates)
+    records = crud_financial.insert_records(db, [crud_financial.sale_record_values(c) for c in sales])
+    bulk.update_rows(db, Customer, [
+        {"id": c.id, "primary_record_id": r.id} for c, r in zip(sales, records)
+    ])
+    return bulk.reload(db, Customer, ids)
+
+def bulk_delete_customers(db: Session, ids: list[int]):
+    """Delete customers, keeping their financial records but unlinking them."""
+    db.execute(
+        update(FinancialRecord)
+        .where(FinancialRecord.customer_id.in_(ids))
+        .values(customer_id=None)
+    )
+    deleted, missing = bulk.delete_rows(db, Customer, ids)
+    mark_dirty(db, "customers")
+    db.flush()
+    customer_summary.refresh(db, ids)
+    return deleted, missing
+
+
+# -------------------------------------------------------------------
+# REPEAT BUYERS AND DUPLICATES
+# -------------------------------------------------------------------
+def _name_key(name: str) -> str:
+    # Case, punctuation and word order don't matter: "OKAFOR, Adaeze" == "Adaeze Okafor"
+    return " ".join(sorted(re.findall(r"\w+", (name or "").lower())))
+
+def name_similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, _name_key(a), _name_key(b)).ratio()
+
+def find_repeat_customer(db: Session, customer_name: str, phone_number: str):
+    """The existing customer with this phone (any formatting) and a matching name, or None."""
+    key = normalize_phone(phone_number)
+    if not key:
+        return None
+    candidates = db.query(Customer).filter(Customer.phone_key == key).order_by(Customer.id).all()
+    for candidate in candidates:
+        if name_similarity(candidate.customer_name, customer_name) >= NAME_MATCH_THRESHOLD:
+            return candidate
+    return None
+
+def record_repeat_sale(db: Session, customer: Customer, data: CustomerCreate):
+    """Put a new sale on an existing customer instead of creating another row."""
+    values = data.model_dump(exclude_unset=True)
+    values.pop("customer_name", None)
+    values.pop("customer_type", None)
+    for k, v in values.items():
+        if v is not None:
+            setattr(customer, k, v)
+    customer.customer_type = "Repeat"
+    mark_dirty(db, "customers")
+    db.flush()
+    return customer
+
+def find_duplicates(db: Session, threshold: float = NAME_MATCH_THRESHOLD, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Groups of customers that look like one person: same normalized phone
+    (the blocking key) and similar names.
+
+    Only phone keys shared by several rows are read (one GROUP BY on the
+    indexed phone_key), so the pairwise name comparison runs inside small
+    blocks rather than over every pair of customers.
+    """
+    shared = (
+        select(Customer.phone_key)
+        .where(Customer.phone_key.isnot(None))
+        .group_by(Customer.phone_key)
+        .having(func.count() > 1)
+    )
+    rows = db.execute(
+        select(Customer.id, Customer.customer_name, Customer.phone_number, Customer.phone_key)
+        .where(Customer.phone_key.in_(shared))
+        .order_by(Customer.phone_key, Customer.id)
+    ).all()
+
+    groups = []
+    for phone_key, block in groupby(rows, key=lambda row: row.phone_key):
+        block = list(block)
+        if len(block) > MAX_DUPLICATE_BLOCK:
+            continue
+        # Union-find over the similar pairs in the block
+        parent = list(range(len(block)))
+        def root(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        for i in range(len(block)):
+            for j in range(i + 1, len(block)):
+                if name_similarity(block[i].customer_name, block[j].customer_name) >= threshold:
+                    parent[root(j)] = root(i)
+        clusters = {}
+        for i, row in enumerate(block):
+            clusters.setdefault(root(i), []).append(row)
+        for members in clusters.values():
+            if len(members) > 1:
+                groups.append({
+                    "phone_key": phone_key,
+                    "primary_id": members[0].id,
+                    "customers": [
+                        {"id": m.id, "customer_name": m.customer_name, "phone_number": m.phone_number}
+                        for m in members
+                    ]
+                })
+                if len(groups) >= limit:
+                    return groups
+    return groups
+
+def merge_customers(db: Session, target_id: int, source_ids: list[int]):
+    """
+    Fold `source_ids` into `target_id`: their financial records are re-pointed
+    in one UPDATE, missing contact details are copied over, and the merged
+    rows are deleted. Returns (target, merged ids, records moved, missing ids),
+    or None if the target doesn't exist.
+    """
+    target = get_customer(db, target_id)
+    if not target:
+        return None
+    ids = sorted(set(source_ids) - {target_id})
+    sources = db.scalars(
+        select(Customer).where(Customer.id.in_(ids)).order_by(Customer.id.desc())
+    ).all() if ids else []
+    found = [c.id for c in sources]
+    missing = [i for i in ids if i not in set(found)]
+    if not found:
+        return target, [], 0, missing
+
+    moved = db.execute(
+        update(FinancialRecord)
+        .where(FinancialRecord.customer_id.in_(found))
+        .values(customer_id=target_id)
+    ).rowcount
+    # Newest merged row first, so the most recent details win
+    for field in MERGE_FILL_FIELDS:
+        if getattr(target, field) is None:
+            value = next((getattr(c, field) for c in sources if getattr(c, field) is not None), None)
+            setattr(target, field, value)
+    target.customer_type = "Repeat"
+    db.execute(delete(Customer).where(Customer.id.in_(found)))
+    mark_dirty(db, "customers", "financial_records")
+    db.flush()
+    customer_summary.refresh(db, [target_id] + found)
+    return target, sorted(found), moved, missing
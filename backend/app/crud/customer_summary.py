@@ -0,0 +1,146 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func, insert, select
+from app.models.customer import Customer
+from app.models.customer_summary import CustomerSummary
+from app.models.financial import FinancialRecord
+
+# What counts as an order: an Income record linked to a customer
+def _is_order(transaction_type, customer_id) -> bool:
+    return transaction_type == "Income" and customer_id is not None
+
+def _aggregates(where):
+    return (
+        select(
+            FinancialRecord.customer_id,
+            func.count(FinancialRecord.id),
+            func.coalesce(func.sum(FinancialRecord.amount), 0.0),
+            func.min(FinancialRecord.date),
+            func.max(FinancialRecord.date)
+        )
+        .where(
+            FinancialRecord.transaction_type == "Income",
+            FinancialRecord.customer_id.isnot(None),
+            where
+        )
+        .group_by(FinancialRecord.customer_id)
+    )
+
+_COLUMNS = ["customer_id", "order_count", "lifetime_revenue", "first_purchase", "last_purchase"]
+
+def _upsert_insert(db: Session):
+    """Return a dialect-specific INSERT that supports ON CONFLICT, or None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(CustomerSummary)
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(CustomerSummary)
+    return None
+
+def refresh(db: Session, customer_ids):
+    """
+    Recompute the summaries of `customer_ids` from their records (after
+    records were changed, removed or re-linked). Uses the customer_id index,
+    so the cost is the size of those customers' histories. Flushes first.
+    """
+    ids = sorted({i for i in customer_ids if i is not None})
+    if not ids:
+        return
+    db.flush()
+    db.execute(delete(CustomerSummary).where(CustomerSummary.customer_id.in_(ids)))
+    db.execute(
+        insert(CustomerSummary).from_select(_COLUMNS, _aggregates(FinancialRecord.customer_id.in_(ids)))
+    )
+
+def records_added(db: Session, records):
+    """Fold newly inserted records into the summaries without re-reading history."""
+    merged = {}
+    for r in records:
+        if not _is_order(r.transaction_type, r.customer_id) or r.date is None:
+            continue
+        count, revenue, first, last = merged.get(r.customer_id, (0, 0.0, r.date, r.date))
+        merged[r.customer_id] = (count + 1, revenue + (r.amount or 0.0), min(first, r.date), max(last, r.date))
+    if not merged:
+        return
+    stmt = _upsert_insert(db)
+    if stmt is None:
+        refresh(db, merged)
+        return
+    for customer_id, (count, revenue, first, last) in merged.items():
+        db.execute(
+            stmt.values(
+                customer_id=customer_id,
+                order_count=count,
+                lifetime_revenue=revenue,
+                first_purchase=first,
+                last_purchase=last
+            ).on_conflict_do_update(
+                index_elements=["customer_id"],
+                set_={
+                    "order_count": CustomerSummary.order_count + count,
+                    "lifetime_revenue": CustomerSummary.lifetime_revenue + revenue,
+                    "first_purchase": case(
+                        (CustomerSummary.first_purchase > first, first),
+                        else_=func.coalesce(CustomerSummary.first_purchase, first)
+                    ),
+                    "last_purchase": case(
+                        (CustomerSummary.last_purchase < last, last),
+                        else_=func.coalesce(CustomerSummary.last_purchase, last)
+                    )
+                }
+            )
+        )
+
+def snapshot(record: FinancialRecord):
+    """Capture the summary-relevant fields of a record before it is modified."""
+    return (record.customer_id, record.transaction_type, record.date, record.amount)
+
+def record_changed(db: Session, before, record: FinancialRecord):
+    if before == snapshot(record):
+        return
+    refresh(db, [before[0], record.customer_id])
+
+def get_summary(db: Session, customer_id: int):
+    """
+    A customer's order aggregates (zeros before the first order), or None if
+    the customer doesn't exist. Two primary key lookups in one statement.
+    """
+    row = db.execute(
+        select(
+            Customer.id,
+            CustomerSummary.order_count,
+            CustomerSummary.lifetime_revenue,
+            CustomerSummary.first_purchase,
+            CustomerSummary.last_purchase
+        )
+        .outerjoin(CustomerSummary, CustomerSummary.customer_id == Customer.id)
+        .where(Customer.id == customer_id)
+    ).first()
+    if row is None:
+        return None
+    count = row.order_count or 0
+    revenue = row.lifetime_revenue or 0.0
+    return {
+        "customer_id": row.id,
+        "order_count": count,
+        "lifetime_revenue": revenue,
+        "average_order_value": revenue / count if count else 0.0,
+        "first_purchase": row.first_purchase,
+        "last_purchase": row.last_purchase
+    }
+
+def rebuild(db: Session):
+    """Recompute every summary from financial_records (for backfills)."""
+    db.execute(delete(CustomerSummary))
+    db.execute(insert(CustomerSummary).from_select(_COLUMNS, _aggregates(True)))
+    db.flush()
+    return db.query(func.count()).select_from(CustomerSummary).scalar()
+
+def backfill_if_empty(db: Session):
+    """Populate the summaries on first deploy when linked records exist."""
+    if db.query(CustomerSummary).first() is not None:
+        return
+    if db.query(FinancialRecord.id).filter(FinancialRecord.customer_id.isnot(None)).first() is None:
+        return
+    rebuild(db)
@@ -1,20 +1,27 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.financial import FinancialRecord
+from sqlalchemy import Date, Integer, cast, func, case, select, true
 from app.models.customer import Customer
-from datetime import datetime, timedelta
+from app.models.ledger import DailyLedgerRollup
+from app.models.customer_summary import CustomerSummary
+from app.core.downsample import lttb
+from datetime import date, datetime, timedelta
+
+# Sales trend limits: default and largest point counts, longest range (ten years)
+TREND_DEFAULT_POINTS = 120
+TREND_MAX_POINTS = 1000
+TREND_MAX_DAYS = 3660
 
 def get_financial_summary(db: Session):
-    """Calculate total sales, expenses, and net profit from financial records"""
+    """Calculate total sales, expenses, and net profit from the daily ledger rollup"""
     
     # Total Sales (Income transactions)
-    total_sales = db.query(func.sum(FinancialRecord.amount))\
-        .filter(FinancialRecord.transaction_type == "Income")\
+    total_sales = db.query(func.sum(DailyLedgerRollup.total_amount))\
+        .filter(DailyLedgerRollup.transaction_type == "Income")\
         .scalar() or 0.0
     
     # Total Expenses (Expense transactions)
-    total_expenses = db.query(func.sum(FinancialRecord.amount))\
-        .filter(FinancialRecord.transaction_type == "Expense")\
+    total_expenses = db.query(func.sum(DailyLedgerRollup.total_amount))\
+        .filter(DailyLedgerRollup.transaction_type == "Expense")\
         .scalar() or 0.0
     
     # Net Profit
@@ -32,10 +39,9 @@ def get_customer_stats(db: Session):
     # Total customers
     total_customers = db.query(func.count(Customer.id)).scalar() or 0
     
-    # Repeat customers - customers with customer_type = "Repeat" or "Returning"
-    # or customers who appear multiple times in financial records
-    repeat_customers = db.query(func.count(Customer.id))\
-        .filter(Customer.customer_type.in_(["Repeat", "Returning"]))\
+    # Repeat customers - customers with two or more orders (from the summaries)
+    repeat_customers = db.query(func.count(CustomerSummary.customer_id))\
+        .filter(CustomerSummary.order_count >= 2)\
         .scalar() or 0
     
     return {
@@ -43,42 +49,89 @@ def get_customer_stats(db: Session):
         "repeat_customers": repeat_customers
     }
 
-def get_sales_trend(db: Session, days: int = 30):
-    """Get sales data for the last N days for charts"""
-    
+def _bucket_start(d: date, granularity: str) -> date:
+    """First day of the bucket containing `d` (weeks start on Monday)."""
+    if granularity == "week":
+        return d - timedelta(days=d.weekday())
+    if granularity == "month":
+        return d.replace(day=1)
+    if granularity == "quarter":
+        return d.replace(month=(d.month - 1) // 3 * 3 + 1, day=1)
+    return d
+
+def _next_bucket(d: date, granularity: str) -> date:
+    if granularity == "week":
+        return d + timedelta(days=7)
+    if granularity in ("month", "quarter"):
+        month = d.month - 1 + (3 if granularity == "quarter" else 1)
+        return date(d.year + month // 12, month % 12 + 1, 1)
+    return d + timedelta(days=1)
+
+def _bucket_column(db: Session, granularity: str):
+    """SQL expression for _bucket_start on the rollup's date."""
+    column = DailyLedgerRollup.date
+    if granularity == "day":
+        return column
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(func.date_trunc(granularity, column), Date)
+    # SQLite date functions
+    if granularity == "week":
+        return func.date(column, "-6 days", "weekday 1")
+    if granularity == "month":
+        return func.strftime("%Y-%m-01", column)
+    quarter_month = (cast(func.strftime("%m", column), Integer) - 1) // 3 * 3 + 1
+    return func.printf("%s-%02d-01", func.strftime("%Y", column), quarter_month)
+
+def get_sales_trend(db: Session, days: int = 30, granularity: str = "day", points: int = TREND_DEFAULT_POINTS):
+    """
+    Income over the last N days, in day/week/month/quarter buckets, columnar.
+
+    One grouped query sums the rollup per bucket; buckets without sales are
+    filled with 0 from a generated calendar, and a series longer than
+    `points` is downsampled (LTTB) so charts get a bounded payload.
+    """
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
-    
-    # Query sales grouped by date
-    sales_by_date = db.query(
-        FinancialRecord.date,
-        func.sum(FinancialRecord.amount).label('total')
-    ).filter(
-        FinancialRecord.transaction_type == "Income",
-        FinancialRecord.date >= start_date,
-        FinancialRecord.date <= end_date
-    ).group_by(FinancialRecord.date)\
-     .order_by(FinancialRecord.date)\
-     .all()
-    
-    return [
-        {
-            "date": str(record.date),
-            "amount": record.total
-        }
-        for record in sales_by_date
-    ]
+
+    bucket = _bucket_column(db, granularity).label("bucket")
+    totals = {
+        str(row.bucket)[:10]: row.total
+        for row in db.query(
+            bucket,
+            func.sum(DailyLedgerRollup.total_amount).label("total")
+        ).filter(
+            DailyLedgerRollup.transaction_type == "Income",
+            DailyLedgerRollup.date >= start_date,
+            DailyLedgerRollup.date <= end_date
+        ).group_by(bucket)
+    }
+
+    dates, amounts = [], []
+    current = _bucket_start(start_date, granularity)
+    while current <= end_date:
+        key = current.isoformat()
+        dates.append(key)
+        amounts.append(totals.get(key) or 0.0)
+        current = _next_bucket(current, granularity)
+
+    kept = lttb(amounts, points)
+    return {
+        "granularity": granularity,
+        "dates": [dates[i] for i in kept],
+        "amounts": [amounts[i] for i in kept],
+        "downsampled": len(kept) < len(dates)
+    }
 
 def get_expense_breakdown(db: Session):
     """Get expenses grouped by category for pie chart"""
     
     expenses_by_category = db.query(
-        FinancialRecord.category,
-        func.sum(FinancialRecord.amount).label('total')
+        DailyLedgerRollup.category,
+        func.sum(DailyLedgerRollup.total_amount).label('total')
     ).filter(
-        FinancialRecord.transaction_type == "Expense",
-        FinancialRecord.category.isnot(None)
-    ).group_by(FinancialRecord.category)\
+        DailyLedgerRollup.transaction_type == "Expense",
+        DailyLedgerRollup.category != ""
+    ).group_by(DailyLedgerRollup.category)\
      .all()
     
     return [
@@ -97,20 +150,70 @@ def get_monthly_comparison(db: Session):
     start_of_month = datetime(now.year, now.month, 1).date()
     
     # Income for current month
-    monthly_income = db.query(func.sum(FinancialRecord.amount))\
+    monthly_income = db.query(func.sum(DailyLedgerRollup.total_amount))\
         .filter(
-            FinancialRecord.transaction_type == "Income",
-            FinancialRecord.date >= start_of_month
+            DailyLedgerRollup.transaction_type == "Income",
+            DailyLedgerRollup.date >= start_of_month
         ).scalar() or 0.0
     
     # Expenses for current month
-    monthly_expenses = db.query(func.sum(FinancialRecord.amount))\
+    monthly_expenses = db.query(func.sum(DailyLedgerRollup.total_amount))\
         .filter(
-            FinancialRecord.transaction_type == "Expense",
-            FinancialRecord.date >= start_of_month
+            DailyLedgerRollup.transaction_type == "Expense",
+            DailyLedgerRollup.date >= start_of_month
         ).scalar() or 0.0
     
     return {
         "income": monthly_income,
         "expenses": monthly_expenses
     }
+
+def get_dashboard_stats(db: Session):
+    """
+    Compute the financial summary, customer stats and monthly comparison in a
+    single statement (one round trip) using conditional aggregates.
+    """
+    
+    now = datetime.now()
+    start_of_month = datetime(now.year, now.month, 1).date()
+    
+    is_income = DailyLedgerRollup.transaction_type == "Income"
+    is_expense = DailyLedgerRollup.transaction_type == "Expense"
+    this_month = DailyLedgerRollup.date >= start_of_month
+    
+    def total_where(condition):
+        return func.coalesce(func.sum(case((condition, DailyLedgerRollup.total_amount), else_=0.0)), 0.0)
+    
+    # One pass over the rollup for all money figures
+    ledger = select(
+        total_where(is_income).label("total_sales"),
+        total_where(is_expense).label("total_expenses"),
+        total_where(is_income & this_month).label("income"),
+        total_where(is_expense & this_month).label("expenses")
+    ).subquery()
+    
+    customers = select(func.count(Customer.id).label("total_customers")).subquery()
+    
+    # Customers with two or more orders, from the partial index on the summaries
+    repeat = select(
+        func.count(CustomerSummary.customer_id).label("repeat_customers")
+    ).where(CustomerSummary.order_count >= 2).subquery()
+    
+    # Every subquery returns exactly one row, so the joins are 1x1 cross joins
+    row = db.execute(
+        select(ledger, customers, repeat)
+        .select_from(ledger.join(customers, true()).join(repeat, true()))
+    ).one()
+    
+    total_sales = row.total_sales or 0.0
+    total_expenses = row.total_expenses or 0.0
+    
+    return {
+        "total_sales": total_sales,
+        "total_expenses": total_expenses,
+        "net_profit": total_sales - total_expenses,
+        "total_customers": row.total_customers or 0,
+        "repeat_customers": row.repeat_customers or 0,
+        "income": row.income or 0.0,
+        "expenses": row.expenses or 0.0
+    }
@@ -1,14 +1,72 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Optional
 from app.models.delivery import DeliveryLog
-from app.schemas.delivery import DeliveryLogCreate, DeliveryLogUpdate
-from datetime import datetime
+from app.schemas.delivery import DeliveryLogCreate, DeliveryLogUpdate, DeliveryLogResponse
+from app.core.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from app.core.cache import mark_dirty
+from app.crud import bulk
+from app.core.fast_read import pick_columns, response_columns
+from datetime import datetime, date
 
-def list_deliveries(db: Session):
-    return db.query(DeliveryLog).order_by(DeliveryLog.date.desc()).all()
+# DeliveryLogResponse's fields as plain columns, for ?fields=
+ROW_COLUMNS = response_columns(DeliveryLogResponse, DeliveryLog)
+
+def _filtered_deliveries(
+    db: Session,
+    delivery_person: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    columns=None,
+):
+    query = db.query(DeliveryLog) if columns is None else db.query(*columns)
+    if delivery_person:
+        query = query.filter(DeliveryLog.delivery_person == delivery_person)
+    if date_from:
+        query = query.filter(DeliveryLog.date >= date_from)
+    if date_to:
+        query = query.filter(DeliveryLog.date <= date_to)
+    return query
+
+def list_deliveries(db: Session, descending: bool = True, **filters):
+    if descending:
+        order = (DeliveryLog.date.desc(), DeliveryLog.id.desc())
+    else:
+        order = (DeliveryLog.date, DeliveryLog.id)
+    return _filtered_deliveries(db, **filters).order_by(*order).all()
+
+def page_deliveries(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = True, **filters):
+    return keyset_paginate(
+        _filtered_deliveries(db, **filters), DeliveryLog.id, DeliveryLog.date,
+        descending=descending, cursor=cursor, limit=limit
+    )
+
+def list_rows(db: Session, descending: bool = True, fields: Optional[list[str]] = None, **filters):
+    """list_deliveries as plain rows of the response fields, or just `fields` (no ORM objects)."""
+    return list_deliveries(db, descending, columns=pick_columns(ROW_COLUMNS, fields), **filters)
+
+def page_rows(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = True, fields: Optional[list[str]] = None, **filters):
+    # The cursor is built from the row's id and date, so they are always selected
+    columns = pick_columns(ROW_COLUMNS, fields, "id", "date")
+    return page_deliveries(db, cursor, limit, descending, columns=columns, **filters)
+
+def export_statement(date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """Plain columns for exports, oldest first."""
+    stmt = select(*DeliveryLog.__table__.columns).order_by(DeliveryLog.date, DeliveryLog.id)
+    if date_from:
+        stmt = stmt.where(DeliveryLog.date >= date_from)
+    if date_to:
+        stmt = stmt.where(DeliveryLog.date <= date_to)
+    return stmt
 
 def get_delivery(db: Session, delivery_id: int):
     return db.query(DeliveryLog).filter(DeliveryLog.id == delivery_id).first()
 
+def get_row(db: Session, delivery_id: int, fields: Optional[list[str]] = None):
+    """get_delivery as a plain row of the response fields, or just `fields`."""
+    columns = pick_columns(ROW_COLUMNS, fields)
+    return _filtered_deliveries(db, columns=columns).filter(DeliveryLog.id == delivery_id).first()
+
 def create_delivery(db: Session, data: DeliveryLogCreate):
     data_dict = data.model_dump()
     # Convert date string to date object
@@ -16,8 +74,8 @@ def create_delivery(db: Session, data: DeliveryLogCreate):
         data_dict['date'] = datetime.strptime(data_dict['date'], '%Y-%m-%d').date()
     obj = DeliveryLog(**data_dict)
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    mark_dirty(db, "delivery_logs")
+    db.flush()
     return obj
 
 def update_delivery(db: Session, delivery_id: int, data: DeliveryLogUpdate):
@@ -30,8 +88,8 @@ def update_delivery(db: Session, delivery_id: int, data: DeliveryLogUpdate):
         update_dict['date'] = datetime.strptime(update_dict['date'], '%Y-%m-%d').date()
     for k, v in update_dict.items():
         setattr(d, k, v)
-    db.commit()
-    db.refresh(d)
+    mark_dirty(db, "delivery_logs")
+    db.flush()
     return d
 
 def delete_delivery(db: Session, delivery_id: int):
@@ -39,5 +97,22 @@ def delete_delivery(db: Session, delivery_id: int):
     if not d:
         return False
     db.delete(d)
-    db.commit()
+    mark_dirty(db, "delivery_logs")
+    db.flush()
     return True
+
+def bulk_create_deliveries(db: Session, rows: list[dict]):
+    objs = bulk.insert_rows(db, DeliveryLog, rows)
+    mark_dirty(db, "delivery_logs")
+    return bulk.reload(db, DeliveryLog, [o.id for o in objs])
+
+def bulk_update_deliveries(db: Session, rows: list[dict]):
+    bulk.update_rows(db, DeliveryLog, rows)
+    mark_dirty(db, "delivery_logs")
+    return bulk.reload(db, DeliveryLog, [row["id"] for row in rows])
+
+def bulk_delete_deliveries(db: Session, ids: list[int]):
+    deleted, missing = bulk.delete_rows(db, DeliveryLog, ids)
+    mark_dirty(db, "delivery_logs")
+    db.flush()
+    return deleted, missing
@@ -1,38 +1,258 @@
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select, update
+from app.core.cache import mark_dirty
+from app.core.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from app.models.customer import Customer
 from app.models.financial import FinancialRecord
-from app.schemas.financial import FinancialRecordCreate, FinancialRecordUpdate
+from app.crud import ledger, bulk, customer_summary
+from app.core.fast_read import pick_columns, response_columns
+from app.schemas.financial import FinancialRecordCreate, FinancialRecordUpdate, FinancialRecordResponse
 
-def list_records(db: Session):
-    return db.query(FinancialRecord).order_by(FinancialRecord.date.desc()).all()
+# FinancialRecordResponse's fields as plain columns, for the fast read mode and ?fields=
+ROW_COLUMNS = response_columns(FinancialRecordResponse, FinancialRecord, customer_name=Customer.customer_name)
+
+def _filtered_records(
+    db: Session,
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    customer_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    columns=None,
+):
+    if columns is None:
+        # Customer names are fetched in the same query (no per-row lookup)
+        query = db.query(FinancialRecord).options(joinedload(FinancialRecord.customer))
+    else:
+        query = db.query(*columns).select_from(FinancialRecord)
+        if any(column.key == "customer_name" for column in columns):
+            query = query.outerjoin(Customer, FinancialRecord.customer_id == Customer.id)
+    if transaction_type:
+        query = query.filter(FinancialRecord.transaction_type == transaction_type)
+    if category:
+        query = query.filter(FinancialRecord.category == category)
+    if status:
+        query = query.filter(FinancialRecord.status == status)
+    if customer_id is not None:
+        query = query.filter(FinancialRecord.customer_id == customer_id)
+    if date_from:
+        query = query.filter(FinancialRecord.date >= date_from)
+    if date_to:
+        query = query.filter(FinancialRecord.date <= date_to)
+    return query
+
+def list_records(db: Session, descending: bool = True, **filters):
+    if descending:
+        order = (FinancialRecord.date.desc(), FinancialRecord.id.desc())
+    else:
+        order = (FinancialRecord.date, FinancialRecord.id)
+    return _filtered_records(db, **filters).order_by(*order).all()
+
+def page_records(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = True, **filters):
+    return keyset_paginate(
+        _filtered_records(db, **filters), FinancialRecord.id, FinancialRecord.date,
+        descending=descending, cursor=cursor, limit=limit
+    )
+
+def list_rows(db: Session, descending: bool = True, fields: Optional[list[str]] = None, **filters):
+    """list_records as plain rows of the response fields, or just `fields` (no ORM objects)."""
+    return list_records(db, descending, columns=pick_columns(ROW_COLUMNS, fields), **filters)
+
+def page_rows(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = True, fields: Optional[list[str]] = None, **filters):
+    # The cursor is built from the row's id and date, so they are always selected
+    columns = pick_columns(ROW_COLUMNS, fields, "id", "date")
+    return page_records(db, cursor, limit, descending, columns=columns, **filters)
+
+def export_statement(date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """Plain columns for /financial/export, oldest first (the (date, id) index)."""
+    stmt = (
+        select(
+            FinancialRecord.id,
+            FinancialRecord.date,
+            FinancialRecord.transaction_type,
+            FinancialRecord.description,
+            FinancialRecord.category,
+            FinancialRecord.amount,
+            FinancialRecord.payment_method,
+            FinancialRecord.status,
+            FinancialRecord.notes,
+            FinancialRecord.customer_id,
+            Customer.customer_name
+        )
+        .outerjoin(Customer, FinancialRecord.customer_id == Customer.id)
+        .order_by(FinancialRecord.date, FinancialRecord.id)
+    )
+    if date_from:
+        stmt = stmt.where(FinancialRecord.date >= date_from)
+    if date_to:
+        stmt = stmt.where(FinancialRecord.date <= date_to)
+    return stmt
 
 def get_record(db: Session, record_id: int):
-    return db.query(FinancialRecord).filter(FinancialRecord.id == record_id).first()
+    return db.query(FinancialRecord)\
+        .options(joinedload(FinancialRecord.customer))\
+        .filter(FinancialRecord.id == record_id)\
+        .first()
+
+def get_row(db: Session, record_id: int, fields: Optional[list[str]] = None):
+    """get_record as a plain row of the response fields, or just `fields`."""
+    columns = pick_columns(ROW_COLUMNS, fields)
+    return _filtered_records(db, columns=columns).filter(FinancialRecord.id == record_id).first()
 
 def create_record(db: Session, data: FinancialRecordCreate):
     obj = FinancialRecord(**data.model_dump())
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    ledger.record_added(db, obj)
+    mark_dirty(db, "financial_records")
+    db.flush()
+    customer_summary.records_added(db, [obj])
     return obj
 
 def update_record(db: Session, record_id: int, data: FinancialRecordUpdate):
     rec = get_record(db, record_id)
     if not rec:
         return None
+    before = ledger.snapshot(rec)
+    summary_before = customer_summary.snapshot(rec)
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(rec, k, v)
-    db.commit()
-    db.refresh(rec)
+    ledger.record_changed(db, before, rec)
+    mark_dirty(db, "financial_records")
+    db.flush()
+    customer_summary.record_changed(db, summary_before, rec)
     return rec
 
 def delete_record(db: Session, record_id: int):
     rec = get_record(db, record_id)
     if not rec:
         return False
+    ledger.record_removed(db, rec)
+    customer_id = rec.customer_id
+    _unlink_primary(db, [record_id])
     db.delete(rec)
-    db.commit()
+    mark_dirty(db, "financial_records")
+    db.flush()
+    customer_summary.refresh(db, [customer_id])
     return True
 
+def sale_record_values(customer):
+    """Values for the automatic Income record that mirrors a customer's purchase."""
+    return {
+        "date": customer.purchase_date or date.today(),
+        "transaction_type": "Income",
+        "description": f"Sale to {customer.customer_name} - {customer.product_purchased or 'Product'}",
+        "category": "Sales",
+        "amount": customer.total_amount or 0.0,
+        "payment_method": customer.payment_method,
+        "status": customer.payment_status or "Pending",
+        "notes": customer.notes,
+        "customer_id": customer.id
+    }
+
+def record_sale(db: Session, customer):
+    """Create the Income record for a customer's purchase and make it the primary one."""
+    record = create_record(db, FinancialRecordCreate(**sale_record_values(customer)))
+    customer.primary_record_id = record.id
+    db.flush()
+    return record
+
+def _unlink_primary(db: Session, ids):
+    # Postgres does this through ON DELETE SET NULL; SQLite doesn't enforce it
+    db.execute(
+        update(Customer)
+        .where(Customer.primary_record_id.in_(ids))
+        .values(primary_record_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+def _snapshots(db: Session, ids):
+    rows = db.execute(
+        select(
+            FinancialRecord.id,
+            FinancialRecord.date,
+            FinancialRecord.transaction_type,
+            FinancialRecord.category,
+            FinancialRecord.amount,
+            FinancialRecord.customer_id
+        ).where(FinancialRecord.id.in_(ids))
+    )
+    return {row.id: tuple(row[1:]) for row in rows}
+
+def insert_records(db: Session, rows: list[dict]):
+    """Insert records in one statement and fold them into the rollups."""
+    objs = bulk.insert_rows(db, FinancialRecord, rows)
+    ledger.apply_deltas(db, [(o.date, o.transaction_type, o.category, o.amount, 1) for o in objs])
+    customer_summary.records_added(db, objs)
+    mark_dirty(db, "financial_records")
+    return objs
+
+def update_records(db: Session, rows: list[dict]):
+    """Update records by id in one statement and adjust the rollups."""
+    _apply_updates(db, _snapshots(db, [row["id"] for row in rows]), rows)
+
+def _apply_updates(db: Session, before, rows: list[dict]):
+    bulk.update_rows(db, FinancialRecord, rows)
+    deltas, customers = [], set()
+    for row in rows:
+        old = before[row["id"]]
+        new = (
+            row.get("date", old[0]),
+            row.get("transaction_type", old[1]),
+            row.get("category", old[2]),
+            row.get("amount", old[3]),
+            row.get("customer_id", old[4])
+        )
+        if new[:4] != old[:4]:
+            deltas.append((*old[:3], -(old[3] or 0.0), -1))
+            deltas.append((*new[:4], 1))
+        if new != old:
+            customers.update((old[4], new[4]))
+    ledger.apply_deltas(db, deltas)
+    customer_summary.refresh(db, customers)
+    mark_dirty(db, "financial_records")
+
+def sync_sale_record(db: Session, customer):
+    """
+    Mirror a customer's purchase onto its primary sale record: one UPDATE by
+    primary key, or a new record (which becomes the primary one) when there is
+    none and the amount is positive. Returns the record id, or None.
+    """
+    values = sale_record_values(customer)
+    record_id = customer.primary_record_id
+    old = _snapshots(db, [record_id]).get(record_id) if record_id is not None else None
+    # The link may be stale if the record was re-pointed at another customer
+    if old is None or old[4] != customer.id:
+        if (customer.total_amount or 0) <= 0:
+            return None
+        return record_sale(db, customer).id
+    if customer.purchase_date is None:
+        values.pop("date")
+    for key in ("transaction_type", "category", "customer_id"):
+        values.pop(key)
+    _apply_updates(db, {record_id: old}, [{"id": record_id, **values}])
+    return record_id
+
+def bulk_create_records(db: Session, rows: list[dict]):
+    objs = insert_records(db, rows)
+    return bulk.reload(db, FinancialRecord, [o.id for o in objs], joinedload(FinancialRecord.customer))
+
+def bulk_update_records(db: Session, rows: list[dict]):
+    update_records(db, rows)
+    return bulk.reload(db, FinancialRecord, [row["id"] for row in rows], joinedload(FinancialRecord.customer))
+
+def bulk_delete_records(db: Session, ids: list[int]):
+    before = _snapshots(db, ids)
+    _unlink_primary(db, list(before))
+    deleted, missing = bulk.delete_rows(db, FinancialRecord, ids)
+    ledger.apply_deltas(db, [(d, t, c, -(amount or 0.0), -1) for d, t, c, amount, _ in before.values()])
+    customer_summary.refresh(db, [customer_id for *_, customer_id in before.values()])
+    mark_dirty(db, "financial_records")
+    db.flush()
+    return deleted, missing
+
 # helpers for dashboard:
 def total_income(db: Session):
     return db.query(FinancialRecord).filter(FinancialRecord.transaction_type.ilike("income")).with_entities(
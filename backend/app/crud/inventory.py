@@ -0,0 +1,245 @@
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from sqlalchemy import BigInteger, cast, func, literal, null, select, union_all, update
+from typing import Optional
+from app.models.inventory import Inventory, stock_status
+from app.core.cache import mark_dirty
+from app.core.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from app.crud import bulk
+from app.core.fast_read import pick_columns, response_columns
+from app.schemas.inventory import InventoryCreate, InventoryUpdate, InventoryResponse
+
+# InventoryResponse's fields as plain columns, for the fast read mode and ?fields=
+ROW_COLUMNS = response_columns(InventoryResponse, Inventory)
+
+def _filtered_items(
+    db: Session,
+    category: Optional[str] = None,
+    item_status: Optional[str] = None,
+    supplier: Optional[str] = None,
+    columns=None,
+):
+    query = db.query(Inventory) if columns is None else db.query(*columns)
+    if category:
+        query = query.filter(Inventory.category == category)
+    if item_status:
+        query = query.filter(Inventory.status == item_status)
+    if supplier:
+        query = query.filter(Inventory.supplier == supplier)
+    return query
+
+def list_items(db: Session, descending: bool = False, **filters):
+    order = Inventory.id.desc() if descending else Inventory.id
+    return _filtered_items(db, **filters).order_by(order).all()
+
+def page_items(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = False, **filters):
+    return keyset_paginate(
+        _filtered_items(db, **filters), Inventory.id,
+        descending=descending, cursor=cursor, limit=limit
+    )
+
+def list_rows(db: Session, descending: bool = False, fields: Optional[list[str]] = None, **filters):
+    """list_items as plain rows of the response fields, or just `fields` (no ORM objects)."""
+    return list_items(db, descending, columns=pick_columns(ROW_COLUMNS, fields), **filters)
+
+def page_rows(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = False, fields: Optional[list[str]] = None, **filters):
+    # The cursor is built from the row's id, so it is always selected
+    columns = pick_columns(ROW_COLUMNS, fields, "id")
+    return page_items(db, cursor, limit, descending, columns=columns, **filters)
+
+def export_statement(date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """Plain columns for exports, filtered on date added, by id."""
+    stmt = select(*Inventory.__table__.columns).order_by(Inventory.id)
+    if date_from:
+        stmt = stmt.where(Inventory.date_added >= date_from)
+    if date_to:
+        stmt = stmt.where(Inventory.date_added <= date_to)
+    return stmt
+
+def get_item(db: Session, item_id: int):
+    return db.query(Inventory).filter(Inventory.id == item_id).first()
+
+def get_row(db: Session, item_id: int, fields: Optional[list[str]] = None):
+    """get_item as a plain row of the response fields, or just `fields`."""
+    columns = pick_columns(ROW_COLUMNS, fields)
+    return _filtered_items(db, columns=columns).filter(Inventory.id == item_id).first()
+
+def create_item(db: Session, data: InventoryCreate):
+    item = Inventory(**data.model_dump())
+    db.add(item)
+    mark_dirty(db, "inventory")
+    db.flush()
+    return item
+
+# Changing either of these changes the status the item should have
+STOCK_COLUMNS = ("quantity_in_stock", "restock_level")
+
+def update_item(db: Session, item_id: int, data: InventoryUpdate):
+    item = get_item(db, item_id)
+    if not item:
+        return None
+    changes = data.model_dump(exclude_unset=True)
+    for k, v in changes.items():
+        setattr(item, k, v)
+    if any(k in changes for k in STOCK_COLUMNS):
+        item.update_status()
+    mark_dirty(db, "inventory")
+    db.flush()
+    return item
+
+def delete_item(db: Session, item_id: int):
+    item = get_item(db, item_id)
+    if not item:
+        return False
+    db.delete(item)
+    mark_dirty(db, "inventory")
+    db.flush()
+    return True
+
+def bulk_create_items(db: Session, rows: list[dict]):
+    items = bulk.insert_rows(db, Inventory, rows)
+    mark_dirty(db, "inventory")
+    return bulk.reload(db, Inventory, [item.id for item in items])
+
+def bulk_update_items(db: Session, rows: list[dict]):
+    bulk.update_rows(db, Inventory, rows)
+    restocked = [row["id"] for row in rows if any(k in row for k in STOCK_COLUMNS)]
+    if restocked:
+        # Rows may set only one of the columns, so derive status from the stored values
+        db.execute(
+            update(Inventory)
+            .where(Inventory.id.in_(restocked))
+            .values(status=Inventory.computed_status)
+            .execution_options(synchronize_session=False)
+        )
+    mark_dirty(db, "inventory")
+    return bulk.reload(db, Inventory, [row["id"] for row in rows])
+
+def bulk_delete_items(db: Session, ids: list[int]):
+    deleted, missing = bulk.delete_rows(db, Inventory, ids)
+    mark_dirty(db, "inventory")
+    db.flush()
+    return deleted, missing
+
+def adjust_stock(db: Session, item_id: int, delta: int):
+    """
+    Add `delta` to an item's stock in one conditional UPDATE, recomputing status.
+
+    A decrement only applies if enough stock is left, so concurrent sales can't
+    oversell or lose each other's updates. Returns the updated item, or None if
+    the item doesn't exist or has too little stock.
+    """
+    quantity = Inventory.quantity_in_stock + delta
+    stmt = (
+        update(Inventory)
+        .where(Inventory.id == item_id)
+        .values(quantity_in_stock=quantity, status=stock_status(quantity, Inventory.restock_level))
+        .returning(Inventory)
+        .execution_options(populate_existing=True)
+    )
+    if delta < 0:
+        stmt = stmt.where(Inventory.quantity_in_stock >= -delta)
+    mark_dirty(db, "inventory")
+    return db.scalars(stmt).one_or_none()
+
+def adjust_stock_batch(db: Session, adjustments: list[tuple[int, int]]):
+    """
+    Apply (item_id, delta) adjustments; repeated items are combined.
+
+    Returns (items, failed_ids). Items are locked in id order so concurrent
+    batches can't deadlock. The caller rolls back if anything failed.
+    """
+    totals = {}
+    for item_id, delta in adjustments:
+        totals[item_id] = totals.get(item_id, 0) + delta
+    items, failed = [], []
+    for item_id in sorted(totals):
+        item = adjust_stock(db, item_id, totals[item_id])
+        if item is None:
+            failed.append(item_id)
+        else:
+            items.append(item)
+    return items, failed
+
+def existing_item_ids(db: Session, ids):
+    return set(db.scalars(select(Inventory.id).where(Inventory.id.in_(ids))))
+
+def low_stock_items(db: Session, limit: int = DEFAULT_PAGE_SIZE):
+    """Items at or below their restock level, largest shortfall first."""
+    return (
+        db.query(Inventory)
+        .filter(Inventory.needs_restock)
+        .order_by(Inventory.shortfall.desc(), Inventory.id)
+        .limit(limit)
+        .all()
+    )
+
+def sync_status(db: Session) -> int:
+    """Set every stale status from the stock level in one UPDATE; returns rows changed."""
+    result = db.execute(
+        update(Inventory)
+        .where(Inventory.status != Inventory.computed_status)
+        .values(status=Inventory.computed_status)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        mark_dirty(db, "inventory")
+    return result.rowcount
+
+def _cents(price):
+    # NUMERIC is stored as a float on SQLite; whole cents keep the sums exact on
+    # every backend (Postgres numeric would be exact either way)
+    return cast(func.round(price * 100), BigInteger)
+
+def _valuation_row(items, units, cost_cents, retail_cents, **keys):
+    cost = Decimal(int(cost_cents or 0)) / 100
+    retail = Decimal(int(retail_cents or 0)) / 100
+    margin = retail - cost
+    return {
+        **keys,
+        "items": items,
+        "units": int(units or 0),
+        "cost_value": cost,
+        "retail_value": retail,
+        "margin": margin,
+        "margin_pct": (margin * 100 / retail).quantize(Decimal("0.01")) if retail else None
+    }
+
+def _sums(view: str, key=None):
+    """(view, group, count, units, cost cents, retail cents), grouped by `key` if given."""
+    stmt = select(
+        literal(view).label("view"),
+        (key if key is not None else null()).label("name"),
+        func.count(Inventory.id),
+        func.sum(Inventory.quantity_in_stock),
+        func.sum(Inventory.quantity_in_stock * _cents(Inventory.cost_price)),
+        func.sum(Inventory.quantity_in_stock * _cents(Inventory.selling_price)),
+    )
+    return stmt if key is None else stmt.group_by(key)
+
+def get_valuation(db: Session):
+    """
+    Stock value at cost and at selling price, and the margin between them,
+    overall and per category and per supplier.
+
+    Each view is an aggregate summing integer cents in SQL, all three in one
+    UNION ALL round trip (SQLite has no ROLLUP / GROUPING SETS); the sums are
+    turned into exact Decimals.
+    """
+    rows = db.execute(union_all(
+        _sums("totals"),
+        _sums("category", Inventory.category),
+        _sums("supplier", Inventory.supplier),
+    )).all()
+    views = {"totals": [], "category": [], "supplier": []}
+    for view, name, *sums in rows:
+        keys = {} if view == "totals" else {view: name}
+        views[view].append(_valuation_row(*sums, **keys))
+    # Named groups alphabetically, the unnamed one last
+    by_name = lambda label: lambda row: (row[label] is None, row[label] or "")
+    return {
+        "totals": views["totals"][0],
+        "by_category": sorted(views["category"], key=by_name("category")),
+        "by_supplier": sorted(views["supplier"], key=by_name("supplier"))
+    }
@@ -0,0 +1,129 @@
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from sqlalchemy import func, delete, insert, update, select
+from app.models.financial import FinancialRecord
+from app.models.ledger import DailyLedgerRollup
+
+
+def _bucket(date, transaction_type, category):
+    return (date, transaction_type, category or "")
+
+def _upsert_insert(db: Session):
+    """Return a dialect-specific INSERT that supports ON CONFLICT, or None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(DailyLedgerRollup)
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(DailyLedgerRollup)
+    return None
+
+def apply_deltas(db: Session, deltas):
+    """
+    Add (amount, count) deltas to the rollup.
+
+    `deltas` is an iterable of (date, transaction_type, category, amount, count)
+    tuples; entries for the same bucket are merged first so each bucket is
+    written once. Buckets whose count drops to zero are removed.
+    """
+    merged = defaultdict(lambda: [0.0, 0])
+    for d, transaction_type, category, amount, count in deltas:
+        if d is None or transaction_type is None:
+            continue
+        bucket = merged[_bucket(d, transaction_type, category)]
+        bucket[0] += amount or 0.0
+        bucket[1] += count
+    merged = {k: v for k, v in merged.items() if v[1] != 0 or v[0] != 0}
+    if not merged:
+        return
+
+    stmt = _upsert_insert(db)
+    for (d, transaction_type, category), (amount, count) in merged.items():
+        if stmt is not None:
+            db.execute(
+                stmt.values(
+                    date=d,
+                    transaction_type=transaction_type,
+                    category=category,
+                    total_amount=amount,
+                    record_count=count
+                ).on_conflict_do_update(
+                    index_elements=["date", "transaction_type", "category"],
+                    set_={
+                        "total_amount": DailyLedgerRollup.total_amount + amount,
+                        "record_count": DailyLedgerRollup.record_count + count
+                    }
+                )
+            )
+        else:
+            # Generic fallback: try UPDATE first, INSERT when the bucket is new
+            result = db.execute(
+                update(DailyLedgerRollup)
+                .where(
+                    DailyLedgerRollup.date == d,
+                    DailyLedgerRollup.transaction_type == transaction_type,
+                    DailyLedgerRollup.category == category
+                )
+                .values(
+                    total_amount=DailyLedgerRollup.total_amount + amount,
+                    record_count=DailyLedgerRollup.record_count + count
+                )
+            )
+            if result.rowcount == 0:
+                db.execute(insert(DailyLedgerRollup).values(
+                    date=d,
+                    transaction_type=transaction_type,
+                    category=category,
+                    total_amount=amount,
+                    record_count=count
+                ))
+
+    if any(count < 0 for _, count in merged.values()):
+        db.execute(delete(DailyLedgerRollup).where(DailyLedgerRollup.record_count <= 0))
+
+def record_added(db: Session, record: FinancialRecord):
+    apply_deltas(db, [(record.date, record.transaction_type, record.category, record.amount, 1)])
+
+def record_removed(db: Session, record: FinancialRecord):
+    apply_deltas(db, [(record.date, record.transaction_type, record.category, -(record.amount or 0.0), -1)])
+
+def snapshot(record: FinancialRecord):
+    """Capture the rollup-relevant fields of a record before it is modified."""
+    return (record.date, record.transaction_type, record.category, record.amount)
+
+def record_changed(db: Session, before, record: FinancialRecord):
+    d, transaction_type, category, amount = before
+    if before == snapshot(record):
+        return
+    apply_deltas(db, [
+        (d, transaction_type, category, -(amount or 0.0), -1),
+        (record.date, record.transaction_type, record.category, record.amount, 1)
+    ])
+
+def rebuild(db: Session):
+    """Recompute the whole rollup from financial_records (for backfills)."""
+    db.execute(delete(DailyLedgerRollup))
+    category = func.coalesce(FinancialRecord.category, "")
+    db.execute(
+        insert(DailyLedgerRollup).from_select(
+            ["date", "transaction_type", "category", "total_amount", "record_count"],
+            select(
+                FinancialRecord.date,
+                FinancialRecord.transaction_type,
+                category,
+                func.coalesce(func.sum(FinancialRecord.amount), 0.0),
+                func.count(FinancialRecord.id)
+            ).group_by(FinancialRecord.date, FinancialRecord.transaction_type, category)
+        )
+    )
+    db.flush()
+    return db.query(func.count()).select_from(DailyLedgerRollup).scalar()
+
+def backfill_if_empty(db: Session):
+    """Populate the rollup on first deploy when records exist but it is empty."""
+    if db.query(DailyLedgerRollup).first() is not None:
+        return
+    if db.query(FinancialRecord.id).first() is None:
+        return
+    rebuild(db)
@@ -1,13 +1,65 @@
 from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
 from app.models.marketing import MarketingTracker
-from app.schemas.marketing import MarketingTrackerCreate, MarketingTrackerUpdate
+from app.schemas.marketing import MarketingTrackerCreate, MarketingTrackerUpdate, MarketingTrackerResponse
+from app.core.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from app.core.cache import mark_dirty
+from app.crud import bulk
+from app.core.fast_read import pick_columns, response_columns
 
-def list_campaigns(db: Session):
-    return db.query(MarketingTracker).order_by(MarketingTracker.post_date.desc()).all()
+# MarketingTrackerResponse's fields as plain columns, for ?fields=
+ROW_COLUMNS = response_columns(MarketingTrackerResponse, MarketingTracker)
+
+def _filtered_campaigns(
+    db: Session,
+    platform: Optional[str] = None,
+    content_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    columns=None,
+):
+    query = db.query(MarketingTracker) if columns is None else db.query(*columns)
+    if platform:
+        query = query.filter(MarketingTracker.platform == platform)
+    if content_type:
+        query = query.filter(MarketingTracker.content_type == content_type)
+    if date_from:
+        query = query.filter(MarketingTracker.post_date >= date_from)
+    if date_to:
+        query = query.filter(MarketingTracker.post_date <= date_to)
+    return query
+
+def list_campaigns(db: Session, descending: bool = True, **filters):
+    if descending:
+        order = (MarketingTracker.post_date.desc().nulls_last(), MarketingTracker.id.desc())
+    else:
+        order = (MarketingTracker.post_date.asc().nulls_last(), MarketingTracker.id)
+    return _filtered_campaigns(db, **filters).order_by(*order).all()
+
+def page_campaigns(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = True, **filters):
+    return keyset_paginate(
+        _filtered_campaigns(db, **filters), MarketingTracker.id, MarketingTracker.post_date,
+        descending=descending, cursor=cursor, limit=limit
+    )
+
+def list_rows(db: Session, descending: bool = True, fields: Optional[list[str]] = None, **filters):
+    """list_campaigns as plain rows of the response fields, or just `fields` (no ORM objects)."""
+    return list_campaigns(db, descending, columns=pick_columns(ROW_COLUMNS, fields), **filters)
+
+def page_rows(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = True, fields: Optional[list[str]] = None, **filters):
+    # The cursor is built from the row's id and post_date, so they are always selected
+    columns = pick_columns(ROW_COLUMNS, fields, "id", "post_date")
+    return page_campaigns(db, cursor, limit, descending, columns=columns, **filters)
 
 def get_campaign(db: Session, campaign_id: int):
     return db.query(MarketingTracker).filter(MarketingTracker.id == campaign_id).first()
 
+def get_row(db: Session, campaign_id: int, fields: Optional[list[str]] = None):
+    """get_campaign as a plain row of the response fields, or just `fields`."""
+    columns = pick_columns(ROW_COLUMNS, fields)
+    return _filtered_campaigns(db, columns=columns).filter(MarketingTracker.id == campaign_id).first()
+
 def create_campaign(db: Session, data: MarketingTrackerCreate):
     data_dict = data.model_dump()
     # Convert date string to date object if needed
@@ -16,8 +68,8 @@ def create_campaign(db: Session, data: MarketingTrackerCreate):
         data_dict['post_date'] = datetime.strptime(data_dict['post_date'], '%Y-%m-%d').date()
     obj = MarketingTracker(**data_dict)
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    mark_dirty(db, "marketing_tracker")
+    db.flush()
     return obj
 
 def update_campaign(db: Session, campaign_id: int, data: MarketingTrackerUpdate):
@@ -31,8 +83,8 @@ def update_campaign(db: Session, campaign_id: int, data: MarketingTrackerUpdate)
         data_dict['post_date'] = datetime.strptime(data_dict['post_date'], '%Y-%m-%d').date()
     for k, v in data_dict.items():
         setattr(c, k, v)
-    db.commit()
-    db.refresh(c)
+    mark_dirty(db, "marketing_tracker")
+    db.flush()
     return c
 
 def delete_campaign(db: Session, campaign_id: int):
@@ -40,5 +92,22 @@ def delete_campaign(db: Session, campaign_id: int):
     if not c:
         return False
     db.delete(c)
-    db.commit()
+    mark_dirty(db, "marketing_tracker")
+    db.flush()
     return True
+
+def bulk_create_campaigns(db: Session, rows: list[dict]):
+    objs = bulk.insert_rows(db, MarketingTracker, rows)
+    mark_dirty(db, "marketing_tracker")
+    return bulk.reload(db, MarketingTracker, [o.id for o in objs])
+
+def bulk_update_campaigns(db: Session, rows: list[dict]):
+    bulk.update_rows(db, MarketingTracker, rows)
+    mark_dirty(db, "marketing_tracker")
+    return bulk.reload(db, MarketingTracker, [row["id"] for row in rows])
+
+def bulk_delete_campaigns(db: Session, ids: list[int]):
+    deleted, missing = bulk.delete_rows(db, MarketingTracker, ids)
+    mark_dirty(db, "marketing_tracker")
+    db.flush()
+    return deleted, missing
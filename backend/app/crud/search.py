@@ -0,0 +1,206 @@
+"""
+Global search over customers, suppliers, inventory and deliveries.
+
+SQLite: one FTS5 table (trigram tokenizer, so partial names and phone
+numbers match) kept in sync with the source tables by triggers. Its rowid
+is id * 4 + the source's code, so a trigger finds its entry by rowid. The
+trigram tokenizer needs SQLite 3.34; with an older library no index is
+built and each table is scanned with LIKE instead, ranked by how many terms
+the name matches.
+
+Postgres: pg_trgm GIN indexes on the searched columns; each table is
+matched with ILIKE and ranked by word_similarity. Other backends run the
+same query without indexes (and need word_similarity).
+
+create_search_index() installs either one and is run by a migration.
+"""
+import sqlite3
+from sqlalchemy import case, func, inspect, literal, or_, select, text, union_all
+from sqlalchemy.orm import Session
+from app.models.customer import Customer
+from app.models.supplier import Supplier
+from app.models.inventory import Inventory
+from app.models.delivery import DeliveryLog
+
+# Trigram matching needs at least three characters
+MIN_TERM_LENGTH = 3
+
+# First SQLite release with FTS5's trigram tokenizer
+FTS_TRIGRAM_VERSION = (3, 34, 0)
+
+# (type, rowid code, model, name column, detail columns)
+SOURCES = [
+    ("customer", 0, Customer, "customer_name", ["phone_number", "address", "notes"]),
+    ("supplier", 1, Supplier, "supplier_name", ["product_supplied"]),
+    ("inventory", 2, Inventory, "item_name", []),
+    ("delivery", 3, DeliveryLog, "customer_name", ["location"]),
+]
+TYPES = {code: kind for kind, code, *_ in SOURCES}
+
+
+def search_terms(q: str):
+    """Whitespace-separated terms long enough to match; empty if none are."""
+    return [term for term in q.split() if len(term) >= MIN_TERM_LENGTH]
+
+
+# -------------------------------------------------------------------
+# INDEX DDL
+# -------------------------------------------------------------------
+def _sqlite_details(row: str, columns):
+    if not columns:
+        return "''"
+    return " || ' ' || ".join(f"coalesce({row}.{c}, '')" for c in columns)
+
+def _sqlite_ddl():
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index "
+        "USING fts5(name, details, tokenize='trigram')"
+    ]
+    for kind, code, model, name, details in SOURCES:
+        table = model.__tablename__
+        columns = ", ".join([name] + details)
+        insert = (
+            f"INSERT INTO search_index(rowid, name, details) VALUES "
+            f"(new.id * 4 + {code}, new.{name}, {_sqlite_details('new', details)});"
+        )
+        remove = f"DELETE FROM search_index WHERE rowid = old.id * 4 + {code};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF id, {columns} ON {table} BEGIN {remove} {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN {remove} END",
+            # Backfill rows that existed before the index
+            f"INSERT OR REPLACE INTO search_index(rowid, name, details) "
+            f"SELECT id * 4 + {code}, {name}, {_sqlite_details(table, details)} FROM {table}",
+        ]
+    return statements
+
+def _postgres_ddl():
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    for kind, code, model, name, details in SOURCES:
+        table = model.__tablename__
+        for column in [name] + details:
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+    return statements
+
+def create_search_index(conn):
+    if conn.dialect.name == "sqlite":
+        if sqlite3.sqlite_version_info < FTS_TRIGRAM_VERSION:
+            print(
+                f"Warning: SQLite {sqlite3.sqlite_version} has no FTS5 trigram tokenizer "
+                f"(needs {'.'.join(map(str, FTS_TRIGRAM_VERSION))}); /search will scan the tables"
+            )
+            return
+        statements = _sqlite_ddl()
+    elif conn.dialect.name == "postgresql":
+        statements = _postgres_ddl()
+    else:
+        return
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+# -------------------------------------------------------------------
+# QUERIES
+# -------------------------------------------------------------------
+def _search_fts(db: Session, terms, limit: int, offset: int):
+    # Each term is an FTS5 phrase (quotes doubled); all terms must match
+    match = " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+    rows = db.execute(
+        text(
+            "SELECT rowid, name, details, bm25(search_index, 10.0, 1.0) AS score "
+            "FROM search_index WHERE search_index MATCH :match "
+            "ORDER BY score, rowid LIMIT :limit OFFSET :offset"
+        ),
+        {"match": match, "limit": limit, "offset": offset},
+    ).all()
+    return [
+        {
+            "type": TYPES[rowid % 4],
+            "id": rowid // 4,
+            "name": name,
+            "details": details.strip() or None,
+            # bm25 is lower for better matches; flip it so higher means better
+            "score": round(-score, 4),
+        }
+        for rowid, name, details, score in rows
+    ]
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _joined(columns):
+    # Columns joined by spaces, NULLs as ''; portable, unlike concat_ws
+    parts = [func.coalesce(column, "") for column in columns]
+    joined = parts[0]
+    for part in parts[1:]:
+        joined = joined + " " + part
+    return joined
+
+def _search_like(db: Session, terms, limit: int, offset: int, score):
+    # Every term must appear in one of the columns; rows are ranked by
+    # score(name column, all columns)
+    selects = []
+    for kind, code, model, name, details in SOURCES:
+        name_column = getattr(model, name)
+        detail_columns = [getattr(model, c) for c in details]
+        columns = [name_column] + detail_columns
+        selects.append(
+            select(
+                literal(kind).label("type"),
+                model.id.label("id"),
+                name_column.label("name"),
+                (_joined(detail_columns) if details else literal("")).label("details"),
+                score(name_column, columns).label("score"),
+            ).where(*[
+                or_(*[column.ilike(f"%{_escape_like(term)}%", escape="\\") for column in columns])
+                for term in terms
+            ])
+        )
+    combined = union_all(*selects).subquery()
+    rows = db.execute(
+        select(combined)
+        .order_by(combined.c.score.desc(), combined.c.type, combined.c.id)
+        .limit(limit).offset(offset)
+    ).mappings().all()
+    return [
+        {**row, "details": row["details"].strip() or None, "score": round(float(row["score"]), 4)}
+        for row in rows
+    ]
+
+def _search_trgm(db: Session, terms, limit: int, offset: int):
+    # ILIKE uses the trigram indexes; ranked by how well the whole query matches
+    q = " ".join(terms)
+    return _search_like(
+        db, terms, limit, offset,
+        lambda name, columns: func.word_similarity(q, func.concat_ws(" ", *columns))
+    )
+
+def _search_sqlite_scan(db: Session, terms, limit: int, offset: int):
+    # Without the FTS index: the fraction of the terms found in the name
+    def score(name, columns):
+        matches = [case((name.ilike(f"%{_escape_like(t)}%", escape="\\"), 1.0), else_=0.0) for t in terms]
+        return sum(matches[1:], matches[0]) / len(terms)
+    return _search_like(db, terms, limit, offset, score)
+
+# Whether each SQLite database has the FTS table (it was skipped on old SQLite)
+_has_fts_index = {}
+
+def _fts_index_exists(db: Session) -> bool:
+    engine = db.get_bind().engine
+    if engine not in _has_fts_index:
+        _has_fts_index[engine] = inspect(engine).has_table("search_index")
+    return _has_fts_index[engine]
+
+def search(db: Session, q: str, limit: int, offset: int = 0):
+    """Ranked matches for `q`, best first; every term must match."""
+    terms = search_terms(q)
+    if not terms:
+        return []
+    if db.get_bind().dialect.name == "sqlite":
+        if _fts_index_exists(db):
+            return _search_fts(db, terms, limit, offset)
+        return _search_sqlite_scan(db, terms, limit, offset)
+    return _search_trgm(db, terms, limit, offset)
@@ -1,18 +1,53 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.models.supplier import Supplier
-from app.schemas.supplier import SupplierCreate, SupplierUpdate
+from app.schemas.supplier import SupplierCreate, SupplierUpdate, SupplierResponse
+from app.core.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from app.core.cache import mark_dirty
+from app.crud import bulk
+from app.core.fast_read import pick_columns, response_columns
 
-def list_suppliers(db: Session):
-    return db.query(Supplier).all()
+# SupplierResponse's fields as plain columns, for ?fields=
+ROW_COLUMNS = response_columns(SupplierResponse, Supplier)
+
+def _filtered_suppliers(db: Session, product_supplied: Optional[str] = None, columns=None):
+    query = db.query(Supplier) if columns is None else db.query(*columns)
+    if product_supplied:
+        query = query.filter(Supplier.product_supplied == product_supplied)
+    return query
+
+def list_suppliers(db: Session, descending: bool = False, **filters):
+    order = Supplier.id.desc() if descending else Supplier.id
+    return _filtered_suppliers(db, **filters).order_by(order).all()
+
+def page_suppliers(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = False, **filters):
+    return keyset_paginate(
+        _filtered_suppliers(db, **filters), Supplier.id,
+        descending=descending, cursor=cursor, limit=limit
+    )
+
+def list_rows(db: Session, descending: bool = False, fields: Optional[list[str]] = None, **filters):
+    """list_suppliers as plain rows of the response fields, or just `fields` (no ORM objects)."""
+    return list_suppliers(db, descending, columns=pick_columns(ROW_COLUMNS, fields), **filters)
+
+def page_rows(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = False, fields: Optional[list[str]] = None, **filters):
+    # The cursor is built from the row's id, so it is always selected
+    columns = pick_columns(ROW_COLUMNS, fields, "id")
+    return page_suppliers(db, cursor, limit, descending, columns=columns, **filters)
 
 def get_supplier(db: Session, supplier_id: int):
     return db.query(Supplier).filter(Supplier.id == supplier_id).first()
 
+def get_row(db: Session, supplier_id: int, fields: Optional[list[str]] = None):
+    """get_supplier as a plain row of the response fields, or just `fields`."""
+    columns = pick_columns(ROW_COLUMNS, fields)
+    return _filtered_suppliers(db, columns=columns).filter(Supplier.id == supplier_id).first()
+
 def create_supplier(db: Session, data: SupplierCreate):
     obj = Supplier(**data.model_dump())
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    mark_dirty(db, "suppliers")
+    db.flush()
     return obj
 
 def update_supplier(db: Session, supplier_id: int, data: SupplierUpdate):
@@ -21,8 +56,8 @@ def update_supplier(db: Session, supplier_id: int, data: SupplierUpdate):
         return None
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(s, k, v)
-    db.commit()
-    db.refresh(s)
+    mark_dirty(db, "suppliers")
+    db.flush()
     return s
 
 def delete_supplier(db: Session, supplier_id: int):
@@ -30,5 +65,22 @@ def delete_supplier(db: Session, supplier_id: int):
     if not s:
         return False
     db.delete(s)
-    db.commit()
+    mark_dirty(db, "suppliers")
+    db.flush()
     return True
+
+def bulk_create_suppliers(db: Session, rows: list[dict]):
+    objs = bulk.insert_rows(db, Supplier, rows)
+    mark_dirty(db, "suppliers")
+    return bulk.reload(db, Supplier, [o.id for o in objs])
+
+def bulk_update_suppliers(db: Session, rows: list[dict]):
+    bulk.update_rows(db, Supplier, rows)
+    mark_dirty(db, "suppliers")
+    return bulk.reload(db, Supplier, [row["id"] for row in rows])
+
+def bulk_delete_suppliers(db: Session, ids: list[int]):
+    deleted, missing = bulk.delete_rows(db, Supplier, ids)
+    mark_dirty(db, "suppliers")
+    db.flush()
+    return deleted, missing
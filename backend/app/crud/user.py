@@ -10,8 +10,7 @@ def create(db: Session, data: UserCreate):
     hashed = hash_password(data.password)
     user = User(username=data.username, email=data.email, hashed_password=hashed)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     return user
 
 def update(db: Session, user_id: int, data: UserUpdate):
@@ -23,8 +22,7 @@ def update(db: Session, user_id: int, data: UserUpdate):
         update_data["password"] = hash_password(update_data["password"])
     for k, v in update_data.items():
         setattr(user, k, v)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     return user
 
 def delete(db: Session, user_id: int):
@@ -32,5 +30,5 @@ def delete(db: Session, user_id: int):
     if not user:
         return False
     db.delete(user)
-    db.commit()
+    db.flush()
     return True
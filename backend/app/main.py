@@ -1,56 +1,94 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import inventory, customer, financial, supplier, delivery, marketing, auth, dashboard
+from app.routers import inventory, customer, financial, supplier, delivery, marketing, auth, dashboard, search, exports
 from app.core.security import get_current_active_admin, get_current_user
-from app.core.database import engine
-from app.models import customer as customer_model, inventory as inventory_model, financial as financial_model, supplier as supplier_model, delivery as delivery_model, marketing as marketing_model, user as user_model
-
-# Create all tables in the database
-customer_model.Base.metadata.create_all(bind=engine)
-inventory_model.Base.metadata.create_all(bind=engine)
-financial_model.Base.metadata.create_all(bind=engine)
-supplier_model.Base.metadata.create_all(bind=engine)
-delivery_model.Base.metadata.create_all(bind=engine)
-marketing_model.Base.metadata.create_all(bind=engine)
-user_model.Base.metadata.create_all(bind=engine)
-
-
-app = FastAPI(title="Pro Garden CRM API", version="1.0")
-
-# CORS - allow frontend access
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Register routers
-app.include_router(auth.router)
-app.include_router(inventory.router)
-app.include_router(customer.router)
-app.include_router(financial.router)
-app.include_router(supplier.router)
-app.include_router(delivery.router)
-app.include_router(marketing.router)
-app.include_router(dashboard.router)
-
-@app.get("/")
+from app.core.database import configure_async_engine, engine, session_scope
+from app.core.jobs import PeriodicJob
+from app.core import migrations
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.compression import CompressionMiddleware
+from app.core.etag import ETagMiddleware
+from app.crud import inventory as crud_inventory
+
+# Bring the schema up to date; a single version check when it already is
+migrations.ensure_schema(engine)
+
+def sweep_inventory_status():
+    # Writes that set stock without recomputing status (creates that pass
+    # their own status, imports) can leave it stale; one UPDATE fixes them all
+    with session_scope() as db:
+        return crud_inventory.sync_status(db)
+
+inventory_sweep = PeriodicJob("inventory-status-sweep", sweep_inventory_status, settings.INVENTORY_SWEEP_SECONDS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    inventory_sweep.start()
+    yield
+    inventory_sweep.stop()
+
+
+# Routes outside the feature routers
+router = APIRouter()
+
+@router.get("/")
 def root():
     return {"message": "Pro Garden CRM Backend Running"}
 
 # Test protected routes
-@app.get("/test-auth")
+@router.get("/test-auth")
 async def test_auth(current_user = Depends(get_current_user)):
     return {"message": "You are authenticated", "user": current_user.username}
 
-@app.get("/test-admin")
+@router.get("/test-admin")
 async def test_admin(current_user = Depends(get_current_active_admin)):
     return {"message": "Admin access granted", "user": current_user.username}
 
-from seed_admin import seed_admin
-@app.get("/seed-admin")
+@router.get("/seed-admin")
 def run_seed_admin():
+    # Imported on use: the one-off admin seed isn't needed to serve requests
+    from seed_admin import seed_admin
     result = seed_admin()
     return {"message": result}
+
+
+def create_app(async_db: bool = settings.ASYNC_DB) -> FastAPI:
+    """Build the API; with async_db the read endpoints run on the async engine."""
+    app = FastAPI(title="Pro Garden CRM API", version="1.0", lifespan=lifespan)
+    # Read by get_read_db and the exports to pick the session / engine
+    app.state.async_db = async_db
+
+    # CORS - allow frontend access
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
+    )
+    # ETags for the routes that declare Depends(conditional(...)); gzip/brotli above a size threshold
+    app.add_middleware(ETagMiddleware)
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESS_MIN_BYTES)
+
+    if async_db:
+        configure_async_engine()
+
+    # Register routers
+    app.include_router(auth.router)
+    app.include_router(inventory.router)
+    app.include_router(customer.router)
+    app.include_router(financial.router)
+    app.include_router(supplier.router)
+    app.include_router(delivery.router)
+    app.include_router(marketing.router)
+    app.include_router(dashboard.router)
+    app.include_router(search.router)
+    app.include_router(exports.router)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
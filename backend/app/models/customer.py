@@ -1,23 +1,68 @@
-from sqlalchemy import Column, Integer, String, Float, Date
+import re
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index, text
+from sqlalchemy.orm import validates
+from app.core.config import settings
 from app.core.database import Base
 
+
+def normalize_phone(phone):
+    """
+    Canonical form of a phone number for matching: digits only, in national
+    format. "+234 803 123 4567", "00234-803-1234567" and "0803 123 4567" all
+    become "08031234567". Returns None when there are no digits.
+    """
+    digits = re.sub(r"\D", "", phone or "")
+    if digits.startswith("00"):
+        digits = digits[2:]
+    country = settings.PHONE_COUNTRY_CODE
+    if country and digits.startswith(country) and len(digits) - len(country) >= 7:
+        digits = "0" + digits[len(country):]
+    return digits or None
+
+
 class Customer(Base):
     __tablename__ = "customers"
+    __table_args__ = (
+        # Repeat-customer counts on the dashboard only touch these rows
+        Index(
+            "ix_customers_repeat",
+            "customer_type",
+            postgresql_where=text("customer_type IN ('Repeat', 'Returning')"),
+            sqlite_where=text("customer_type IN ('Repeat', 'Returning')")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     customer_name = Column(String, nullable=False)
     phone_number = Column(String, nullable=False)
+    # normalize_phone(phone_number), for repeat-buyer lookup and duplicate detection
+    phone_key = Column(String(20), nullable=True, index=True)
     address = Column(String, nullable=True)
     product_purchased = Column(String, nullable=True)
     quantity = Column(Integer, nullable=True, default=0)
     total_amount = Column(Float, nullable=True, default=0.0)
-    purchase_date = Column(Date, nullable=True)
-    payment_status = Column(String, nullable=True, default="Pending")
+    purchase_date = Column(Date, nullable=True, index=True)
+    payment_status = Column(String, nullable=True, default="Pending", index=True)
     payment_method = Column(String, nullable=True)
-    delivery_status = Column(String, nullable=True, default="Pending")
+    delivery_status = Column(String, nullable=True, default="Pending", index=True)
     notes = Column(String, nullable=True)
-    customer_type = Column(String, nullable=True, default="New")
+    customer_type = Column(String, nullable=True, default="New", index=True)
     channel = Column(String, nullable=True)
     preferred_product = Column(String, nullable=True)
     follow_up_date = Column(Date, nullable=True)
+    # The Income record mirroring this customer's purchase fields (the latest
+    # sale); customer updates sync it by primary key. use_alter because
+    # financial_records references customers too.
+    primary_record_id = Column(
+        Integer,
+        ForeignKey("financial_records.id", use_alter=True, name="fk_customers_primary_record_id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+
 
+    @validates("phone_number")
+    def _set_phone_key(self, key, value):
+        # Bulk writes that bypass the ORM set phone_key themselves (crud.customer)
+        self.phone_key = normalize_phone(value)
+        return value
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index, text
+from app.core.database import Base
+
+class CustomerSummary(Base):
+    """
+    Order aggregates per customer: the Income financial records linked to it.
+
+    Maintained by app.crud.customer_summary whenever a financial record (or
+    its link to a customer) is written, so the dashboard's repeat-customer
+    count and the per-customer summary don't scan financial_records.
+    Customers without orders have no row.
+    """
+    __tablename__ = "customer_summaries"
+    __table_args__ = (
+        # Repeat-customer count on the dashboard only touches these rows
+        Index(
+            "ix_customer_summaries_repeat",
+            "customer_id",
+            postgresql_where=text("order_count >= 2"),
+            sqlite_where=text("order_count >= 2")
+        ),
+    )
+
+    customer_id = Column(Integer, ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    lifetime_revenue = Column(Float, nullable=False, default=0.0)
+    first_purchase = Column(Date, nullable=True)
+    last_purchase = Column(Date, nullable=True)
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, Date
+from sqlalchemy import Column, Integer, String, Float, Date, Index
 from app.core.database import Base
 
 class DeliveryLog(Base):
     __tablename__ = "delivery_logs"
+    __table_args__ = (
+        # Keyset pagination over (date, id)
+        Index("ix_delivery_logs_date_id", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date, nullable=False)
@@ -1,9 +1,22 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class FinancialRecord(Base):
     __tablename__ = "financial_records"
+    __table_args__ = (
+        # Keyset pagination over (date, id) and the list filters
+        Index("ix_financial_records_date_id", "date", "id"),
+        Index("ix_financial_records_type_date_id", "transaction_type", "date", "id"),
+        Index("ix_financial_records_category_date_id", "category", "date", "id"),
+        # Most expense rows have no customer, so only index the linked ones
+        Index(
+            "ix_financial_records_customer_id",
+            "customer_id",
+            postgresql_where=text("customer_id IS NOT NULL"),
+            sqlite_where=text("customer_id IS NOT NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date, nullable=False)
@@ -17,4 +30,9 @@ class FinancialRecord(Base):
     customer_id = Column(Integer, ForeignKey('customers.id'), nullable=True)
     
     # Relationship
-    customer = relationship("Customer", backref="financial_records")
+    customer = relationship("Customer", backref="financial_records", foreign_keys=[customer_id])
+
+    @property
+    def customer_name(self):
+        # For display purposes; list/detail reads eager-load `customer`
+        return self.customer.customer_name if self.customer else None
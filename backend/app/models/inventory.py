@@ -1,9 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Numeric
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Float, Date, Numeric, Index, case
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql import func, text
 from datetime import date
 from typing import Optional
 from app.core.database import Base
 
+
+def stock_status(quantity, restock_level):
+    """SQL CASE applying the same rules as Inventory.computed_status."""
+    return case(
+        (quantity <= 0, "Out of Stock"),
+        (quantity <= restock_level, "Low Stock"),
+        else_="In Stock"
+    )
+
+
 class Inventory(Base):
     """
     Represents an inventory item in the system.
@@ -22,10 +33,21 @@ class Inventory(Base):
         date_added (date): Date when the item was added to inventory
     """
     __tablename__ = "inventory"
-    __table_args__ = {
-        "extend_existing": True,  # Avoids "table already defined" error
-        "comment": "Stores inventory items and their details"
-    }
+    __table_args__ = (
+        # Partial index over just the items at or below their restock level,
+        # ordered by shortfall, for the low-stock feed
+        Index(
+            "ix_inventory_restock_shortfall",
+            text("(restock_level - quantity_in_stock) DESC"),
+            "id",
+            sqlite_where=text("quantity_in_stock <= restock_level"),
+            postgresql_where=text("quantity_in_stock <= restock_level"),
+        ),
+        {
+            "extend_existing": True,  # Avoids "table already defined" error
+            "comment": "Stores inventory items and their details"
+        },
+    )
 
     id: int = Column(Integer, primary_key=True, index=True)
     item_name: str = Column(String(100), nullable=False, index=True)
@@ -39,6 +61,7 @@ class Inventory(Base):
     status: str = Column(
         String(20), 
         nullable=False, 
+        index=True,
         default="In Stock",
         server_default="In Stock"
     )
@@ -51,17 +74,29 @@ class Inventory(Base):
     def __repr__(self) -> str:
         return f"<Inventory {self.item_name} (ID: {self.id})>"
 
-    @property
+    @hybrid_property
     def needs_restock(self) -> bool:
-        """Check if the item needs to be restocked."""
+        """Check if the item needs to be restocked (also usable in queries)."""
         return self.quantity_in_stock <= self.restock_level
 
-    def update_status(self) -> None:
-        """Update the status based on current stock level."""
+    @hybrid_property
+    def shortfall(self) -> int:
+        """How far the stock is below the restock level (negative when above it)."""
+        return self.restock_level - self.quantity_in_stock
+
+    @hybrid_property
+    def computed_status(self) -> str:
+        """The status the current stock level calls for."""
         if self.quantity_in_stock <= 0:
-            self.status = "Out of Stock"
-        elif self.quantity_in_stock <= self.restock_level:
-            self.status = "Low Stock"
-        else:
-            self.status = "In Stock"
+            return "Out of Stock"
+        if self.quantity_in_stock <= self.restock_level:
+            return "Low Stock"
+        return "In Stock"
+
+    @computed_status.expression
+    def computed_status(cls):
+        return stock_status(cls.quantity_in_stock, cls.restock_level)
 
+    def update_status(self) -> None:
+        """Update the status based on current stock level."""
+        self.status = self.computed_status
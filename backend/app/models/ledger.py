@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float, Date, Index
+from app.core.database import Base
+
+class DailyLedgerRollup(Base):
+    """
+    Running totals of financial_records per day, transaction type and category.
+
+    Maintained incrementally by app.crud.ledger whenever a financial record is
+    written, so dashboard reads scale with the number of days rather than the
+    number of transactions. Records without a category are stored under "".
+    """
+    __tablename__ = "daily_ledger_rollup"
+    __table_args__ = (
+        # Dashboard reads filter on transaction_type, then a date range
+        Index("ix_daily_ledger_rollup_type_date", "transaction_type", "date"),
+    )
+
+    date = Column(Date, primary_key=True)
+    transaction_type = Column(String, primary_key=True)
+    category = Column(String, primary_key=True, default="")
+    total_amount = Column(Float, nullable=False, default=0.0)
+    record_count = Column(Integer, nullable=False, default=0)
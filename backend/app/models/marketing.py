@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, Date
+from sqlalchemy import Column, Integer, String, Float, Date, Index
 from app.core.database import Base
 
 class MarketingTracker(Base):
     __tablename__ = "marketing_tracker"
+    __table_args__ = (
+        # Keyset pagination over (post_date, id)
+        Index("ix_marketing_tracker_post_date_id", "post_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     platform = Column(String, nullable=False)
@@ -1,14 +1,16 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Any
 
 from app.core.database import get_db
-from app.core.security import get_current_user, UserInDB
+from app.core.security import get_current_active_admin, get_current_user, UserInDB
 from app.core.security import (
     create_access_token,
-    verify_password,
+    verify_password_async,
+    hash_pool,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     Token,
     UserInDB
@@ -18,10 +20,11 @@ from app.crud.user import get_by_username
 router = APIRouter(tags=["Authentication"])
 
 async def authenticate_user(username: str, password: str, db: Session):
-    user = get_by_username(db, username)
+    # Neither the sync lookup nor PBKDF2 may run on the event loop
+    user = await run_in_threadpool(get_by_username, db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     return user
 
@@ -30,7 +33,7 @@ from app.core.email import send_login_notification
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> Any:
     user = await authenticate_user(form_data.username, form_data.password, db)
     if not user:
@@ -54,3 +57,8 @@ async def login_for_access_token(
 @router.get("/me", response_model=UserInDB)
 async def read_users_me(current_user: UserInDB = Depends(get_current_user)):
     return current_user
+
+@router.get("/token/pool-stats", dependencies=[Depends(get_current_active_admin)])
+def get_hash_pool_stats():
+    """Queue depth and counters for the password hashing pool"""
+    return hash_pool.stats()
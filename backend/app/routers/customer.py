@@ -1,110 +1,165 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from ..core.database import get_db
-from ..schemas.customer import CustomerCreate, CustomerResponse, CustomerUpdate
+from typing import Any, List, Optional
+from ..core.database import ReadSession, get_db, get_read_db, run_db
+from ..core.export import ExportFormat, export_response, stream_export
+from ..core.pagination import PageParams, set_next_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..core.fast_read import FAST_MODE, FIELDS, parse_fields, rows_response, row_response
+from ..core.etag import conditional
+from ..schemas.customer import (
+    CustomerCreate, CustomerResponse, CustomerUpdate, CustomerBulkResult,
+    DuplicateGroup, CustomerMergeRequest, CustomerMergeResult, CustomerSummary
+)
 from ..crud import customer as crud_customer
+from ..crud import customer_summary as crud_customer_summary
+from ..crud import bulk
+from ..models.customer import Customer
+from ..schemas.bulk import BulkDeleteRequest, BulkDeleteResult, MAX_BULK_ROWS
 from ..crud import financial as crud_financial
-from ..schemas.financial import FinancialRecordCreate, FinancialRecordUpdate
 from datetime import date
 
 router = APIRouter(prefix="/customers", tags=["Customers"])
 
-@router.get("/", response_model=list[CustomerResponse])
-def list_customers(db: Session = Depends(get_db)):
-    return crud_customer.list_customers(db)
+@router.get("/", response_model=list[CustomerResponse], dependencies=[Depends(conditional("customers"))])
+async def list_customers(
+    response: Response,
+    payment_status: Optional[str] = None,
+    delivery_status: Optional[str] = None,
+    customer_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    fields: Optional[str] = FIELDS,
+    fast: bool = FAST_MODE,
+    page: PageParams = Depends(),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    filters = dict(
+        payment_status=payment_status,
+        delivery_status=delivery_status,
+        customer_type=customer_type,
+        date_from=date_from,
+        date_to=date_to
+    )
+    descending = page.descending(default=False)
+    fieldset = parse_fields(fields, CustomerResponse)
+    if fast or fieldset:
+        if page.all_rows:
+            return rows_response(await run_db(db, crud_customer.list_rows, descending, fieldset, **filters), fields=fieldset)
+        return rows_response(*await run_db(db, crud_customer.page_rows, page.cursor, page.limit, descending, fieldset, **filters), fields=fieldset)
+    if page.all_rows:
+        return await run_db(db, crud_customer.list_customers, descending, **filters)
+    items, next_cursor = await run_db(db, crud_customer.page_customers, page.cursor, page.limit, descending, **filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 @router.post("/", response_model=CustomerResponse)
-def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
-    customer = crud_customer.create_customer(db, payload)
+def create_customer(
+    payload: CustomerCreate,
+    match_existing: bool = Query(False, description="Record the sale on an existing customer with the same phone and name"),
+    db: Session = Depends(get_db, scope="function")
+):
+    """
+    Create a customer (and its Income record if there is an amount).
+
+    With match_existing=true a repeat buyer, matched on normalized phone and
+    a similar name, gets the sale added to their existing row, which is
+    returned instead of a new one (same 200 response). Bulk create never
+    matches.
+    """
+    existing = crud_customer.find_repeat_customer(db, payload.customer_name, payload.phone_number) if match_existing else None
+    if existing:
+        customer = crud_customer.record_repeat_sale(db, existing, payload)
+    else:
+        customer = crud_customer.create_customer(db, payload)
     
     # Automatically create financial record if amount > 0
     if (customer.total_amount or 0) > 0:
-        financial_data = FinancialRecordCreate(
-            date=customer.purchase_date or date.today(),
-            transaction_type="Income",
-            description=f"Sale to {customer.customer_name} - {customer.product_purchased or 'Product'}",
-            category="Sales",
-            amount=customer.total_amount,
-            payment_method=customer.payment_method,
-            status=customer.payment_status or "Pending",
-            notes=customer.notes,
-            customer_id=customer.id
-        )
-        crud_financial.create_record(db, financial_data)
+        crud_financial.record_sale(db, customer)
         
     return customer
 
+@router.post("/bulk", response_model=CustomerBulkResult)
+def bulk_create_customers(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Create many customers (with their Income records) in one transaction; invalid rows are reported and skipped"""
+    valid, errors = bulk.validate_rows(payload, CustomerCreate)
+    items = crud_customer.bulk_create_customers(db, [values for _, values in valid])
+    return {"items": items, "errors": errors}
+
+@router.put("/bulk", response_model=CustomerBulkResult)
+def bulk_update_customers(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Partially update many customers (with their Income records); every row must include its id"""
+    valid, errors = bulk.validate_rows(payload, CustomerUpdate, partial=True)
+    rows = bulk.split_update_rows(db, Customer, valid, errors)
+    items = crud_customer.bulk_update_customers(db, rows)
+    return {"items": items, "errors": errors}
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def bulk_delete_customers(payload: BulkDeleteRequest, db: Session = Depends(get_db, scope="function")):
+    deleted, missing = crud_customer.bulk_delete_customers(db, payload.ids)
+    return {"deleted": deleted, "missing": missing}
+
+@router.get("/duplicates", response_model=List[DuplicateGroup])
+async def find_duplicates(
+    threshold: float = Query(crud_customer.NAME_MATCH_THRESHOLD, ge=0, le=1, description="Minimum name similarity"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    """Groups of customers sharing a phone number (any formatting) with similar names"""
+    return await run_db(db, crud_customer.find_duplicates, threshold, limit)
+
+@router.post("/merge", response_model=CustomerMergeResult)
+def merge_customers(payload: CustomerMergeRequest, db: Session = Depends(get_db, scope="function")):
+    """Fold duplicate customers into one; their financial records move to the target"""
+    result = crud_customer.merge_customers(db, payload.target_id, payload.source_ids)
+    if result is None:
+        raise HTTPException(404, "Customer not found")
+    customer, merged, moved, missing = result
+    return {"customer": customer, "merged": merged, "records_moved": moved, "missing": missing}
+
+@router.get("/export")
+async def export_customers(
+    request: Request,
+    format: ExportFormat = "csv",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+):
+    """Stream customers (by purchase date range) as CSV or NDJSON"""
+    stmt = crud_customer.export_statement(date_from, date_to)
+    return export_response(stream_export(request, stmt, format), format, "customers")
+
 @router.get("/{customer_id}", response_model=CustomerResponse)
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
-    c = crud_customer.get_customer(db, customer_id)
+async def get_customer(customer_id: int, fields: Optional[str] = FIELDS, db: ReadSession = Depends(get_read_db, scope="function")):
+    fieldset = parse_fields(fields, CustomerResponse)
+    if fieldset:
+        c = await run_db(db, crud_customer.get_row, customer_id, fieldset)
+    else:
+        c = await run_db(db, crud_customer.get_customer, customer_id)
     if not c:
         raise HTTPException(404, "Customer not found")
-    return c
+    return row_response(c) if fieldset else c
+
+@router.get("/{customer_id}/summary", response_model=CustomerSummary)
+async def get_customer_summary(customer_id: int, db: ReadSession = Depends(get_read_db, scope="function")):
+    """Order count, lifetime revenue, average order value and first/last purchase dates"""
+    summary = await run_db(db, crud_customer_summary.get_summary, customer_id)
+    if summary is None:
+        raise HTTPException(404, "Customer not found")
+    return summary
 
 @router.put("/{customer_id}", response_model=CustomerResponse)
-def update_customer(customer_id: int, payload: CustomerUpdate, db: Session = Depends(get_db)):
+def update_customer(customer_id: int, payload: CustomerUpdate, db: Session = Depends(get_db, scope="function")):
     updated_customer = crud_customer.update_customer(db, customer_id, payload)
     if not updated_customer:
         raise HTTPException(404, "Customer not found")
         
-    # Sync with financial record
-    # Find existing financial record for this customer
-    # Note: This assumes one financial record per customer for now, or updates the latest one
-    # A better approach might be to store financial_record_id on customer, but we have customer_id on financial_record
-    
-    # We need a way to find financial record by customer_id. 
-    # Let's add a helper in crud_financial or just query here if simple.
-    # For now, let's try to find one and update it.
-    
-    existing_records = db.query(crud_financial.FinancialRecord).filter(
-        crud_financial.FinancialRecord.customer_id == customer_id
-    ).all()
-    
-    if existing_records:
-        # Update the most recent one or all? Let's update the most recent one
-        record = existing_records[-1] # Assuming order by id or date
-        
-        update_data = FinancialRecordUpdate(
-            date=updated_customer.purchase_date,
-            description=f"Sale to {updated_customer.customer_name} - {updated_customer.product_purchased or 'Product'}",
-            amount=updated_customer.total_amount,
-            payment_method=updated_customer.payment_method,
-            status=updated_customer.payment_status,
-            notes=updated_customer.notes
-        )
-        crud_financial.update_record(db, record.id, update_data)
-    elif (updated_customer.total_amount or 0) > 0:
-        # Create if not exists and amount > 0
-        financial_data = FinancialRecordCreate(
-            date=updated_customer.purchase_date or date.today(),
-            transaction_type="Income",
-            description=f"Sale to {updated_customer.customer_name} - {updated_customer.product_purchased or 'Product'}",
-            category="Sales",
-            amount=updated_customer.total_amount,
-            payment_method=updated_customer.payment_method,
-            status=updated_customer.payment_status or "Pending",
-            notes=updated_customer.notes,
-            customer_id=updated_customer.id
-        )
-        crud_financial.create_record(db, financial_data)
+    # Sync the customer's primary sale record (one UPDATE by id, or create it)
+    crud_financial.sync_sale_record(db, updated_customer)
 
     return updated_customer
 
 @router.delete("/{customer_id}")
-def delete_customer(customer_id: int, db: Session = Depends(get_db)):
-    # Optional: Delete associated financial records?
-    # For now, let's keep them but maybe unlink them? Or cascade delete?
-    # Let's leave them for financial history but unlink
-    
-    # Unlink financial records
-    existing_records = db.query(crud_financial.FinancialRecord).filter(
-        crud_financial.FinancialRecord.customer_id == customer_id
-    ).all()
-    for record in existing_records:
-        record.customer_id = None
-        db.add(record)
-    db.commit()
-
+def delete_customer(customer_id: int, db: Session = Depends(get_db, scope="function")):
+    # Financial records are kept for history but unlinked (crud_customer.delete_customer)
     ok = crud_customer.delete_customer(db, customer_id)
     if not ok:
         raise HTTPException(404, "Customer not found")
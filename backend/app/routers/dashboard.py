@@ -1,30 +1,41 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, Query
+from typing import Literal
+from app.core.database import ReadSession, get_read_db, run_db
 from app.crud import dashboard as crud_dashboard
+from app.core.cache import dashboard_cache, cache_stats
+from app.core.etag import conditional
+from app.core.security import get_current_active_admin
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
-@router.get("/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get all dashboard statistics in one call"""
-    
-    financial_summary = crud_dashboard.get_financial_summary(db)
-    customer_stats = crud_dashboard.get_customer_stats(db)
-    monthly_comparison = crud_dashboard.get_monthly_comparison(db)
-    
-    return {
-        **financial_summary,
-        **customer_stats,
-        **monthly_comparison
-    }
+@router.get("/stats", dependencies=[Depends(conditional("financial_records", "customers"))])
+async def get_dashboard_stats(db: ReadSession = Depends(get_read_db, scope="function")):
+    """Get all dashboard statistics in one call (a single database round trip)"""
+    return await dashboard_cache.aget_or_compute(
+        lambda: run_db(db, crud_dashboard.get_dashboard_stats), "dashboard/stats"
+    )
 
-@router.get("/sales-trend")
-def get_sales_trend(days: int = 30, db: Session = Depends(get_db)):
-    """Get sales trend data for charts"""
-    return crud_dashboard.get_sales_trend(db, days)
+@router.get("/sales-trend", dependencies=[Depends(conditional("financial_records", "customers"))])
+async def get_sales_trend(
+    days: int = Query(30, ge=1, le=crud_dashboard.TREND_MAX_DAYS),
+    granularity: Literal["day", "week", "month", "quarter"] = "day",
+    points: int = Query(crud_dashboard.TREND_DEFAULT_POINTS, ge=3, le=crud_dashboard.TREND_MAX_POINTS, description="Downsample to at most this many points"),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    """Get sales trend data for charts: {"dates": [...], "amounts": [...]}, gaps filled with 0"""
+    return await dashboard_cache.aget_or_compute(
+        lambda: run_db(db, crud_dashboard.get_sales_trend, days, granularity, points),
+        "dashboard/sales-trend", days=days, granularity=granularity, points=points
+    )
 
-@router.get("/expense-breakdown")
-def get_expense_breakdown(db: Session = Depends(get_db)):
+@router.get("/expense-breakdown", dependencies=[Depends(conditional("financial_records", "customers"))])
+async def get_expense_breakdown(db: ReadSession = Depends(get_read_db, scope="function")):
     """Get expense breakdown by category"""
-    return crud_dashboard.get_expense_breakdown(db)
+    return await dashboard_cache.aget_or_compute(
+        lambda: run_db(db, crud_dashboard.get_expense_breakdown), "dashboard/expense-breakdown"
+    )
+
+@router.get("/cache-stats", dependencies=[Depends(get_current_active_admin)])
+def get_cache_stats():
+    """Hit/miss counters for the in-process result caches"""
+    return cache_stats()
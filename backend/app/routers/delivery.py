@@ -1,17 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.delivery import DeliveryLogCreate, DeliveryLogResponse, DeliveryLogUpdate
+from typing import Any, List, Optional
+from datetime import date, datetime
+from app.core.database import ReadSession, get_db, get_read_db, run_db
+from app.core.pagination import PageParams, set_next_cursor
+from app.core.fast_read import FIELDS, parse_fields, rows_response, row_response
+from app.core.etag import conditional
+from app.schemas.delivery import DeliveryLogCreate, DeliveryLogResponse, DeliveryLogUpdate, DeliveryLogBulkResult
 from app.crud import delivery as crud_delivery
+from app.crud import bulk
+from app.models.delivery import DeliveryLog
+from app.schemas.bulk import BulkDeleteRequest, BulkDeleteResult, MAX_BULK_ROWS
 
 router = APIRouter(prefix="/deliveries", tags=["Deliveries"])
 
-@router.get("/", response_model=list[DeliveryLogResponse])
-def list_deliveries(db: Session = Depends(get_db)):
-    return crud_delivery.list_deliveries(db)
+@router.get("/", response_model=list[DeliveryLogResponse], dependencies=[Depends(conditional("delivery_logs"))])
+async def list_deliveries(
+    response: Response,
+    delivery_person: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    fields: Optional[str] = FIELDS,
+    page: PageParams = Depends(),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    filters = dict(delivery_person=delivery_person, date_from=date_from, date_to=date_to)
+    descending = page.descending(default=True)
+    fieldset = parse_fields(fields, DeliveryLogResponse)
+    if fieldset:
+        if page.all_rows:
+            return rows_response(await run_db(db, crud_delivery.list_rows, descending, fieldset, **filters), fields=fieldset)
+        return rows_response(*await run_db(db, crud_delivery.page_rows, page.cursor, page.limit, descending, fieldset, **filters), fields=fieldset)
+    if page.all_rows:
+        return await run_db(db, crud_delivery.list_deliveries, descending, **filters)
+    items, next_cursor = await run_db(db, crud_delivery.page_deliveries, page.cursor, page.limit, descending, **filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 @router.post("/", response_model=DeliveryLogResponse)
-def create_delivery(payload: DeliveryLogCreate, db: Session = Depends(get_db)):
+def create_delivery(payload: DeliveryLogCreate, db: Session = Depends(get_db, scope="function")):
     try:
         return crud_delivery.create_delivery(db, payload)
     except Exception as e:
@@ -20,22 +47,52 @@ def create_delivery(payload: DeliveryLogCreate, db: Session = Depends(get_db)):
         print(f"ERROR in create_delivery: {error_detail}")
         raise HTTPException(500, detail=str(e))
 
+def _parse_date(values: dict) -> dict:
+    # Delivery dates arrive as YYYY-MM-DD strings
+    if isinstance(values.get("date"), str):
+        values["date"] = datetime.strptime(values["date"], "%Y-%m-%d").date()
+    return values
+
+@router.post("/bulk", response_model=DeliveryLogBulkResult)
+def bulk_create_deliveries(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Create many delivery logs in one transaction; invalid rows are reported and skipped"""
+    valid, errors = bulk.validate_rows(payload, DeliveryLogCreate, prepare=_parse_date)
+    items = crud_delivery.bulk_create_deliveries(db, [values for _, values in valid])
+    return {"items": items, "errors": errors}
+
+@router.put("/bulk", response_model=DeliveryLogBulkResult)
+def bulk_update_deliveries(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Partially update many delivery logs; every row must include its id"""
+    valid, errors = bulk.validate_rows(payload, DeliveryLogUpdate, prepare=_parse_date, partial=True)
+    rows = bulk.split_update_rows(db, DeliveryLog, valid, errors)
+    items = crud_delivery.bulk_update_deliveries(db, rows)
+    return {"items": items, "errors": errors}
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def bulk_delete_deliveries(payload: BulkDeleteRequest, db: Session = Depends(get_db, scope="function")):
+    deleted, missing = crud_delivery.bulk_delete_deliveries(db, payload.ids)
+    return {"deleted": deleted, "missing": missing}
+
 @router.get("/{delivery_id}", response_model=DeliveryLogResponse)
-def get_delivery(delivery_id: int, db: Session = Depends(get_db)):
-    d = crud_delivery.get_delivery(db, delivery_id)
+async def get_delivery(delivery_id: int, fields: Optional[str] = FIELDS, db: ReadSession = Depends(get_read_db, scope="function")):
+    fieldset = parse_fields(fields, DeliveryLogResponse)
+    if fieldset:
+        d = await run_db(db, crud_delivery.get_row, delivery_id, fieldset)
+    else:
+        d = await run_db(db, crud_delivery.get_delivery, delivery_id)
     if not d:
         raise HTTPException(404, "Delivery not found")
-    return d
+    return row_response(d) if fieldset else d
 
 @router.put("/{delivery_id}", response_model=DeliveryLogResponse)
-def update_delivery(delivery_id: int, payload: DeliveryLogUpdate, db: Session = Depends(get_db)):
+def update_delivery(delivery_id: int, payload: DeliveryLogUpdate, db: Session = Depends(get_db, scope="function")):
     updated = crud_delivery.update_delivery(db, delivery_id, payload)
     if not updated:
         raise HTTPException(404, "Delivery not found")
     return updated
 
 @router.delete("/{delivery_id}")
-def delete_delivery(delivery_id: int, db: Session = Depends(get_db)):
+def delete_delivery(delivery_id: int, db: Session = Depends(get_db, scope="function")):
     ok = crud_delivery.delete_delivery(db, delivery_id)
     if not ok:
         raise HTTPException(404, "Delivery not found")
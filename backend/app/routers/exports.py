@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from app.core.database import get_db
+from app.core import columnar
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+@router.get("/{table}")
+def export_table(
+    table: Literal["financial_records", "customers", "delivery_logs", "inventory"],
+    format: columnar.ColumnarFormat = "parquet",
+    partition: Optional[Literal["month"]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db, scope="function")
+):
+    """
+    Download a table as a typed Parquet or Arrow IPC file, or with
+    partition=month a zip of one file per month (month=YYYY-MM/part-0.*)
+    """
+    try:
+        columnar.require_pyarrow()
+    except columnar.ColumnarUnavailable as e:
+        raise HTTPException(503, str(e))
+    out_dir = tempfile.mkdtemp(prefix="export-")
+    cleanup = BackgroundTask(shutil.rmtree, out_dir, ignore_errors=True)
+    try:
+        written = columnar.write_table(db, table, out_dir, format, partition == "month", date_from, date_to)
+        if partition is None:
+            path, = written
+            return FileResponse(path, media_type=MEDIA_TYPES[format], filename=f"{table}.{format}", background=cleanup)
+        path = os.path.join(out_dir, f"{table}.zip")
+        # Parquet and Arrow files are already compressed/binary; store them as-is
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+            for file in written:
+                archive.write(file, os.path.relpath(file, out_dir))
+        return FileResponse(path, media_type="application/zip", filename=f"{table}.zip", background=cleanup)
+    except Exception:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        raise
@@ -1,31 +1,85 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.core.database import get_db
-from app.schemas.financial import FinancialRecordCreate, FinancialRecordResponse, FinancialRecordUpdate
+from typing import Any, List, Optional
+from app.core.database import ReadSession, get_db, get_read_db, run_db
+from app.core.pagination import PageParams, set_next_cursor
+from app.core.fast_read import FAST_MODE, FIELDS, parse_fields, rows_response, row_response
+from app.schemas.financial import FinancialRecordCreate, FinancialRecordResponse, FinancialRecordUpdate, FinancialRecordBulkResult
 from app.crud import financial as crud_financial
+from app.crud import bulk
+from app.models.financial import FinancialRecord
+from app.schemas.bulk import BulkDeleteRequest, BulkDeleteResult, MAX_BULK_ROWS
 from app.crud import customer as crud_customer
+from app.core.cache import dashboard_cache
+from app.core.export import ExportFormat, export_response, stream_export
+from app.core.etag import conditional
 from datetime import date
 
 router = APIRouter(prefix="/financial", tags=["Financial"])
 
-@router.get("/", response_model=list[FinancialRecordResponse])
-def list_records(db: Session = Depends(get_db)):
-    records = crud_financial.list_records(db)
-    # Add customer names to response
-    for record in records:
-        if record.customer_id:
-            customer = crud_customer.get_customer(db, record.customer_id)
-            if customer:
-                record.customer_name = customer.customer_name
+@router.get("/", response_model=list[FinancialRecordResponse], dependencies=[Depends(conditional("financial_records", "customers"))])
+async def list_records(
+    response: Response,
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    customer_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    fields: Optional[str] = FIELDS,
+    fast: bool = FAST_MODE,
+    page: PageParams = Depends(),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    filters = dict(
+        transaction_type=transaction_type,
+        category=category,
+        status=status,
+        customer_id=customer_id,
+        date_from=date_from,
+        date_to=date_to
+    )
+    descending = page.descending(default=True)
+    fieldset = parse_fields(fields, FinancialRecordResponse)
+    if fast or fieldset:
+        if page.all_rows:
+            return rows_response(await run_db(db, crud_financial.list_rows, descending, fieldset, **filters), fields=fieldset)
+        return rows_response(*await run_db(db, crud_financial.page_rows, page.cursor, page.limit, descending, fieldset, **filters), fields=fieldset)
+    if page.all_rows:
+        records = await run_db(db, crud_financial.list_records, descending, **filters)
+    else:
+        records, next_cursor = await run_db(db, crud_financial.page_records, page.cursor, page.limit, descending, **filters)
+        set_next_cursor(response, next_cursor)
+    # customer_name comes from the eager-loaded customer relationship
     return records
 
 @router.post("/", response_model=FinancialRecordResponse)
-def create_record(payload: FinancialRecordCreate, db: Session = Depends(get_db)):
+def create_record(payload: FinancialRecordCreate, db: Session = Depends(get_db, scope="function")):
     return crud_financial.create_record(db, payload)
 
+@router.post("/bulk", response_model=FinancialRecordBulkResult)
+def bulk_create_records(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Create many financial records in one transaction; invalid rows are reported and skipped"""
+    valid, errors = bulk.validate_rows(payload, FinancialRecordCreate)
+    items = crud_financial.bulk_create_records(db, [values for _, values in valid])
+    return {"items": items, "errors": errors}
+
+@router.put("/bulk", response_model=FinancialRecordBulkResult)
+def bulk_update_records(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Partially update many financial records; every row must include its id"""
+    valid, errors = bulk.validate_rows(payload, FinancialRecordUpdate, partial=True)
+    rows = bulk.split_update_rows(db, FinancialRecord, valid, errors)
+    items = crud_financial.bulk_update_records(db, rows)
+    return {"items": items, "errors": errors}
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def bulk_delete_records(payload: BulkDeleteRequest, db: Session = Depends(get_db, scope="function")):
+    deleted, missing = crud_financial.bulk_delete_records(db, payload.ids)
+    return {"deleted": deleted, "missing": missing}
+
 @router.post("/from-customer/{customer_id}", response_model=FinancialRecordResponse)
-def create_from_customer(customer_id: int, db: Session = Depends(get_db)):
+def create_from_customer(customer_id: int, db: Session = Depends(get_db, scope="function")):
     """Create a financial record from a customer's purchase data"""
     customer = crud_customer.get_customer(db, customer_id)
     if not customer:
@@ -46,34 +100,47 @@ def create_from_customer(customer_id: int, db: Session = Depends(get_db)):
     
     return crud_financial.create_record(db, financial_data)
 
+@router.get("/export")
+async def export_records(
+    request: Request,
+    format: ExportFormat = "csv",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+):
+    """Stream every record in the date range as CSV or NDJSON, oldest first"""
+    stmt = crud_financial.export_statement(date_from, date_to)
+    return export_response(stream_export(request, stmt, format), format, "financial_records")
+
 @router.get("/{record_id}", response_model=FinancialRecordResponse)
-def get_record(record_id: int, db: Session = Depends(get_db)):
-    r = crud_financial.get_record(db, record_id)
+async def get_record(record_id: int, fields: Optional[str] = FIELDS, db: ReadSession = Depends(get_read_db, scope="function")):
+    fieldset = parse_fields(fields, FinancialRecordResponse)
+    if fieldset:
+        r = await run_db(db, crud_financial.get_row, record_id, fieldset)
+    else:
+        r = await run_db(db, crud_financial.get_record, record_id)
     if not r:
         raise HTTPException(404, "Record not found")
-    # Add customer name
-    if r.customer_id:
-        customer = crud_customer.get_customer(db, r.customer_id)
-        if customer:
-            r.customer_name = customer.customer_name
-    return r
+    return row_response(r) if fieldset else r
 
 @router.put("/{record_id}", response_model=FinancialRecordResponse)
-def update_record(record_id: int, payload: FinancialRecordUpdate, db: Session = Depends(get_db)):
+def update_record(record_id: int, payload: FinancialRecordUpdate, db: Session = Depends(get_db, scope="function")):
     updated = crud_financial.update_record(db, record_id, payload)
     if not updated:
         raise HTTPException(404, "Record not found")
     return updated
 
 @router.delete("/{record_id}")
-def delete_record(record_id: int, db: Session = Depends(get_db)):
+def delete_record(record_id: int, db: Session = Depends(get_db, scope="function")):
     ok = crud_financial.delete_record(db, record_id)
     if not ok:
         raise HTTPException(404, "Record not found")
     return {"message": "Deleted"}
 
-@router.get("/dashboard/summary")
-def dashboard_summary(db: Session = Depends(get_db)):
+@router.get("/dashboard/summary", dependencies=[Depends(conditional("financial_records", "customers"))])
+async def dashboard_summary(db: ReadSession = Depends(get_read_db, scope="function")):
+    return await dashboard_cache.aget_or_compute(lambda: run_db(db, _dashboard_summary), "financial/dashboard/summary")
+
+def _dashboard_summary(db: Session):
     # totals
     total_income = db.query(func.coalesce(func.sum(crud_financial.FinancialRecord.amount), 0)).filter(
         crud_financial.FinancialRecord.transaction_type.ilike("income")).scalar()
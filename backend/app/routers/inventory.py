@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, List, Optional
 
-from app.core.database import get_db
+from app.core.cache import inventory_cache
+from app.core.database import ReadSession, get_db, get_read_db, run_db, session_scope
+from app.core.pagination import PageParams, set_next_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.fast_read import FAST_MODE, FIELDS, parse_fields, rows_response, row_response
+from app.core.etag import conditional
 from app.models.inventory import Inventory
-from app.schemas.inventory import InventoryCreate, InventoryUpdate, InventoryBase, InventoryResponse
+from app.schemas.inventory import (
+    InventoryCreate, InventoryUpdate, InventoryBase, InventoryResponse, InventoryBulkResult,
+    InventoryAdjust, InventoryAdjustBatch, InventoryLowStock, InventoryValuation
+)
+from app.schemas.bulk import BulkDeleteRequest, BulkDeleteResult, MAX_BULK_ROWS
+from app.crud import bulk
+from app.crud import inventory as crud_inventory
 
 
 # -------------------------------------------------------------------
@@ -20,48 +31,143 @@ router = APIRouter(
 # CREATE ITEM
 # -------------------------------------------------------------------
 @router.post("/", response_model=InventoryResponse, status_code=status.HTTP_201_CREATED)
-def create_item(data: InventoryCreate, db: Session = Depends(get_db)):
-    item = Inventory(**data.dict())
-    db.add(item)
-    db.commit()
-    db.refresh(item)
-    return item
+def create_item(data: InventoryCreate, db: Session = Depends(get_db, scope="function")):
+    return crud_inventory.create_item(db, data)
+
+
+# -------------------------------------------------------------------
+# LIST ITEMS (keyset-paginated; ?all=true returns every row)
+# -------------------------------------------------------------------
+@router.get("/", response_model=List[InventoryResponse], dependencies=[Depends(conditional("inventory"))])
+async def list_items(
+    response: Response,
+    category: Optional[str] = None,
+    item_status: Optional[str] = Query(None, alias="status"),
+    supplier: Optional[str] = None,
+    fields: Optional[str] = FIELDS,
+    fast: bool = FAST_MODE,
+    page: PageParams = Depends(),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    filters = dict(category=category, item_status=item_status, supplier=supplier)
+    descending = page.descending(default=False)
+    fieldset = parse_fields(fields, InventoryResponse)
+    if fast or fieldset:
+        if page.all_rows:
+            return rows_response(await run_db(db, crud_inventory.list_rows, descending, fieldset, **filters), fields=fieldset)
+        return rows_response(*await run_db(db, crud_inventory.page_rows, page.cursor, page.limit, descending, fieldset, **filters), fields=fieldset)
+    if page.all_rows:
+        return await run_db(db, crud_inventory.list_items, descending, **filters)
+    items, next_cursor = await run_db(db, crud_inventory.page_items, page.cursor, page.limit, descending, **filters)
+    set_next_cursor(response, next_cursor)
+    return items
+
+
+# -------------------------------------------------------------------
+# BULK CREATE / UPDATE / DELETE (one transaction each)
+# -------------------------------------------------------------------
+@router.post("/bulk", response_model=InventoryBulkResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_items(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    valid, errors = bulk.validate_rows(payload, InventoryCreate)
+    items = crud_inventory.bulk_create_items(db, [values for _, values in valid])
+    return {"items": items, "errors": errors}
+
+
+@router.put("/bulk", response_model=InventoryBulkResult)
+def bulk_update_items(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    valid, errors = bulk.validate_rows(payload, InventoryUpdate, partial=True)
+    rows = bulk.split_update_rows(db, Inventory, valid, errors)
+    items = crud_inventory.bulk_update_items(db, rows)
+    return {"items": items, "errors": errors}
+
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def bulk_delete_items(payload: BulkDeleteRequest, db: Session = Depends(get_db, scope="function")):
+    deleted, missing = crud_inventory.bulk_delete_items(db, payload.ids)
+    return {"deleted": deleted, "missing": missing}
 
 
 # -------------------------------------------------------------------
-# LIST ALL ITEMS
+# ADJUST STOCK (atomic; a decrement never takes stock below zero)
 # -------------------------------------------------------------------
-@router.get("/", response_model=List[InventoryResponse])
-def list_items(db: Session = Depends(get_db)):
-    return db.query(Inventory).all()
+# Stock adjustments hold a write lock from their UPDATE until commit, so the
+# whole unit of work (including the commit) runs in one worker thread. With a
+# sync route FastAPI validates the response on a second pool thread before
+# get_db commits; under contention every pool thread can end up waiting on
+# the lock while the holder waits for a thread.
+def _adjust_batch(adjustments):
+    with session_scope() as db:
+        items, failed = crud_inventory.adjust_stock_batch(db, adjustments)
+        if failed:
+            missing = sorted(set(failed) - crud_inventory.existing_item_ids(db, failed))
+            if missing:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail={"msg": "Items not found", "item_ids": missing})
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail={"msg": "Insufficient stock", "item_ids": failed})
+        return [InventoryResponse.model_validate(item) for item in items]
+
+def _adjust(item_id: int, delta: int):
+    with session_scope() as db:
+        item = crud_inventory.adjust_stock(db, item_id, delta)
+        if not item:
+            if not crud_inventory.get_item(db, item_id):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Insufficient stock")
+        return InventoryResponse.model_validate(item)
+
+@router.post("/adjust", response_model=List[InventoryResponse])
+async def adjust_stock_batch(payload: InventoryAdjustBatch):
+    """Apply several stock adjustments all-or-nothing"""
+    return await run_in_threadpool(_adjust_batch, [(a.item_id, a.delta) for a in payload.adjustments])
+
+@router.post("/{item_id}/adjust", response_model=InventoryResponse)
+async def adjust_stock(item_id: int, payload: InventoryAdjust):
+    return await run_in_threadpool(_adjust, item_id, payload.delta)
+
+
+# -------------------------------------------------------------------
+# LOW STOCK (items at or below their restock level, biggest shortfall first)
+# -------------------------------------------------------------------
+@router.get("/low-stock", response_model=List[InventoryLowStock], dependencies=[Depends(conditional("inventory"))])
+async def low_stock_items(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    return await run_db(db, crud_inventory.low_stock_items, limit)
+
+
+# -------------------------------------------------------------------
+# VALUATION (stock value at cost / selling price and margin, cached)
+# -------------------------------------------------------------------
+@router.get("/valuation", response_model=InventoryValuation, dependencies=[Depends(conditional("inventory"))])
+async def get_valuation(db: ReadSession = Depends(get_read_db, scope="function")):
+    return await inventory_cache.aget_or_compute(
+        lambda: run_db(db, crud_inventory.get_valuation), "inventory/valuation"
+    )
 
 
 # -------------------------------------------------------------------
 # GET SINGLE ITEM
 # -------------------------------------------------------------------
 @router.get("/{item_id}", response_model=InventoryResponse)
-def get_item(item_id: int, db: Session = Depends(get_db)):
-    item = db.query(Inventory).filter(Inventory.id == item_id).first()
+async def get_item(item_id: int, fields: Optional[str] = FIELDS, db: ReadSession = Depends(get_read_db, scope="function")):
+    fieldset = parse_fields(fields, InventoryResponse)
+    if fieldset:
+        item = await run_db(db, crud_inventory.get_row, item_id, fieldset)
+    else:
+        item = await run_db(db, crud_inventory.get_item, item_id)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
-    return item
+    return row_response(item) if fieldset else item
 
 
 # -------------------------------------------------------------------
 # UPDATE ITEM
 # -------------------------------------------------------------------
 @router.put("/{item_id}", response_model=InventoryResponse)
-def update_item(item_id: int, data: InventoryUpdate, db: Session = Depends(get_db)):
-    item = db.query(Inventory).filter(Inventory.id == item_id).first()
+def update_item(item_id: int, data: InventoryUpdate, db: Session = Depends(get_db, scope="function")):
+    item = crud_inventory.update_item(db, item_id, data)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
-
-    update_data = data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(item, field, value)
-
-    db.commit()
-    db.refresh(item)
     return item
 
 
@@ -69,11 +175,7 @@ def update_item(item_id: int, data: InventoryUpdate, db: Session = Depends(get_d
 # DELETE ITEM
 # -------------------------------------------------------------------
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item(item_id: int, db: Session = Depends(get_db)):
-    item = db.query(Inventory).filter(Inventory.id == item_id).first()
-    if not item:
+def delete_item(item_id: int, db: Session = Depends(get_db, scope="function")):
+    if not crud_inventory.delete_item(db, item_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
-
-    db.delete(item)
-    db.commit()
     return None
@@ -1,35 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.marketing import MarketingTrackerCreate, MarketingTrackerResponse, MarketingTrackerUpdate
+from typing import Any, List, Optional
+from datetime import date
+from app.core.database import ReadSession, get_db, get_read_db, run_db
+from app.core.pagination import PageParams, set_next_cursor
+from app.core.fast_read import FIELDS, parse_fields, rows_response, row_response
+from app.core.etag import conditional
+from app.schemas.marketing import MarketingTrackerCreate, MarketingTrackerResponse, MarketingTrackerUpdate, MarketingTrackerBulkResult
 from app.crud import marketing as crud_marketing
+from app.crud import bulk
+from app.models.marketing import MarketingTracker
+from app.schemas.bulk import BulkDeleteRequest, BulkDeleteResult, MAX_BULK_ROWS
 
 router = APIRouter(prefix="/marketing", tags=["Marketing"])
 
-@router.get("/", response_model=list[MarketingTrackerResponse])
-def list_campaigns(db: Session = Depends(get_db)):
-    return crud_marketing.list_campaigns(db)
+@router.get("/", response_model=list[MarketingTrackerResponse], dependencies=[Depends(conditional("marketing_tracker"))])
+async def list_campaigns(
+    response: Response,
+    platform: Optional[str] = None,
+    content_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    fields: Optional[str] = FIELDS,
+    page: PageParams = Depends(),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    filters = dict(platform=platform, content_type=content_type, date_from=date_from, date_to=date_to)
+    descending = page.descending(default=True)
+    fieldset = parse_fields(fields, MarketingTrackerResponse)
+    if fieldset:
+        if page.all_rows:
+            return rows_response(await run_db(db, crud_marketing.list_rows, descending, fieldset, **filters), fields=fieldset)
+        return rows_response(*await run_db(db, crud_marketing.page_rows, page.cursor, page.limit, descending, fieldset, **filters), fields=fieldset)
+    if page.all_rows:
+        return await run_db(db, crud_marketing.list_campaigns, descending, **filters)
+    items, next_cursor = await run_db(db, crud_marketing.page_campaigns, page.cursor, page.limit, descending, **filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 @router.post("/", response_model=MarketingTrackerResponse)
-def create_campaign(payload: MarketingTrackerCreate, db: Session = Depends(get_db)):
+def create_campaign(payload: MarketingTrackerCreate, db: Session = Depends(get_db, scope="function")):
     return crud_marketing.create_campaign(db, payload)
 
+@router.post("/bulk", response_model=MarketingTrackerBulkResult)
+def bulk_create_campaigns(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Create many campaigns in one transaction; invalid rows are reported and skipped"""
+    valid, errors = bulk.validate_rows(payload, MarketingTrackerCreate)
+    items = crud_marketing.bulk_create_campaigns(db, [values for _, values in valid])
+    return {"items": items, "errors": errors}
+
+@router.put("/bulk", response_model=MarketingTrackerBulkResult)
+def bulk_update_campaigns(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Partially update many campaigns; every row must include its id"""
+    valid, errors = bulk.validate_rows(payload, MarketingTrackerUpdate, partial=True)
+    rows = bulk.split_update_rows(db, MarketingTracker, valid, errors)
+    items = crud_marketing.bulk_update_campaigns(db, rows)
+    return {"items": items, "errors": errors}
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def bulk_delete_campaigns(payload: BulkDeleteRequest, db: Session = Depends(get_db, scope="function")):
+    deleted, missing = crud_marketing.bulk_delete_campaigns(db, payload.ids)
+    return {"deleted": deleted, "missing": missing}
+
 @router.get("/{campaign_id}", response_model=MarketingTrackerResponse)
-def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
-    c = crud_marketing.get_campaign(db, campaign_id)
+async def get_campaign(campaign_id: int, fields: Optional[str] = FIELDS, db: ReadSession = Depends(get_read_db, scope="function")):
+    fieldset = parse_fields(fields, MarketingTrackerResponse)
+    if fieldset:
+        c = await run_db(db, crud_marketing.get_row, campaign_id, fieldset)
+    else:
+        c = await run_db(db, crud_marketing.get_campaign, campaign_id)
     if not c:
         raise HTTPException(404, "Campaign not found")
-    return c
+    return row_response(c) if fieldset else c
 
 @router.put("/{campaign_id}", response_model=MarketingTrackerResponse)
-def update_campaign(campaign_id: int, payload: MarketingTrackerUpdate, db: Session = Depends(get_db)):
+def update_campaign(campaign_id: int, payload: MarketingTrackerUpdate, db: Session = Depends(get_db, scope="function")):
     updated = crud_marketing.update_campaign(db, campaign_id, payload)
     if not updated:
         raise HTTPException(404, "Campaign not found")
     return updated
 
 @router.delete("/{campaign_id}")
-def delete_campaign(campaign_id: int, db: Session = Depends(get_db)):
+def delete_campaign(campaign_id: int, db: Session = Depends(get_db, scope="function")):
     ok = crud_marketing.delete_campaign(db, campaign_id)
     if not ok:
         raise HTTPException(404, "Campaign not found")
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.database import get_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, set_next_cursor
+from app.schemas.search import SearchResult
+from app.crud import search as crud_search
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+# Largest OFFSET the databases accept (a signed 64-bit integer)
+MAX_OFFSET = 2 ** 63 - 1
+
+@router.get("/", response_model=List[SearchResult])
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find; each must appear (partial words match)"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} response header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db, scope="function")
+):
+    """Ranked search over customers, suppliers, inventory items and deliveries"""
+    if not crud_search.search_terms(q):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search terms need at least {crud_search.MIN_TERM_LENGTH} characters"
+        )
+    # Results are ranked, not keyed, so the cursor carries the offset of the next page
+    offset = decode_cursor(cursor, 1)[0] if cursor else 0
+    if not 0 <= offset <= MAX_OFFSET:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    results = crud_search.search(db, q, limit + 1, offset)
+    if len(results) > limit:
+        results = results[:limit]
+        set_next_cursor(response, encode_cursor([offset + limit]))
+    return results
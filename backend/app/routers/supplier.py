@@ -1,35 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.supplier import SupplierCreate, SupplierResponse, SupplierUpdate
+from typing import Any, List, Optional
+from app.core.database import ReadSession, get_db, get_read_db, run_db
+from app.core.pagination import PageParams, set_next_cursor
+from app.core.fast_read import FIELDS, parse_fields, rows_response, row_response
+from app.core.etag import conditional
+from app.schemas.supplier import SupplierCreate, SupplierResponse, SupplierUpdate, SupplierBulkResult
 from app.crud import supplier as crud_supplier
+from app.crud import bulk
+from app.models.supplier import Supplier
+from app.schemas.bulk import BulkDeleteRequest, BulkDeleteResult, MAX_BULK_ROWS
 
 router = APIRouter(prefix="/suppliers", tags=["Suppliers"])
 
-@router.get("/", response_model=list[SupplierResponse])
-def list_suppliers(db: Session = Depends(get_db)):
-    return crud_supplier.list_suppliers(db)
+@router.get("/", response_model=list[SupplierResponse], dependencies=[Depends(conditional("suppliers"))])
+async def list_suppliers(
+    response: Response,
+    product_supplied: Optional[str] = None,
+    fields: Optional[str] = FIELDS,
+    page: PageParams = Depends(),
+    db: ReadSession = Depends(get_read_db, scope="function")
+):
+    filters = dict(product_supplied=product_supplied)
+    descending = page.descending(default=False)
+    fieldset = parse_fields(fields, SupplierResponse)
+    if fieldset:
+        if page.all_rows:
+            return rows_response(await run_db(db, crud_supplier.list_rows, descending, fieldset, **filters), fields=fieldset)
+        return rows_response(*await run_db(db, crud_supplier.page_rows, page.cursor, page.limit, descending, fieldset, **filters), fields=fieldset)
+    if page.all_rows:
+        return await run_db(db, crud_supplier.list_suppliers, descending, **filters)
+    items, next_cursor = await run_db(db, crud_supplier.page_suppliers, page.cursor, page.limit, descending, **filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 @router.post("/", response_model=SupplierResponse)
-def create_supplier(payload: SupplierCreate, db: Session = Depends(get_db)):
+def create_supplier(payload: SupplierCreate, db: Session = Depends(get_db, scope="function")):
     return crud_supplier.create_supplier(db, payload)
 
+@router.post("/bulk", response_model=SupplierBulkResult)
+def bulk_create_suppliers(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Create many suppliers in one transaction; invalid rows are reported and skipped"""
+    valid, errors = bulk.validate_rows(payload, SupplierCreate)
+    items = crud_supplier.bulk_create_suppliers(db, [values for _, values in valid])
+    return {"items": items, "errors": errors}
+
+@router.put("/bulk", response_model=SupplierBulkResult)
+def bulk_update_suppliers(payload: List[Any] = Body(..., max_length=MAX_BULK_ROWS), db: Session = Depends(get_db, scope="function")):
+    """Partially update many suppliers; every row must include its id"""
+    valid, errors = bulk.validate_rows(payload, SupplierUpdate, partial=True)
+    rows = bulk.split_update_rows(db, Supplier, valid, errors)
+    items = crud_supplier.bulk_update_suppliers(db, rows)
+    return {"items": items, "errors": errors}
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def bulk_delete_suppliers(payload: BulkDeleteRequest, db: Session = Depends(get_db, scope="function")):
+    deleted, missing = crud_supplier.bulk_delete_suppliers(db, payload.ids)
+    return {"deleted": deleted, "missing": missing}
+
 @router.get("/{supplier_id}", response_model=SupplierResponse)
-def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
-    s = crud_supplier.get_supplier(db, supplier_id)
+async def get_supplier(supplier_id: int, fields: Optional[str] = FIELDS, db: ReadSession = Depends(get_read_db, scope="function")):
+    fieldset = parse_fields(fields, SupplierResponse)
+    if fieldset:
+        s = await run_db(db, crud_supplier.get_row, supplier_id, fieldset)
+    else:
+        s = await run_db(db, crud_supplier.get_supplier, supplier_id)
     if not s:
         raise HTTPException(404, "Supplier not found")
-    return s
+    return row_response(s) if fieldset else s
 
 @router.put("/{supplier_id}", response_model=SupplierResponse)
-def update_supplier(supplier_id: int, payload: SupplierUpdate, db: Session = Depends(get_db)):
+def update_supplier(supplier_id: int, payload: SupplierUpdate, db: Session = Depends(get_db, scope="function")):
     updated = crud_supplier.update_supplier(db, supplier_id, payload)
     if not updated:
         raise HTTPException(404, "Supplier not found")
     return updated
 
 @router.delete("/{supplier_id}")
-def delete_supplier(supplier_id: int, db: Session = Depends(get_db)):
+def delete_supplier(supplier_id: int, db: Session = Depends(get_db, scope="function")):
     ok = crud_supplier.delete_supplier(db, supplier_id)
     if not ok:
         raise HTTPException(404, "Supplier not found")
@@ -7,14 +7,14 @@ from app.crud import user as crud_user
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(payload: UserCreate, db: Session = Depends(get_db)):
+def create_user(payload: UserCreate, db: Session = Depends(get_db, scope="function")):
     existing = crud_user.get_by_username(db, payload.username)
     if existing:
         raise HTTPException(400, "Username already exists")
     return crud_user.create(db, payload)
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, db: Session = Depends(get_db, scope="function")):
     u = db.query(crud_user.User).filter_by(id=user_id).first() if False else crud_user.create  # placeholder
     # To keep simple: read directly
     user = db.query.__self__ if False else None
@@ -26,14 +26,14 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
     return user
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)):
+def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db, scope="function")):
     updated = crud_user.update(db, user_id, payload)
     if not updated:
         raise HTTPException(404, "User not found")
     return updated
 
 @router.delete("/{user_id}")
-def delete_user(user_id: int, db: Session = Depends(get_db)):
+def delete_user(user_id: int, db: Session = Depends(get_db, scope="function")):
     ok = crud_user.delete(db, user_id)
     if not ok:
         raise HTTPException(404, "User not found")
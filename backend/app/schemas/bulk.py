@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import Any, List
+
+# Upper bound on rows accepted by a single bulk request
+MAX_BULK_ROWS = 1000
+
+class BulkRowError(BaseModel):
+    index: int  # Position of the row in the request array
+    errors: List[Any]
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., max_length=MAX_BULK_ROWS)
+
+class BulkDeleteResult(BaseModel):
+    deleted: int
+    missing: List[int] = []
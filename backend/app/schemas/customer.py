@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 from datetime import date
+from app.schemas.bulk import BulkRowError, MAX_BULK_ROWS
 
 class CustomerBase(BaseModel):
     customer_name: str
@@ -41,7 +42,39 @@ class CustomerUpdate(BaseModel):
 
 class CustomerResponse(CustomerBase):
     id: int
+    primary_record_id: Optional[int] = None  # The sale record kept in sync with this customer
 
     class Config:
         from_attributes = True
 
+class CustomerBulkResult(BaseModel):
+    items: List[CustomerResponse]
+    errors: List[BulkRowError] = []
+
+class DuplicateCustomer(BaseModel):
+    id: int
+    customer_name: str
+    phone_number: str
+
+class DuplicateGroup(BaseModel):
+    phone_key: str  # Normalized phone number shared by the group
+    primary_id: int  # Suggested merge target (the oldest row)
+    customers: List[DuplicateCustomer]
+
+class CustomerMergeRequest(BaseModel):
+    target_id: int
+    source_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ROWS)
+
+class CustomerMergeResult(BaseModel):
+    customer: CustomerResponse
+    merged: List[int]
+    records_moved: int
+    missing: List[int] = []
+
+class CustomerSummary(BaseModel):
+    customer_id: int
+    order_count: int  # Income records linked to the customer
+    lifetime_revenue: float
+    average_order_value: float
+    first_purchase: Optional[date] = None
+    last_purchase: Optional[date] = None
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+from datetime import date as date_type
+from app.schemas.bulk import BulkRowError
 
 class DeliveryLogBase(BaseModel):
     date: str
@@ -26,6 +28,11 @@ class DeliveryLogUpdate(BaseModel):
 
 class DeliveryLogResponse(DeliveryLogBase):
     id: int
+    date: date_type  # Stored as a Date; serialized as YYYY-MM-DD
 
     class Config:
         from_attributes = True
+
+class DeliveryLogBulkResult(BaseModel):
+    items: List[DeliveryLogResponse]
+    errors: List[BulkRowError] = []
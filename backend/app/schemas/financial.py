@@ -1,9 +1,10 @@
 from pydantic import BaseModel
-from typing import Optional
-from datetime import date
+from typing import Optional, List
+from datetime import date as date_type
+from app.schemas.bulk import BulkRowError
 
 class FinancialRecordBase(BaseModel):
-    date: date
+    date: date_type
     transaction_type: str  # Income or Expense
     description: Optional[str] = None
     category: Optional[str] = None
@@ -17,7 +18,8 @@ class FinancialRecordCreate(FinancialRecordBase):
     pass
 
 class FinancialRecordUpdate(BaseModel):
-    date: Optional[date] = None
+    # date_type, not date: pydantic would resolve `date` to this field's default (None)
+    date: Optional[date_type] = None
     transaction_type: Optional[str] = None
     description: Optional[str] = None
     category: Optional[str] = None
@@ -33,3 +35,7 @@ class FinancialRecordResponse(FinancialRecordBase):
 
     class Config:
         from_attributes = True
+
+class FinancialRecordBulkResult(BaseModel):
+    items: List[FinancialRecordResponse]
+    errors: List[BulkRowError] = []
@@ -1,6 +1,8 @@
 from datetime import date
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from decimal import Decimal
+from typing import Annotated, Optional, List
+from pydantic import BaseModel, Field, PlainSerializer
+from app.schemas.bulk import BulkRowError, MAX_BULK_ROWS
 
 class InventoryBase(BaseModel):
     item_name: str = Field(..., max_length=100)
@@ -35,3 +37,44 @@ class InventoryResponse(InventoryBase):
     class Config:
         from_attributes = True
 
+class InventoryLowStock(InventoryResponse):
+    # Units needed to get back up to the restock level
+    shortfall: int
+
+class InventoryBulkResult(BaseModel):
+    items: List[InventoryResponse]
+    errors: List[BulkRowError] = []
+
+class InventoryAdjust(BaseModel):
+    # Negative takes stock out (refused if it would go below zero), positive restocks
+    delta: int
+
+class InventoryAdjustItem(InventoryAdjust):
+    item_id: int
+
+class InventoryAdjustBatch(BaseModel):
+    adjustments: List[InventoryAdjustItem] = Field(..., min_length=1, max_length=MAX_BULK_ROWS)
+
+# Exact in Python and in JSON: a decimal string with two places ("1035.80"),
+# since a JSON number would be read back as a float
+Money = Annotated[Decimal, PlainSerializer(lambda value: f"{value:.2f}", return_type=str, when_used="json")]
+
+class InventoryValuationRow(BaseModel):
+    items: int
+    units: int
+    cost_value: Money
+    retail_value: Money
+    margin: Money
+    # Margin as a percentage of retail value; None when nothing is priced
+    margin_pct: Optional[Money] = None
+
+class InventoryCategoryValuation(InventoryValuationRow):
+    category: Optional[str] = None
+
+class InventorySupplierValuation(InventoryValuationRow):
+    supplier: Optional[str] = None
+
+class InventoryValuation(BaseModel):
+    totals: InventoryValuationRow
+    by_category: List[InventoryCategoryValuation]
+    by_supplier: List[InventorySupplierValuation]
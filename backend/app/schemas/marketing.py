@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import date
+from app.schemas.bulk import BulkRowError
 
 class MarketingTrackerBase(BaseModel):
     platform: str
@@ -28,3 +29,7 @@ class MarketingTrackerResponse(MarketingTrackerBase):
 
     class Config:
         from_attributes = True
+
+class MarketingTrackerBulkResult(BaseModel):
+    items: List[MarketingTrackerResponse]
+    errors: List[BulkRowError] = []
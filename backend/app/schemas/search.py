@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+class SearchResult(BaseModel):
+    type: Literal["customer", "supplier", "inventory", "delivery"]
+    id: int
+    name: str
+    details: Optional[str] = None  # Other matched fields (phone, address, location...)
+    score: float  # Higher is a better match; only comparable within one response
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import date
+from app.schemas.bulk import BulkRowError
 
 class SupplierBase(BaseModel):
     supplier_name: str
@@ -30,3 +31,7 @@ class SupplierResponse(SupplierBase):
 
     class Config:
         from_attributes = True
+
+class SupplierBulkResult(BaseModel):
+    items: List[SupplierResponse]
+    errors: List[BulkRowError] = []
@@ -0,0 +1,104 @@
+"""
+Benchmark /dashboard/stats: separate queries vs. the single-statement engine.
+
+Seeds a scratch SQLite database (unless DATABASE_URL is already set), then
+reports round trips per call and p50/p99 latency for both code paths.
+--latency-ms adds a fixed delay per statement to simulate a remote database.
+
+    python benchmark_dashboard_stats.py --records 20000 --latency-ms 5
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--records", type=int, default=20000)
+parser.add_argument("--customers", type=int, default=5000)
+parser.add_argument("--iterations", type=int, default=200)
+parser.add_argument("--latency-ms", type=float, default=0.0)
+args = parser.parse_args()
+
+if "DATABASE_URL" not in os.environ:
+    scratch = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch}"
+
+from sqlalchemy import event
+from app.core.database import engine, SessionLocal, Base
+from app.models.customer import Customer
+from app.models.financial import FinancialRecord
+from app.crud import dashboard as crud_dashboard
+from app.crud import ledger as crud_ledger
+
+def seed(db):
+    if db.query(FinancialRecord.id).first() is not None:
+        return
+    today = date.today()
+    db.bulk_insert_mappings(Customer, [
+        {
+            "customer_name": f"Customer {i}",
+            "phone_number": f"080{i:08d}",
+            "customer_type": random.choice(["New", "Repeat", "Returning"])
+        }
+        for i in range(args.customers)
+    ])
+    db.bulk_insert_mappings(FinancialRecord, [
+        {
+            "date": today - timedelta(days=random.randint(0, 730)),
+            "transaction_type": random.choice(["Income", "Expense"]),
+            "category": random.choice(["Sales", "Fuel", "Seeds", "Salaries"]),
+            "amount": random.randint(500, 100000)
+        }
+        for _ in range(args.records)
+    ])
+    crud_ledger.rebuild(db)
+    db.commit()
+
+round_trips = 0
+
+@event.listens_for(engine, "before_cursor_execute")
+def count_round_trip(conn, cursor, statement, parameters, context, executemany):
+    global round_trips
+    round_trips += 1
+    if args.latency_ms:
+        time.sleep(args.latency_ms / 1000.0)
+
+def separate_queries(db):
+    return {
+        **crud_dashboard.get_financial_summary(db),
+        **crud_dashboard.get_customer_stats(db),
+        **crud_dashboard.get_monthly_comparison(db)
+    }
+
+def run(label, fn, db):
+    global round_trips
+    fn(db)  # warm up
+    timings = []
+    round_trips = 0
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        result = fn(db)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{label:<22} round trips/call: {round_trips / args.iterations:.0f}  "
+          f"p50: {p50:.2f} ms  p99: {p99:.2f} ms")
+    return result
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed(db)
+        before = run("before (6 queries)", separate_queries, db)
+        after = run("after (1 statement)", crud_dashboard.get_dashboard_stats, db)
+        assert before.keys() == after.keys()
+        for key in before:
+            assert abs(before[key] - after[key]) < 1e-6, key
+        print("Results match.")
+    finally:
+        db.close()
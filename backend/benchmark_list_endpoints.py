@@ -0,0 +1,110 @@
+"""
+Benchmark the large list endpoints: ORM + response model vs. ?fast=true.
+
+Seeds a scratch SQLite database (unless DATABASE_URL is already set) up to
+each size in turn, then fetches /customers/, /financial/ and /inventory/ with
+?all=true both ways through the full app. Reports p50 latency, the peak
+memory allocated while building one response (tracemalloc) and the response
+size. The fast mode uses orjson when it is installed.
+
+    python benchmark_list_endpoints.py --sizes 10000,100000,1000000 --iterations 3
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated row counts per table")
+parser.add_argument("--iterations", type=int, default=3, help="timed requests per endpoint and mode")
+parser.add_argument("--endpoints", default="/customers/,/financial/,/inventory/")
+args = parser.parse_args()
+
+if "DATABASE_URL" not in os.environ:
+    scratch = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch}"
+
+from sqlalchemy import func, insert
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import fast_read
+from app.core.database import SessionLocal
+from app.models.customer import Customer
+from app.models.financial import FinancialRecord
+from app.models.inventory import Inventory
+
+client = TestClient(app)
+CHUNK = 10000
+
+def rows_for(model, start, stop):
+    today = date.today()
+    pick_date = lambda: today - timedelta(days=random.randint(0, 1095))
+    if model is Customer:
+        return [
+            {
+                "customer_name": f"Customer {i}", "phone_number": f"080{i:08d}", "phone_key": f"080{i:08d}",
+                "address": f"{i} Garden Road", "total_amount": random.randint(500, 100000),
+                "purchase_date": pick_date(), "payment_status": random.choice(["Pending", "Paid"]),
+                "notes": "Prefers morning delivery" if i % 3 else None, "customer_type": "New"
+            }
+            for i in range(start, stop)
+        ]
+    if model is FinancialRecord:
+        return [
+            {
+                "date": pick_date(), "transaction_type": random.choice(["Income", "Expense"]),
+                "category": random.choice(["Sales", "Fuel", "Seeds"]), "amount": random.randint(500, 100000),
+                "status": "Paid", "customer_id": random.randint(1, stop) if i % 3 == 0 else None
+            }
+            for i in range(start, stop)
+        ]
+    return [
+        {
+            "item_name": f"Item {i}", "category": random.choice(["Seeds", "Tools", "Soil"]),
+            "quantity_in_stock": random.randint(0, 50), "cost_price": "100.00", "selling_price": "150.50",
+            "restock_level": 5, "status": "In Stock", "date_added": pick_date()
+        }
+        for i in range(start, stop)
+    ]
+
+def seed_to(size):
+    with SessionLocal() as db:
+        for model in (Customer, FinancialRecord, Inventory):
+            have = db.query(func.count(model.id)).scalar()
+            for start in range(have, size, CHUNK):
+                db.execute(insert(model), rows_for(model, start, min(start + CHUNK, size)))
+            db.commit()
+
+def measure(path, fast):
+    params = {"all": "true", "fast": "true"} if fast else {"all": "true"}
+    client.get(path, params=params)  # warm up
+    timings = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        response = client.get(path, params=params)
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    client.get(path, params=params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak, len(response.content)
+
+if __name__ == "__main__":
+    encoder = "orjson" if fast_read.orjson is not None else "json (orjson not installed)"
+    print(f"fast mode encoder: {encoder}")
+    for size in sorted(int(s) for s in args.sizes.split(",")):
+        print(f"\nSeeding {size} rows per table...")
+        seed_to(size)
+        print(f"{'endpoint':<14} {'mode':<7} {'p50 ms':>10} {'peak MiB':>10} {'MiB sent':>10}")
+        for path in args.endpoints.split(","):
+            results = {}
+            for mode, fast in (("orm", False), ("fast", True)):
+                p50, peak, size_bytes = results[mode] = measure(path, fast)
+                print(f"{path:<14} {mode:<7} {p50:>10.1f} {peak / 2**20:>10.1f} {size_bytes / 2**20:>10.1f}")
+            speedup = results["orm"][0] / results["fast"][0]
+            memory = results["orm"][1] / max(results["fast"][1], 1)
+            print(f"{'':<14} {'':<7} {speedup:>9.1f}x {memory:>9.1f}x")
@@ -0,0 +1,76 @@
+"""
+Benchmark cold start: time to import app.main and latency of the first requests.
+
+Each run is a fresh Python process, like a new worker. "fresh db" starts from
+an empty database (all migrations run); "current schema" starts from a
+stamped database, where startup is one version query.
+--latency-ms adds a fixed delay per statement to simulate a remote database.
+
+    python benchmark_startup.py --runs 5 --latency-ms 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--runs", type=int, default=5)
+parser.add_argument("--latency-ms", type=float, default=0.0)
+parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+FIRST_REQUESTS = ["/", "/dashboard/stats", "/customers/?limit=10"]
+
+def child():
+    start = time.perf_counter()
+    from sqlalchemy import event
+    from app.core.database import engine
+    statements = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+        if args.latency_ms:
+            time.sleep(args.latency_ms / 1000.0)
+
+    from app.main import app
+    import_ms = (time.perf_counter() - start) * 1000
+    import_statements = statements
+
+    from fastapi.testclient import TestClient
+    client = TestClient(app)
+    first = {}
+    for path in FIRST_REQUESTS:
+        t = time.perf_counter()
+        assert client.get(path).status_code == 200, path
+        first[path] = (time.perf_counter() - t) * 1000
+    print(json.dumps({"import_ms": import_ms, "import_statements": import_statements, "first": first}))
+
+def run(database_url):
+    env = dict(os.environ, DATABASE_URL=database_url)
+    command = [sys.executable, __file__, "--child", "--latency-ms", str(args.latency_ms)]
+    output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def report(label, results):
+    median = lambda key: statistics.median(r[key] for r in results)
+    print(f"{label:<16} import: {median('import_ms'):8.1f} ms  statements at import: {results[0]['import_statements']:3d}")
+    for path in FIRST_REQUESTS:
+        print(f"{'':<16} first GET {path:<22} {statistics.median(r['first'][path] for r in results):8.1f} ms")
+
+if __name__ == "__main__":
+    if args.child:
+        child()
+        sys.exit(0)
+    workdir = tempfile.mkdtemp()
+    fresh = [run(f"sqlite:///{os.path.join(workdir, f'fresh{i}.db')}") for i in range(args.runs)]
+    current_url = f"sqlite:///{os.path.join(workdir, 'current.db')}"
+    run(current_url)  # migrate once
+    current = [run(current_url) for _ in range(args.runs)]
+    report("fresh db", fresh)
+    report("current schema", current)
@@ -0,0 +1,247 @@
+"""
+Check that the read functions in app/crud/* use indexes on a large dataset.
+
+Seeds a scratch SQLite database (or the database in DATABASE_URL when
+--use-existing is given), runs each read path while capturing its SQL, then
+runs EXPLAIN QUERY PLAN (SQLite) / EXPLAIN with enable_seqscan off (Postgres)
+for every statement. Exits with status 1 if any statement scans one of the
+large tables, including full scans of an index (SQLite's "SCAN t USING
+[COVERING] INDEX"), unless the path and table are listed in ALLOWED_SCANS.
+
+    python check_query_plans.py --records 50000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+from datetime import date, timedelta
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--records", type=int, default=50000, help="financial records to seed")
+parser.add_argument("--use-existing", action="store_true", help="check DATABASE_URL as-is, without seeding")
+parser.add_argument("--verbose", action="store_true", help="print every plan")
+args = parser.parse_args()
+
+if not args.use_existing:
+    scratch = os.path.join(tempfile.mkdtemp(), "plans.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch}"
+
+from sqlalchemy import event
+from app.core.database import engine, SessionLocal, Base
+import app  # registers every model
+from app.models.customer import Customer
+from app.models.financial import FinancialRecord
+from app.models.delivery import DeliveryLog
+from app.models.marketing import MarketingTracker
+from app.models.supplier import Supplier
+from app.models.inventory import Inventory
+from app.core.pagination import encode_cursor
+from app.crud import customer, financial, dashboard, delivery, marketing, supplier, user, ledger, inventory, customer_summary
+
+LARGE_TABLES = {
+    "customers", "financial_records", "delivery_logs",
+    "marketing_tracker", "suppliers", "inventory", "customer_summaries",
+}
+
+# (read path, table) -> why scanning that table is the intended plan
+ALLOWED_SCANS = {
+    ("customer.list_customers", "customers"): "?all=true returns every customer",
+    ("financial.list_records", "financial_records"): "?all=true returns every record",
+    ("delivery.list_deliveries", "delivery_logs"): "?all=true returns every delivery",
+    ("marketing.list_campaigns", "marketing_tracker"): "?all=true returns every campaign",
+    ("supplier.list_suppliers", "suppliers"): "?all=true returns every supplier",
+    ("inventory.list_items", "inventory"): "?all=true returns every item",
+    # First pages walk the sort index in order and stop at LIMIT
+    ("customer.page_customers", "customers"): "primary key walk stopped by LIMIT",
+    ("supplier.page_suppliers", "suppliers"): "primary key walk stopped by LIMIT",
+    ("financial.page_records", "financial_records"): "(date, id) index walk stopped by LIMIT",
+    ("delivery.page_deliveries", "delivery_logs"): "(date, id) index walk stopped by LIMIT",
+    ("marketing.page_campaigns", "marketing_tracker"): "(post_date, id) index walk stopped by LIMIT",
+    ("inventory.low_stock_items", "inventory"): "partial index holding only low-stock items, stopped by LIMIT",
+    # The customer count reads every customer; there is no counter to read instead
+    ("dashboard.get_customer_stats", "customers"): "COUNT over the smallest covering index",
+    ("dashboard.get_dashboard_stats", "customers"): "COUNT over the smallest covering index",
+    ("dashboard.get_customer_stats", "customer_summaries"): "partial index holding only repeat customers",
+    ("dashboard.get_dashboard_stats", "customer_summaries"): "partial index holding only repeat customers",
+}
+
+def seed(db, n):
+    today = date.today()
+    customers = max(n // 4, 1)
+    small = max(n // 10, 1)
+    pick_date = lambda: today - timedelta(days=random.randint(0, 1095))
+    db.bulk_insert_mappings(Customer, [
+        {
+            "customer_name": f"Customer {i}",
+            "phone_number": f"080{i:08d}",
+            "purchase_date": pick_date(),
+            "payment_status": random.choice(["Pending", "Paid", "Partial"]),
+            "delivery_status": random.choice(["Pending", "Delivered"]),
+            "customer_type": random.choice(["New"] * 8 + ["Repeat", "Returning"])
+        }
+        for i in range(customers)
+    ])
+    db.bulk_insert_mappings(FinancialRecord, [
+        {
+            "date": pick_date(),
+            "transaction_type": random.choice(["Income", "Expense"]),
+            "category": random.choice(["Sales", "Fuel", "Seeds", "Salaries", "Rent", None]),
+            "amount": random.randint(500, 100000),
+            "status": random.choice(["Pending", "Paid"]),
+            "customer_id": random.randint(1, customers) if random.random() < 0.3 else None
+        }
+        for _ in range(n)
+    ])
+    db.bulk_insert_mappings(DeliveryLog, [
+        {"date": pick_date(), "customer_name": f"Customer {i}", "delivery_person": random.choice(["Ada", "Bola", "Chidi"])}
+        for i in range(small)
+    ])
+    db.bulk_insert_mappings(MarketingTracker, [
+        {"platform": random.choice(["Instagram", "Facebook", "TikTok"]), "post_date": pick_date() if i % 7 else None}
+        for i in range(small)
+    ])
+    db.bulk_insert_mappings(Supplier, [
+        {"supplier_name": f"Supplier {i}", "product_supplied": random.choice(["Seeds", "Tools", "Soil"])}
+        for i in range(small)
+    ])
+    db.bulk_insert_mappings(Inventory, [
+        {
+            "item_name": f"Item {i}", "category": random.choice(["Seeds", "Tools", "Soil"]),
+            "quantity_in_stock": random.randint(0, 50), "cost_price": 100, "selling_price": 150,
+            "restock_level": 5, "status": "In Stock", "date_added": pick_date()
+        }
+        for i in range(small)
+    ])
+    ledger.rebuild(db)
+    customer_summary.rebuild(db)
+    db.commit()
+
+def read_paths(db):
+    """(name, callable) for every read function worth checking."""
+    today = date.today()
+    month_ago = today - timedelta(days=30)
+    record = db.query(FinancialRecord).filter(FinancialRecord.customer_id.isnot(None)).first()
+    _, records_cursor = financial.page_records(db, limit=5)
+    _, deliveries_cursor = delivery.page_deliveries(db, limit=5)
+    _, campaigns_cursor = marketing.page_campaigns(db, limit=5)
+    _, customers_cursor = customer.page_customers(db, limit=5)
+    undated_cursor = encode_cursor([None, 0])
+    return [
+        ("customer.get_customer", lambda: customer.get_customer(db, 1)),
+        ("customer.list_customers", lambda: customer.list_customers(db)),
+        ("customer.list_customers(payment_status)", lambda: customer.list_customers(db, payment_status="Paid")),
+        ("customer.list_customers(date range)", lambda: customer.list_customers(db, date_from=month_ago, date_to=today)),
+        ("customer.page_customers", lambda: customer.page_customers(db)),
+        ("customer.page_customers(cursor)", lambda: customer.page_customers(db, cursor=customers_cursor)),
+        ("customer.page_customers(payment_status)", lambda: customer.page_customers(db, payment_status="Paid")),
+        ("customer.page_customers(customer_type)", lambda: customer.page_customers(db, customer_type="Repeat")),
+        ("customer.find_repeat_customer", lambda: customer.find_repeat_customer(db, "Customer 1", "08000000001")),
+        ("customer_summary.get_summary", lambda: customer_summary.get_summary(db, record.customer_id)),
+        ("financial.get_record", lambda: financial.get_record(db, record.id)),
+        ("financial.list_records", lambda: financial.list_records(db)),
+        ("financial.list_records(category)", lambda: financial.list_records(db, category="Fuel")),
+        ("financial.list_records(date range)", lambda: financial.list_records(db, date_from=month_ago, date_to=today)),
+        ("financial.page_records", lambda: financial.page_records(db)),
+        ("financial.page_records(cursor)", lambda: financial.page_records(db, cursor=records_cursor)),
+        ("financial.page_records(transaction_type)", lambda: financial.page_records(db, transaction_type="Expense")),
+        ("financial.page_records(category)", lambda: financial.page_records(db, category="Fuel")),
+        ("financial.page_records(customer_id)", lambda: financial.page_records(db, customer_id=record.customer_id)),
+        ("financial.page_records(date range)", lambda: financial.page_records(db, date_from=month_ago, date_to=today)),
+        ("dashboard.get_financial_summary", lambda: dashboard.get_financial_summary(db)),
+        ("dashboard.get_customer_stats", lambda: dashboard.get_customer_stats(db)),
+        ("dashboard.get_sales_trend", lambda: dashboard.get_sales_trend(db, 30)),
+        ("dashboard.get_sales_trend(month)", lambda: dashboard.get_sales_trend(db, 1095, "month")),
+        ("dashboard.get_expense_breakdown", lambda: dashboard.get_expense_breakdown(db)),
+        ("dashboard.get_monthly_comparison", lambda: dashboard.get_monthly_comparison(db)),
+        ("dashboard.get_dashboard_stats", lambda: dashboard.get_dashboard_stats(db)),
+        ("delivery.get_delivery", lambda: delivery.get_delivery(db, 1)),
+        ("delivery.list_deliveries", lambda: delivery.list_deliveries(db)),
+        ("delivery.list_deliveries(date range)", lambda: delivery.list_deliveries(db, date_from=month_ago, date_to=today)),
+        ("delivery.page_deliveries", lambda: delivery.page_deliveries(db)),
+        ("delivery.page_deliveries(cursor)", lambda: delivery.page_deliveries(db, cursor=deliveries_cursor)),
+        ("delivery.page_deliveries(date range)", lambda: delivery.page_deliveries(db, date_from=month_ago, date_to=today)),
+        ("marketing.get_campaign", lambda: marketing.get_campaign(db, 1)),
+        ("marketing.list_campaigns", lambda: marketing.list_campaigns(db)),
+        ("marketing.page_campaigns", lambda: marketing.page_campaigns(db)),
+        ("marketing.page_campaigns(cursor)", lambda: marketing.page_campaigns(db, cursor=campaigns_cursor)),
+        ("marketing.page_campaigns(undated cursor)", lambda: marketing.page_campaigns(db, cursor=undated_cursor)),
+        ("supplier.get_supplier", lambda: supplier.get_supplier(db, 1)),
+        ("supplier.list_suppliers", lambda: supplier.list_suppliers(db)),
+        ("supplier.page_suppliers", lambda: supplier.page_suppliers(db)),
+        ("inventory.list_items", lambda: inventory.list_items(db)),
+        ("inventory.list_items(category)", lambda: inventory.list_items(db, category="Seeds")),
+        ("inventory.low_stock_items", lambda: inventory.low_stock_items(db)),
+        ("user.get_by_username", lambda: user.get_by_username(db, "admin")),
+    ]
+
+def capture(fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+def scans(conn, statement, parameters):
+    """Return (plan lines, large tables scanned rather than searched)."""
+    if engine.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        lines = [row[3] for row in rows]
+        pattern = r"SCAN (\w+)"
+    else:
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).fetchall()
+        lines = [row[0] for row in rows]
+        pattern = r"Seq Scan on (\w+)"
+    scanned = [
+        match.group(1)
+        for line in lines
+        for match in [re.search(pattern, line)]
+        if match and match.group(1) in LARGE_TABLES
+    ]
+    return lines, scanned
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    failures = 0
+    try:
+        if not args.use_existing:
+            print(f"Seeding {args.records} financial records...")
+            seed(db, args.records)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+        for name, fn in read_paths(db):
+            failed = False
+            allowed = set()
+            with engine.begin() as conn:
+                for statement, parameters in capture(fn):
+                    lines, scanned = scans(conn, statement, parameters)
+                    allowed.update(t for t in scanned if (name, t) in ALLOWED_SCANS)
+                    bad = [t for t in scanned if (name, t) not in ALLOWED_SCANS]
+                    if bad:
+                        failed = True
+                        failures += 1
+                        print(f"FAIL {name}: scan of {', '.join(sorted(set(bad)))}")
+                    if bad or args.verbose:
+                        for line in lines:
+                            print(f"       {line}")
+            if not failed:
+                notes = "; ".join(f"scans {t}: {ALLOWED_SCANS[name, t]}" for t in sorted(allowed))
+                print(f"ok   {name}" + (f" ({notes})" if notes else ""))
+    finally:
+        db.close()
+
+    if failures:
+        print(f"\n{failures} statement(s) scan a large table.")
+        sys.exit(1)
+    print("\nAll read paths use indexes.")
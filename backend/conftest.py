@@ -0,0 +1,72 @@
+"""
+Shared setup for the in-process test modules.
+
+The app is imported once, against a scratch SQLite database. Before each test
+module runs, that database is reset to the freshly migrated schema and the
+result caches are cleared, so every module starts from an empty CRM no matter
+which modules ran before it:
+
+    pytest                      (or: pytest test_search.py)
+"""
+import os
+import shutil
+import tempfile
+
+_scratch = tempfile.mkdtemp()
+DATABASE_PATH = os.path.join(_scratch, "crm.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import cache
+from app.core.database import engine
+
+# app.main created the schema on import; keep the empty database as the template
+engine.dispose()
+_TEMPLATE_PATH = os.path.join(_scratch, "template.db")
+shutil.copyfile(DATABASE_PATH, _TEMPLATE_PATH)
+
+
+def reset_database():
+    engine.dispose()
+    for suffix in ("-journal", "-wal", "-shm"):
+        if os.path.exists(DATABASE_PATH + suffix):
+            os.remove(DATABASE_PATH + suffix)
+    shutil.copyfile(_TEMPLATE_PATH, DATABASE_PATH)
+    for result_cache in cache._registry:
+        result_cache.clear()
+
+
+@pytest.fixture(autouse=True, scope="module")
+def fresh_database():
+    reset_database()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@contextmanager
+def _count_queries(bind=engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def count_queries():
+    """`with count_queries() as statements:` collects the SQL run inside the block."""
+    return _count_queries
@@ -0,0 +1,38 @@
+"""
+Export tables to Parquet or Arrow IPC files for offline analytics.
+
+    python export_columnar.py --out exports --partition-by-month
+    python export_columnar.py --tables financial_records --format arrow --date-from 2024-01-01
+
+Partitioned exports are laid out hive style (exports/financial_records/month=2024-05/part-0.parquet),
+which pandas.read_parquet and pyarrow.dataset read as one table. Needs pyarrow.
+"""
+import argparse
+import sys
+from datetime import date
+from app.core.database import session_scope
+from app.core import columnar
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--out", default="exports", help="output directory")
+parser.add_argument("--tables", nargs="+", choices=list(columnar.TABLES), default=list(columnar.TABLES))
+parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+parser.add_argument("--partition-by-month", action="store_true", help="one file per month of the table's date column")
+parser.add_argument("--date-from", type=date.fromisoformat)
+parser.add_argument("--date-to", type=date.fromisoformat)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    try:
+        columnar.require_pyarrow()
+    except columnar.ColumnarUnavailable as e:
+        print(e)
+        sys.exit(1)
+    with session_scope() as db:
+        for table in args.tables:
+            written = columnar.write_table(
+                db, table, args.out, args.format, args.partition_by_month, args.date_from, args.date_to
+            )
+            print(f"{table}: {sum(written.values())} rows in {len(written)} file(s)")
+            for path, rows in written.items():
+                print(f"    {path} ({rows} rows)")
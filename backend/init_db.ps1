@@ -1,8 +1,8 @@
 # Activate virtual environment
 & ".\venv\Scripts\Activate.ps1"
 
-# Run the database initialization
-python run_db_init.py
+# Apply database migrations
+python migrate.py
 
 # Show completion message
 Write-Host "
@@ -0,0 +1,86 @@
+"""
+Load test: latency of other endpoints during a burst of /token logins.
+
+Runs the app in-process on a scratch SQLite database, measures GET / latency
+while idle, then again while --logins concurrent logins are in flight.
+--inline verifies passwords on the event loop (the old behaviour) for
+comparison. Expect one slow probe at the start of the burst either way: that
+is the burst's own requests being parsed, not hashing.
+
+    python load_test_login.py --logins 50
+    python load_test_login.py --logins 50 --inline
+"""
+import argparse
+import os
+import statistics
+import tempfile
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--logins", type=int, default=50, help="concurrent logins in the burst")
+parser.add_argument("--probes", type=int, default=100, help="GET / requests per phase")
+parser.add_argument("--inline", action="store_true", help="verify passwords on the event loop")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'login.db')}"
+
+import asyncio
+import time
+import httpx
+from app.main import app
+from app.core import security
+from app.core.database import session_scope
+from app.models.user import User
+from app.routers import auth
+
+USERNAME, PASSWORD = "loadtest", "correct horse battery staple"
+
+def seed_user():
+    with session_scope() as db:
+        db.add(User(username=USERNAME, email="loadtest@example.com",
+                    hashed_password=security.hash_password(PASSWORD)))
+
+async def probe(client, count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/")
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+        await asyncio.sleep(0.002)
+    return timings
+
+async def login(client):
+    response = await client.post("/token", data={"username": USERNAME, "password": PASSWORD})
+    return response.status_code
+
+def summary(label, timings):
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    p90 = timings[int(len(timings) * 0.9)]
+    print(f"{label:<22} GET / p50: {p50:6.2f} ms  p90: {p90:6.2f} ms  p99: {p99:6.2f} ms  max: {timings[-1]:6.2f} ms")
+    return p90, p99
+
+async def main():
+    if args.inline:
+        async def verify_inline(plain_password, hashed_password):
+            return security.verify_password(plain_password, hashed_password)
+        auth.verify_password_async = verify_inline
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await probe(client, 5)  # warm up
+        idle = summary("idle", await probe(client, args.probes))
+
+        logins = asyncio.gather(*[login(client) for _ in range(args.logins)])
+        busy = summary(f"during {args.logins} logins", await probe(client, args.probes))
+        statuses = await logins
+
+    print(f"logins: {statuses.count(200)} ok, {statuses.count(503)} shed (503), "
+          f"{len(statuses) - statuses.count(200) - statuses.count(503)} other")
+    print(f"hash pool: {security.hash_pool.stats()}")
+    print(f"busy/idle: p90 {busy[0] / idle[0]:.1f}x, p99 {busy[1] / idle[1]:.1f}x")
+
+if __name__ == "__main__":
+    seed_user()
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+"""
+Apply pending schema migrations (see app/core/migrations.py).
+
+    python migrate.py            # upgrade to the latest version
+    python migrate.py --status   # show the current and latest version
+"""
+import argparse
+from sqlalchemy import make_url
+from app.core.config import settings
+from app.core.database import engine
+from app.core import migrations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--status", action="store_true", help="only report the schema version")
+    args = parser.parse_args()
+
+    print(f"Database: {make_url(settings.DATABASE_URL).render_as_string(hide_password=True)}")
+    version = migrations.current_version(engine)
+    print(f"Schema version: {version} (latest: {migrations.LATEST_VERSION})")
+    if not args.status:
+        applied = migrations.upgrade(engine, verbose=True)
+        print(f"Applied {applied} migration(s); schema is up to date.")
@@ -0,0 +1,18 @@
+"""
+Rebuild the customer_summaries table from financial_records.
+
+Run this after bulk imports or manual SQL edits to financial_records:
+    python rebuild_customer_summaries.py
+"""
+from app.core.database import engine, session_scope
+from app.models.customer_summary import CustomerSummary
+from app.crud import customer_summary as crud_customer_summary
+
+if __name__ == "__main__":
+    CustomerSummary.__table__.create(bind=engine, checkfirst=True)
+    try:
+        with session_scope() as db:
+            rows = crud_customer_summary.rebuild(db)
+        print(f"Rebuilt customer_summaries: {rows} rows")
+    except Exception as e:
+        print(f"Error rebuilding summaries: {e}")
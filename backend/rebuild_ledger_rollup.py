@@ -0,0 +1,18 @@
+"""
+Rebuild the daily_ledger_rollup table from financial_records.
+
+Run this after bulk imports or manual SQL edits to financial_records:
+    python rebuild_ledger_rollup.py
+"""
+from app.core.database import engine, session_scope
+from app.models.ledger import DailyLedgerRollup
+from app.crud import ledger as crud_ledger
+
+if __name__ == "__main__":
+    DailyLedgerRollup.__table__.create(bind=engine, checkfirst=True)
+    try:
+        with session_scope() as db:
+            rows = crud_ledger.rebuild(db)
+        print(f"Rebuilt daily_ledger_rollup: {rows} rows")
+    except Exception as e:
+        print(f"Error rebuilding rollup: {e}")
@@ -0,0 +1,107 @@
+"""
+Minimal local SMTP server for testing outbound mail without a real relay.
+
+Accepts any AUTH PLAIN login, keeps every message in memory, and can inject
+failures: temporary 451 replies, dropped connections or slow replies to DATA.
+
+    python smtp_standin.py --port 8025
+    SMTP_HOST=127.0.0.1 SMTP_PORT=8025 SMTP_STARTTLS=false SMTP_USER=me SMTP_PASSWORD=x uvicorn app.main:app
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 smtp-standin ready")
+        mail_from, rcpts = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250-smtp-standin")
+                self.reply("250 AUTH PLAIN")
+            elif verb == "AUTH":
+                self.reply("235 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, rcpts = command[10:].strip(" <>"), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                rcpts.append(command[8:].strip(" <>"))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line)
+                if server.delay:
+                    time.sleep(server.delay)
+                with server.lock:
+                    drop = server.drop_data > 0
+                    fail = not drop and server.fail_data > 0
+                    if drop:
+                        server.drop_data -= 1
+                    elif fail:
+                        server.fail_data -= 1
+                    else:
+                        server.messages.append((mail_from, rcpts, b"".join(lines)))
+                if drop:
+                    return
+                self.reply("451 Try again later" if fail else "250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class StandInSMTPServer(socketserver.ThreadingTCPServer):
+    """SMTP stand-in; set fail_data / drop_data / delay to inject faults."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.fail_data = 0
+        self.drop_data = 0
+        self.delay = 0.0
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+    server = StandInSMTPServer(args.host, args.port)
+    print(f"SMTP stand-in listening on {args.host}:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"{len(server.messages)} message(s) received over {server.connections} connection(s)")
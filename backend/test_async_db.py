@@ -0,0 +1,83 @@
+"""
+Check the async read endpoints (create_app(async_db=True)) against the sync ones.
+"""
+import asyncio
+import threading
+from datetime import date
+import httpx
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import create_app
+from app.core import database
+from app.core.database import SessionLocal
+from app.crud import customer as crud_customer, dashboard as crud_dashboard
+
+
+@pytest.fixture(scope="module")
+def async_app():
+    # Only this module's app reads through the async engine; it is dropped afterwards
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(database, "async_engine", None)
+        mp.setattr(database, "AsyncSessionLocal", None)
+        app = create_app(async_db=True)
+        yield app
+        asyncio.run(database.async_engine.dispose())
+
+@pytest.fixture(scope="module")
+def client(async_app):
+    return TestClient(async_app)
+
+READ_PATHS = [
+    "/customers/", "/customers/1", "/customers/1/summary", "/customers/duplicates",
+    "/financial/", "/financial/1", "/inventory/", "/inventory/low-stock", "/inventory/valuation",
+    "/suppliers/", "/deliveries/", "/marketing/",
+    "/dashboard/stats", "/dashboard/sales-trend", "/dashboard/expense-breakdown",
+    "/financial/dashboard/summary", "/financial/export", "/customers/export?format=ndjson",
+    "/customers/?fast=true", "/financial/?fast=true&all=true", "/inventory/?fast=true",
+    "/customers/?fields=customer_name,phone_number", "/customers/1?fields=customer_name",
+    "/financial/?fields=amount&limit=5", "/suppliers/?fields=supplier_name&all=true",
+]
+
+def seed(client, customers=30):
+    for i in range(customers):
+        client.post("/customers/", json={
+            "customer_name": f"Customer {i}",
+            "phone_number": f"080{i:08d}",
+            "total_amount": 1000 + i,
+            "purchase_date": str(date.today())
+        })
+    client.post("/inventory/", json={"item_name": "Seeds", "cost_price": 10, "selling_price": 15})
+
+def test_async_results_match_sync_crud(client):
+    seed(client)
+    with SessionLocal() as db:
+        customers = crud_customer.list_customers(db)
+        stats = crud_dashboard.get_dashboard_stats(db)
+    assert [c["id"] for c in client.get("/customers/", params={"all": "true"}).json()] == [c.id for c in customers]
+    assert client.get("/dashboard/stats").json() == stats
+
+    first = client.get("/customers/", params={"limit": 10})
+    second = client.get("/customers/", params={"limit": 10, "cursor": first.headers["X-Next-Cursor"]})
+    assert [c["id"] for c in first.json() + second.json()] == [c.id for c in customers[:20]]
+    assert client.get("/customers/9999").status_code == 404
+
+def test_queries_run_on_the_event_loop_thread(async_app):
+    threads = set()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        threads.add(threading.current_thread())
+
+    async def run():
+        transport = httpx.ASGITransport(app=async_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = await asyncio.gather(*[ac.get(path) for path in READ_PATHS * 5])
+        assert all(r.status_code == 200 for r in responses)
+
+    event.listen(database.async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        asyncio.run(run())
+    finally:
+        event.remove(database.async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    # No request held a threadpool thread while waiting on the database
+    assert threads == {threading.main_thread()}, threads
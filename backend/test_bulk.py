@@ -0,0 +1,111 @@
+"""
+Bulk create/update/delete: bad rows are reported per row, and the ledger
+rollup and customer summaries follow every bulk write.
+"""
+from datetime import date, timedelta
+from app.core.database import session_scope
+from app.crud import customer_summary as crud_customer_summary, ledger as crud_ledger
+from app.models.ledger import DailyLedgerRollup
+from app.schemas.bulk import MAX_BULK_ROWS
+
+# Clear of the days the customer sales in the other tests land on
+day = date(2024, 5, 2)
+
+def rollups():
+    """The rollup rows of the days the financial records below are written on."""
+    with session_scope() as db:
+        return sorted(
+            (r.date, r.transaction_type, r.category, round(r.total_amount, 2), r.record_count)
+            for r in db.query(DailyLedgerRollup).filter(DailyLedgerRollup.date <= day) if r.record_count
+        )
+
+def summaries():
+    with session_scope() as db:
+        return sorted(
+            (s.customer_id, s.order_count, s.lifetime_revenue, s.first_purchase, s.last_purchase)
+            for s in db.query(crud_customer_summary.CustomerSummary)
+        )
+
+def assert_matches_rebuild():
+    ledger, customers = rollups(), summaries()
+    with session_scope() as db:
+        crud_ledger.rebuild(db)
+        crud_customer_summary.rebuild(db)
+    assert rollups() == ledger
+    assert summaries() == customers
+
+def test_invalid_rows_are_reported_and_skipped(client):
+    response = client.post("/customers/bulk", json=[
+        {"customer_name": "Ada Obi", "phone_number": "08040000001", "total_amount": 500},
+        "not an object",
+        {"customer_name": "No Phone"},
+        {"customer_name": "Bola Ade", "phone_number": "08040000002"},
+    ])
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [c["customer_name"] for c in body["items"]] == ["Ada Obi", "Bola Ade"]
+    assert [e["index"] for e in body["errors"]] == [1, 2]
+    ada, bola = body["items"]
+
+    response = client.put("/customers/bulk", json=[
+        {"id": ada["id"], "notes": "Prefers mornings"},
+        [ada["id"]],
+        {"notes": "no id"},
+        {"id": 999999, "notes": "missing"},
+        {"id": ada["id"], "notes": "repeated"},
+        {"id": bola["id"], "quantity": "many"},
+    ])
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [c["notes"] for c in body["items"]] == ["Prefers mornings"]
+    assert [e["index"] for e in body["errors"]] == [1, 2, 3, 4, 5]
+
+    for path in ("/financial/bulk", "/inventory/bulk", "/suppliers/bulk", "/deliveries/bulk", "/marketing/bulk"):
+        response = client.post(path, json=[42, None])
+        assert response.status_code in (200, 201), path
+        assert response.json()["items"] == []
+        assert [e["index"] for e in response.json()["errors"]] == [0, 1], path
+
+def test_too_many_rows_are_rejected(client):
+    rows = [{"supplier_name": f"Supplier {i}"} for i in range(MAX_BULK_ROWS + 1)]
+    assert client.post("/suppliers/bulk", json=rows).status_code == 422
+    assert client.put("/suppliers/bulk", json=rows).status_code == 422
+    assert client.get("/suppliers/", params={"all": "true"}).json() == []
+
+def test_record_writes_follow_through_to_the_rollups(client):
+    chidi = client.post("/customers/", json={
+        "customer_name": "Chidi Eze", "phone_number": "08040000003"
+    }).json()["id"]
+    created = client.post("/financial/bulk", json=[
+        {"date": str(day - timedelta(days=1)), "transaction_type": "Income", "category": "Sales",
+         "amount": 100, "customer_id": chidi},
+        {"date": str(day), "transaction_type": "Income", "category": "Sales", "amount": 250, "customer_id": chidi},
+        {"date": "not a date", "transaction_type": "Income", "amount": 1},
+        {"date": str(day), "transaction_type": "Expense", "category": "Fuel", "amount": 40},
+    ]).json()
+    assert [e["index"] for e in created["errors"]] == [2]
+    ids = [r["id"] for r in created["items"]]
+    summary = client.get(f"/customers/{chidi}/summary").json()
+    assert (summary["order_count"], summary["lifetime_revenue"]) == (2, 350.0)
+    assert (day, "Income", "Sales", 250.0, 1) in rollups()
+    assert_matches_rebuild()
+
+    # Move the older sale onto the same day and turn the expense into a sale of Chidi's
+    updated = client.put("/financial/bulk", json=[
+        {"id": ids[0], "date": str(day), "amount": 150},
+        {"id": ids[2], "transaction_type": "Income", "category": "Sales", "customer_id": chidi},
+        {"id": 999999, "amount": 1},
+    ]).json()
+    assert [e["index"] for e in updated["errors"]] == [2]
+    summary = client.get(f"/customers/{chidi}/summary").json()
+    assert (summary["order_count"], summary["lifetime_revenue"]) == (3, 440.0)
+    assert summary["first_purchase"] == str(day)
+    assert rollups() == [(day, "Income", "Sales", 440.0, 3)]
+    assert_matches_rebuild()
+
+    deleted = client.request("DELETE", "/financial/bulk", json={"ids": [ids[1], 999999]}).json()
+    assert deleted == {"deleted": 1, "missing": [999999]}
+    summary = client.get(f"/customers/{chidi}/summary").json()
+    assert (summary["order_count"], summary["lifetime_revenue"]) == (2, 190.0)
+    assert rollups() == [(day, "Income", "Sales", 190.0, 2)]
+    assert_matches_rebuild()
@@ -0,0 +1,141 @@
+"""
+ResultCache hits, TTL expiry, LRU eviction and invalidation on commit (not rollback).
+"""
+from types import SimpleNamespace
+import pytest
+from app.core import cache
+from app.core.cache import ResultCache, mark_dirty, table_versions
+from app.core.database import SessionLocal, session_scope
+from app.core.security import hash_password
+from app.models.user import User
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+@pytest.fixture
+def make_cache():
+    made = []
+
+    def make(**options):
+        result_cache = ResultCache("test", tables=["test_table"], **options)
+        made.append(result_cache)
+        return result_cache
+    yield make
+    for result_cache in made:
+        cache._registry.remove(result_cache)
+
+def counting(value="value"):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+    return compute, calls
+
+def test_repeat_calls_are_hits(make_cache):
+    result_cache = make_cache()
+    compute, calls = counting()
+    assert result_cache.get_or_compute(compute, "stats", days=30) == "value"
+    assert result_cache.get_or_compute(compute, "stats", days=30) == "value"
+    # Other parameters are another entry
+    result_cache.get_or_compute(compute, "stats", days=7)
+    assert len(calls) == 2
+    assert (result_cache.hits, result_cache.misses) == (1, 2)
+
+def test_entries_expire_after_the_ttl(make_cache, clock):
+    result_cache = make_cache(ttl=60)
+    compute, calls = counting()
+    result_cache.get_or_compute(compute, "stats")
+    clock[0] += 59
+    result_cache.get_or_compute(compute, "stats")
+    assert len(calls) == 1
+    clock[0] += 2
+    result_cache.get_or_compute(compute, "stats")
+    assert len(calls) == 2
+
+def test_least_recently_used_entry_is_evicted(make_cache):
+    result_cache = make_cache(maxsize=2)
+    compute, calls = counting()
+    result_cache.get_or_compute(compute, "a")
+    result_cache.get_or_compute(compute, "b")
+    result_cache.get_or_compute(compute, "a")  # b is now the oldest
+    result_cache.get_or_compute(compute, "c")
+    assert result_cache.evictions == 1
+    result_cache.get_or_compute(compute, "a")
+    assert len(calls) == 3
+    result_cache.get_or_compute(compute, "b")
+    assert len(calls) == 4
+
+def test_commit_invalidates_caches_of_written_tables(make_cache):
+    result_cache = make_cache()
+    other = ResultCache("other", tables=["other_table"])
+    try:
+        compute, calls = counting()
+        result_cache.get_or_compute(compute, "stats")
+        other.get_or_compute(compute, "stats")
+        before = table_versions("test_table", "other_table")
+
+        with session_scope() as db:
+            mark_dirty(db, "test_table")
+        assert table_versions("test_table", "other_table") == (before[0] + 1, before[1])
+        result_cache.get_or_compute(compute, "stats")
+        other.get_or_compute(compute, "stats")
+        assert len(calls) == 3
+        assert (result_cache.invalidations, other.invalidations) == (1, 0)
+    finally:
+        cache._registry.remove(other)
+
+def test_rollback_keeps_the_cache_and_versions(make_cache):
+    result_cache = make_cache()
+    compute, calls = counting()
+    result_cache.get_or_compute(compute, "stats")
+    before = table_versions("test_table")
+
+    with pytest.raises(RuntimeError):
+        with session_scope() as db:
+            mark_dirty(db, "test_table")
+            raise RuntimeError("request failed")
+    # The rolled-back writes are forgotten, not carried into the next commit
+    with SessionLocal() as db:
+        mark_dirty(db, "test_table")
+        db.rollback()
+        db.commit()
+
+    assert table_versions("test_table") == before
+    assert result_cache.invalidations == 0
+    result_cache.get_or_compute(compute, "stats")
+    assert len(calls) == 1
+
+def test_results_computed_across_an_invalidation_are_not_stored(make_cache):
+    result_cache = make_cache()
+
+    def compute():
+        # A write commits while the stale result is being computed
+        result_cache.clear()
+        return "stale"
+    assert result_cache.get_or_compute(compute, "stats") == "stale"
+    fresh, calls = counting("fresh")
+    assert result_cache.get_or_compute(fresh, "stats") == "fresh"
+    assert len(calls) == 1
+
+def test_cache_stats_require_an_admin(client):
+    with session_scope() as db:
+        db.add(User(username="admin", email="admin@example.com", hashed_password=hash_password("pw"), is_admin=True))
+        db.add(User(username="staff", email="staff@example.com", hashed_password=hash_password("pw")))
+
+    def get_stats(username=None):
+        headers = {}
+        if username:
+            token = client.post("/token", data={"username": username, "password": "pw"}).json()["access_token"]
+            headers["Authorization"] = f"Bearer {token}"
+        return client.get("/dashboard/cache-stats", headers=headers)
+
+    assert get_stats().status_code == 401
+    assert get_stats("staff").status_code == 400
+    response = get_stats("admin")
+    assert response.status_code == 200
+    assert {"dashboard", "inventory"} <= {c["name"] for c in response.json()}
@@ -0,0 +1,67 @@
+"""
+Repeat buyers are matched on a normalized phone; duplicates are found and merged.
+"""
+from datetime import date
+
+def sale(client, name, phone, amount=1000, **params):
+    response = client.post("/customers/", params=params, json={
+        "customer_name": name, "phone_number": phone,
+        "total_amount": amount, "purchase_date": str(date.today())
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def records(client, customer_id):
+    return client.get("/financial/", params={"customer_id": customer_id}).json()
+
+def test_repeat_sale_goes_on_the_existing_customer(client):
+    first = sale(client, "Adaeze Okafor", "+234 803 123 4567", 1000, match_existing="true")
+    again = sale(client, "adaeze okafor", "0803-123-4567", 500, match_existing="true")
+    assert again["id"] == first["id"]
+    assert again["customer_type"] == "Repeat"
+    assert again["total_amount"] == 500
+    assert sorted(r["amount"] for r in records(client, first["id"])) == [500, 1000]
+
+    # Same phone, different person: a household sharing a number
+    other = sale(client, "Chidi Okafor", "08031234567", match_existing="true")
+    assert other["id"] != first["id"]
+    # Without match_existing every sale creates a customer
+    separate = sale(client, "Adaeze Okafor", "08031234567")
+    assert separate["id"] != first["id"]
+    assert separate["customer_type"] != "Repeat"
+
+def test_duplicates_are_grouped_by_phone_and_name(client):
+    client.post("/customers/bulk", json=[
+        {"customer_name": "OKAFOR, Adaize", "phone_number": "00234 803 123 4567"},
+        {"customer_name": "Tunde Bello", "phone_number": "0701 987 6543"},
+    ])
+    groups = client.get("/customers/duplicates").json()
+    assert len(groups) == 1
+    group = groups[0]
+    assert group["phone_key"] == "08031234567"
+    names = [c["customer_name"] for c in group["customers"]]
+    assert names == ["Adaeze Okafor", "Adaeze Okafor", "OKAFOR, Adaize"]
+    assert group["primary_id"] == group["customers"][0]["id"]
+    # A stricter threshold drops the misspelt name
+    strict = client.get("/customers/duplicates", params={"threshold": 0.95}).json()
+    assert [len(g["customers"]) for g in strict] == [2]
+
+def test_merge_moves_records_and_removes_duplicates(client):
+    group = client.get("/customers/duplicates").json()[0]
+    target = group["primary_id"]
+    sources = [c["id"] for c in group["customers"] if c["id"] != target]
+    before = client.get("/dashboard/stats").json()["total_customers"]
+
+    response = client.post("/customers/merge", json={"target_id": target, "source_ids": sources + [999999]})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["merged"] == sources
+    assert result["missing"] == [999999]
+    assert result["records_moved"] == 1
+    assert len(records(client, target)) == 3
+    for source in sources:
+        assert client.get(f"/customers/{source}").status_code == 404
+    assert client.get("/dashboard/stats").json()["total_customers"] == before - 2
+    assert client.get("/customers/duplicates").json() == []
+
+    assert client.post("/customers/merge", json={"target_id": 999999, "source_ids": [target]}).status_code == 404
@@ -0,0 +1,94 @@
+"""
+Customer updates sync their primary sale record with one UPDATE; deletes unlink in one statement.
+"""
+import re
+from contextlib import contextmanager
+from datetime import date, timedelta
+from sqlalchemy import event
+from app.core.database import engine
+
+today = date.today()
+
+@contextmanager
+def capture_writes(table):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        match = re.match(r"\s*(UPDATE|INSERT INTO|DELETE FROM) (\w+)", statement, re.IGNORECASE)
+        if match and match.group(2) == table:
+            statements.append(match.group(1).split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def records(client, customer_id):
+    return client.get("/financial/", params={"customer_id": customer_id, "all": "true"}).json()
+
+def test_update_touches_only_the_primary_record(client):
+    customer = client.post("/customers/", json={
+        "customer_name": "Ngozi Ume", "phone_number": "08050000001",
+        "total_amount": 1000, "purchase_date": str(today - timedelta(days=5))
+    }).json()
+    first = customer["primary_record_id"]
+    assert first is not None
+    again = client.post("/customers/", params={"match_existing": "true"}, json={
+        "customer_name": "Ngozi Ume", "phone_number": "08050000001",
+        "total_amount": 400, "purchase_date": str(today)
+    }).json()
+    assert again["id"] == customer["id"] and again["primary_record_id"] != first
+
+    # The newest sale follows the customer; the older one is left alone
+    with capture_writes("financial_records") as writes:
+        response = client.put(f"/customers/{customer['id']}", json={
+            "total_amount": 450, "purchase_date": str(today - timedelta(days=1))
+        })
+    assert response.status_code == 200, response.text
+    assert writes == ["UPDATE"]
+    by_id = {r["id"]: r for r in records(client, customer["id"])}
+    assert by_id[first]["amount"] == 1000
+    assert by_id[again["primary_record_id"]]["amount"] == 450
+    assert by_id[again["primary_record_id"]]["date"] == str(today - timedelta(days=1))
+
+    # Once the primary record is gone the next update records a new sale
+    client.delete(f"/financial/{again['primary_record_id']}")
+    updated = client.put(f"/customers/{customer['id']}", json={"total_amount": 500}).json()
+    by_id = {r["id"]: r for r in records(client, customer["id"])}
+    assert sorted(r["amount"] for r in by_id.values()) == [500, 1000]
+    assert by_id[updated["primary_record_id"]]["amount"] == 500
+
+def test_bulk_create_and_update_use_the_primary_record(client):
+    created = client.post("/customers/bulk", json=[
+        {"customer_name": "Emeka Obi", "phone_number": "08050000002", "total_amount": 300},
+        {"customer_name": "Funke Ade", "phone_number": "08050000003"},
+    ]).json()["items"]
+    assert created[0]["primary_record_id"] == records(client, created[0]["id"])[0]["id"]
+    assert created[1]["primary_record_id"] is None
+    updated = client.put("/customers/bulk", json=[
+        {"id": created[0]["id"], "total_amount": 350},
+        {"id": created[1]["id"], "total_amount": 200},
+    ]).json()["items"]
+    assert updated[0]["primary_record_id"] == created[0]["primary_record_id"]
+    assert [r["amount"] for r in records(client, created[0]["id"])] == [350]
+    assert [r["id"] for r in records(client, created[1]["id"])] == [updated[1]["primary_record_id"]]
+
+def test_delete_unlinks_records_in_one_statement(client):
+    customer = client.post("/customers/", json={
+        "customer_name": "Gbenga Ola", "phone_number": "08050000004", "total_amount": 700
+    }).json()
+    record_id = customer["primary_record_id"]
+    with capture_writes("financial_records") as writes:
+        assert client.delete(f"/customers/{customer['id']}").status_code == 200
+    assert writes == ["UPDATE"]
+    record = client.get(f"/financial/{record_id}").json()
+    assert record["customer_id"] is None and record["amount"] == 700
+
+def test_record_date_can_be_updated(client):
+    record = client.post("/financial/", json={
+        "date": str(today), "transaction_type": "Expense", "amount": 50
+    }).json()
+    response = client.put(f"/financial/{record['id']}", json={"date": "2024-03-01"})
+    assert response.status_code == 200, response.text
+    assert response.json()["date"] == "2024-03-01"
@@ -0,0 +1,92 @@
+"""
+Per-customer order aggregates follow every financial write and match a rebuild.
+"""
+from datetime import date, timedelta
+from app.core.database import session_scope
+from app.crud import customer_summary as crud_customer_summary
+
+today = date.today()
+
+def customer(client, name, phone, amount=0, purchase_date=today):
+    response = client.post("/customers/", json={
+        "customer_name": name, "phone_number": phone,
+        "total_amount": amount, "purchase_date": str(purchase_date)
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+def record(client, customer_id, amount, days_ago=0, transaction_type="Income"):
+    response = client.post("/financial/", json={
+        "date": str(today - timedelta(days=days_ago)), "transaction_type": transaction_type,
+        "category": "Sales", "amount": amount, "customer_id": customer_id
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+def summary(client, customer_id):
+    response = client.get(f"/customers/{customer_id}/summary")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def snapshot():
+    with session_scope() as db:
+        return sorted(
+            (s.customer_id, s.order_count, s.lifetime_revenue, s.first_purchase, s.last_purchase)
+            for s in db.query(crud_customer_summary.CustomerSummary)
+        )
+
+def assert_matches_rebuild():
+    before = snapshot()
+    with session_scope() as db:
+        crud_customer_summary.rebuild(db)
+    assert snapshot() == before
+
+def test_summary_follows_record_writes(client):
+    ada = customer(client, "Ada Obi", "08030000001", 1000)
+    assert summary(client, ada) == {
+        "customer_id": ada, "order_count": 1, "lifetime_revenue": 1000.0, "average_order_value": 1000.0,
+        "first_purchase": str(today), "last_purchase": str(today)
+    }
+    old = record(client, ada, 500, days_ago=10)
+    record(client, ada, 99, transaction_type="Expense")  # Not an order
+    s = summary(client, ada)
+    assert (s["order_count"], s["lifetime_revenue"], s["average_order_value"]) == (2, 1500.0, 750.0)
+    assert s["first_purchase"] == str(today - timedelta(days=10))
+
+    # Moving the oldest order to another customer recomputes both
+    bola = customer(client, "Bola Ade", "08030000002")
+    assert summary(client, bola)["order_count"] == 0
+    client.put(f"/financial/{old}", json={"customer_id": bola})
+    assert summary(client, ada)["first_purchase"] == str(today)
+    assert summary(client, bola)["lifetime_revenue"] == 500.0
+
+    client.delete(f"/financial/{old}")
+    assert summary(client, bola)["order_count"] == 0
+    assert_matches_rebuild()
+
+def test_summary_follows_bulk_writes_and_customer_deletes(client):
+    chidi = customer(client, "Chidi Eze", "08030000003")
+    created = client.post("/financial/bulk", json=[
+        {"date": str(today - timedelta(days=d)), "transaction_type": "Income", "amount": 100 * d, "customer_id": chidi}
+        for d in (1, 2, 3)
+    ]).json()["items"]
+    s = summary(client, chidi)
+    assert (s["order_count"], s["lifetime_revenue"]) == (3, 600.0)
+    client.put("/financial/bulk", json=[{"id": created[0]["id"], "amount": 1000}])
+    assert summary(client, chidi)["lifetime_revenue"] == 1500.0
+    client.request("DELETE", "/financial/bulk", json={"ids": [created[2]["id"]]})
+    s = summary(client, chidi)
+    assert (s["order_count"], s["first_purchase"]) == (2, str(today - timedelta(days=2)))
+    assert_matches_rebuild()
+
+    client.delete(f"/customers/{chidi}")
+    assert client.get(f"/customers/{chidi}/summary").status_code == 404
+    assert chidi not in [row[0] for row in snapshot()]
+
+def test_dashboard_counts_repeat_customers_from_summaries(client):
+    stats = client.get("/dashboard/stats").json()
+    repeat = [row for row in snapshot() if row[1] >= 2]
+    assert stats["repeat_customers"] == len(repeat) == 0
+    dayo = customer(client, "Dayo Ike", "08030000004", 200)
+    record(client, dayo, 300)
+    assert client.get("/dashboard/stats").json()["repeat_customers"] == 1
@@ -0,0 +1,55 @@
+"""
+CSV / NDJSON exports stream in batches and honour the date range.
+"""
+import csv
+import io
+import json
+from datetime import date, timedelta
+from app.core import export
+from app.crud import financial as crud_financial
+
+today = date.today()
+
+def seed(client):
+    client.post("/customers/bulk", json=[
+        {"customer_name": f"Customer {i}", "phone_number": f"080{i:08d}", "total_amount": 100 + i,
+         "purchase_date": str(today - timedelta(days=i)), "notes": "line one\nline, \"two\""}
+        for i in range(40)
+    ])
+    client.post("/financial/bulk", json=[
+        {"date": str(today - timedelta(days=i)), "transaction_type": "Expense", "amount": 5, "category": "Fuel"}
+        for i in range(25)
+    ])
+
+def test_body_is_one_chunk_per_batch(client):
+    seed(client)
+    export.EXPORT_BATCH_SIZE = 10
+    try:
+        stmt = crud_financial.export_statement(date_from=today - timedelta(days=19))
+        parts = list(export.iter_export(stmt, "csv"))
+    finally:
+        export.EXPORT_BATCH_SIZE = 1000
+    # Header, then 20 sales + 20 expenses in batches of 10
+    assert [len(list(csv.reader(io.StringIO(p)))) for p in parts] == [1, 10, 10, 10, 10]
+
+def test_financial_csv(client):
+    response = client.get("/financial/export", params={"date_from": str(today - timedelta(days=19))})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="financial_records.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 40
+    assert [r["date"] for r in rows] == sorted(r["date"] for r in rows)
+    sale = next(r for r in rows if r["customer_id"])
+    assert sale["customer_name"].startswith("Customer ") and sale["transaction_type"] == "Income"
+    assert next(r for r in rows if not r["customer_id"])["customer_name"] == ""
+
+def test_customers_ndjson_round_trips(client):
+    date_to = str(today - timedelta(days=30))
+    response = client.get("/customers/export", params={"format": "ndjson", "date_to": date_to})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["customer_name"] for r in rows] == [f"Customer {i}" for i in range(30, 40)]
+    assert rows[0]["purchase_date"] == date_to and rows[0]["total_amount"] == 130
+    assert rows[0]["notes"] == "line one\nline, \"two\""
+    assert "phone_key" not in rows[0]
+    assert client.get("/customers/export", params={"format": "xml"}).status_code == 422
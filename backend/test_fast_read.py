@@ -0,0 +1,56 @@
+"""
+?fast=true list responses match the normal ones and skip the ORM.
+"""
+from datetime import date, timedelta
+
+def seed(client):
+    client.post("/customers/bulk", json=[
+        {"customer_name": f"Customer {i}", "phone_number": f"080{i:08d}", "total_amount": 100.5 * i,
+         "purchase_date": str(date.today() - timedelta(days=i % 7)) if i % 5 else None, "notes": "ünïcode ✓"}
+        for i in range(1, 60)
+    ])
+    client.post("/financial/bulk", json=[
+        {"date": str(date.today() - timedelta(days=i % 3)), "transaction_type": "Expense", "amount": 7, "category": "Fuel"}
+        for i in range(20)
+    ])
+    client.post("/inventory/bulk", json=[
+        {"item_name": f"Item {i}", "cost_price": "12.40", "selling_price": 19.99, "quantity_in_stock": i}
+        for i in range(30)
+    ])
+
+def pages(client, path, **params):
+    """Every page of a list endpoint, following the cursor header."""
+    items, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        items += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items
+
+def test_fast_responses_match_normal_ones(client):
+    seed(client)
+    for path, params in [
+        ("/customers/", {}),
+        ("/customers/", {"order": "desc", "payment_status": "Pending"}),
+        ("/financial/", {}),
+        ("/financial/", {"transaction_type": "Income", "order": "asc"}),
+        ("/inventory/", {}),
+    ]:
+        normal = client.get(path, params={**params, "all": "true"})
+        fast = client.get(path, params={**params, "all": "true", "fast": "true"})
+        assert fast.headers["content-type"] == "application/json"
+        assert fast.json() == normal.json(), path
+        assert pages(client, path, **params, limit=7, fast="true") == normal.json(), path
+
+def test_fast_mode_selects_only_response_columns(client, count_queries):
+    with count_queries() as statements:
+        client.get("/financial/", params={"fast": "true", "limit": 10})
+    assert len(statements) == 1
+    # Only the customer's name is read from the joined table
+    assert "customers.customer_name" in statements[0]
+    assert "customers.phone_number" not in statements[0]
+    with count_queries() as statements:
+        client.get("/customers/", params={"fast": "true", "all": "true"})
+    assert "phone_key" not in statements[0]
@@ -0,0 +1,36 @@
+"""
+Guard against N+1 queries on the financial list and detail endpoints.
+"""
+from datetime import date
+
+def seed(client, customers=25):
+    for i in range(customers):
+        client.post("/customers/", json={
+            "customer_name": f"Customer {i}",
+            "phone_number": f"080{i:08d}",
+            "total_amount": 1000 + i,
+            "purchase_date": str(date.today())
+        })
+
+def test_list_records_query_count_is_constant(client, count_queries):
+    seed(client)
+    with count_queries() as statements:
+        response = client.get("/financial/", params={"all": "true"})
+    records = response.json()
+    assert response.status_code == 200
+    assert len(records) >= 25
+    assert all(r["customer_name"] for r in records if r["customer_id"])
+    assert len(statements) == 1, f"expected 1 query, got {len(statements)}"
+
+    with count_queries() as statements:
+        response = client.get("/financial/", params={"limit": 10})
+    assert response.status_code == 200
+    assert len(statements) == 1, f"expected 1 query, got {len(statements)}"
+
+def test_get_record_fetches_customer_in_one_query(client, count_queries):
+    record = client.get("/financial/", params={"limit": 1}).json()[0]
+    with count_queries() as statements:
+        response = client.get(f"/financial/{record['id']}")
+    assert response.status_code == 200
+    assert response.json()["customer_name"] == record["customer_name"]
+    assert len(statements) == 1, f"expected 1 query, got {len(statements)}"
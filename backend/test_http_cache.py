@@ -0,0 +1,145 @@
+"""
+Compressed responses and conditional GETs (ETag / If-None-Match -> 304).
+"""
+import gzip
+import time
+from types import SimpleNamespace
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.core import compression, etag as etag_module
+from app.core.compression import BrotliEncoder, CompressionMiddleware, GzipEncoder, choose_encoder
+from app.core.config import settings
+
+@pytest.fixture(autouse=True)
+def fixed_window(monkeypatch):
+    # Tags roll over every CACHE_TTL_SECONDS; keep a test inside one window
+    now = time.time()
+    monkeypatch.setattr(etag_module, "time", SimpleNamespace(time=lambda: now))
+
+def seed(client):
+    client.post("/customers/bulk", json=[
+        {"customer_name": f"Customer {i}", "phone_number": f"080{i:08d}", "total_amount": 100 * i,
+         "address": "12 Long Garden Road", "notes": "Call before delivery"}
+        for i in range(1, 80)
+    ])
+
+def test_large_responses_are_compressed(client):
+    seed(client)
+    response = client.get("/customers/", params={"all": "true"}, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()) == 79
+    # Small bodies are sent as-is
+    small = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert len(small.content) < settings.COMPRESS_MIN_BYTES
+    assert "content-encoding" not in small.headers
+    plain = client.get("/customers/", params={"all": "true"}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    if compression.brotli is not None:
+        br = client.get("/customers/", params={"all": "true"}, headers={"Accept-Encoding": "br, gzip"})
+        assert br.headers["content-encoding"] == "br"
+        assert br.json() == plain.json()
+
+def test_streamed_exports_are_compressed(client):
+    response = client.get("/customers/export", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.count("\n") == 80
+
+def test_encoding_choice_follows_accept_encoding(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoder("br, gzip") is GzipEncoder
+    assert choose_encoder("identity") is None
+    monkeypatch.setattr(compression, "brotli", SimpleNamespace())
+    assert choose_encoder("gzip, br") is BrotliEncoder
+    assert choose_encoder("br;q=0, gzip") is GzipEncoder
+    assert choose_encoder("gzip;q=0") is None
+
+def test_only_compressible_responses_are_encoded():
+    body = b"x" * 2000
+
+    async def chunks():
+        yield b"a" * 1000
+        yield b"b" * 1000
+
+    app = Starlette(routes=[
+        Route("/json", lambda request: Response(body, media_type="application/json")),
+        Route("/zip", lambda request: Response(body, media_type="application/zip")),
+        Route("/encoded", lambda request: Response(body, headers={"Content-Encoding": "identity"})),
+        Route("/partial", lambda request: Response(body, status_code=206)),
+        Route("/stream", lambda request: StreamingResponse(chunks(), media_type="text/csv")),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    test_client = TestClient(app)
+    headers = {"Accept-Encoding": "gzip"}
+
+    compressed = test_client.get("/json", headers=headers)
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.content == body
+    for path in ["/zip", "/encoded", "/partial"]:
+        response = test_client.get(path, headers=headers)
+        assert response.headers.get("content-encoding") in (None, "identity"), path
+        assert int(response.headers["content-length"]) == len(body), path
+
+    # Each streamed chunk is flushed, so the body decodes as it arrives
+    with test_client.stream("GET", "/stream", headers=headers) as response:
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == b"a" * 1000 + b"b" * 1000
+
+def test_gzip_chunks_decode_as_they_arrive():
+    encoder = GzipEncoder()
+    first = encoder.compress(b"hello " * 100, more_body=True)
+    decoder = compression.zlib.decompressobj(16 + compression.zlib.MAX_WBITS)
+    assert decoder.decompress(first) == b"hello " * 100
+    assert decoder.decompress(encoder.compress(b"world", more_body=False)) == b"world"
+    assert decoder.eof
+
+def test_brotli_round_trip():
+    brotli = pytest.importorskip("brotli")
+    encoder = BrotliEncoder()
+    body = encoder.compress(b"hello " * 100, more_body=True) + encoder.compress(b"world", more_body=False)
+    assert brotli.decompress(body) == b"hello " * 100 + b"world"
+
+def test_unchanged_data_is_answered_with_304_without_a_query(client, count_queries):
+    for path in ["/customers/", "/customers/?fast=true&limit=10", "/dashboard/stats",
+                 "/financial/dashboard/summary", "/inventory/valuation", "/suppliers/"]:
+        first = client.get(path)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+        with count_queries() as statements:
+            again = client.get(path, headers={"If-None-Match": etag})
+        assert again.status_code == 304, path
+        assert again.content == b"" and again.headers["etag"] == etag
+        assert statements == [], path
+    # Tags are per URL
+    assert client.get("/customers/?limit=5").headers["etag"] != client.get("/customers/?limit=6").headers["etag"]
+    etag = client.get("/customers/").headers["etag"]
+    assert client.get("/customers/", headers={"If-None-Match": f'W/"stale", {etag}'}).status_code == 304
+    assert client.get("/customers/", headers={"If-None-Match": "*"}).status_code == 304
+
+def test_writes_change_the_tags_of_their_tables(client):
+    customers = client.get("/customers/").headers["etag"]
+    records = client.get("/financial/").headers["etag"]
+    stats = client.get("/dashboard/stats").headers["etag"]
+    suppliers = client.get("/suppliers/").headers["etag"]
+
+    client.put("/customers/1", json={"customer_name": "Renamed Customer"})
+    assert client.get("/customers/", headers={"If-None-Match": customers}).status_code == 200
+    # Financial lists show customer names and the dashboard counts customers
+    assert client.get("/financial/", headers={"If-None-Match": records}).status_code == 200
+    assert client.get("/dashboard/stats", headers={"If-None-Match": stats}).status_code == 200
+    assert client.get("/suppliers/", headers={"If-None-Match": suppliers}).status_code == 304
+
+    client.post("/suppliers/", json={"supplier_name": "Seed Co"})
+    response = client.get("/suppliers/", headers={"If-None-Match": suppliers})
+    assert response.status_code == 200 and response.json()[-1]["supplier_name"] == "Seed Co"
+
+def test_failed_writes_keep_the_tags(client):
+    etag = client.get("/suppliers/").headers["etag"]
+    assert client.put("/suppliers/9999", json={"supplier_name": "Nobody"}).status_code == 404
+    assert client.get("/suppliers/", headers={"If-None-Match": etag}).status_code == 304
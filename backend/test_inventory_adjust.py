@@ -0,0 +1,46 @@
+"""
+Stress test for atomic stock adjustments: concurrent sales never oversell.
+"""
+import asyncio
+import httpx
+from app.main import app
+
+def new_item(client, quantity, restock_level=5):
+    return client.post("/inventory/", json={
+        "item_name": "Seedlings", "quantity_in_stock": quantity,
+        "restock_level": restock_level, "cost_price": 100, "selling_price": 150
+    }).json()
+
+async def hammer(requests):
+    """Fire (path, json) POSTs concurrently; sync routes run on parallel threads."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        return await asyncio.gather(*[ac.post(path, json=body) for path, body in requests])
+
+def test_concurrent_decrements_never_oversell(client):
+    item = new_item(client, 100)
+    responses = asyncio.run(hammer([(f"/inventory/{item['id']}/adjust", {"delta": -1})] * 250))
+    codes = [r.status_code for r in responses]
+    assert codes.count(200) == 100, codes.count(200)
+    assert codes.count(409) == 150
+    final = client.get(f"/inventory/{item['id']}").json()
+    assert final["quantity_in_stock"] == 0
+    assert final["status"] == "Out of Stock"
+
+def test_concurrent_batches_are_all_or_nothing(client):
+    a, b = new_item(client, 30), new_item(client, 30)
+    batch = {"adjustments": [{"item_id": a["id"], "delta": -2}, {"item_id": b["id"], "delta": -3}]}
+    responses = asyncio.run(hammer([("/inventory/adjust", batch)] * 40))
+    succeeded = [r.status_code for r in responses].count(200)
+    # b runs out after 10 batches; a must not be decremented by the failed ones
+    assert succeeded == 10
+    assert client.get(f"/inventory/{a['id']}").json()["quantity_in_stock"] == 30 - 2 * succeeded
+    assert client.get(f"/inventory/{b['id']}").json()["quantity_in_stock"] == 0
+
+def test_status_follows_the_update_status_rules(client):
+    item = new_item(client, 10, restock_level=5)
+    assert client.post(f"/inventory/{item['id']}/adjust", json={"delta": -5}).json()["status"] == "Low Stock"
+    assert client.post(f"/inventory/{item['id']}/adjust", json={"delta": -5}).json()["status"] == "Out of Stock"
+    assert client.post(f"/inventory/{item['id']}/adjust", json={"delta": 6}).json()["status"] == "In Stock"
+    assert client.post(f"/inventory/{item['id']}/adjust", json={"delta": -7}).status_code == 409
+    assert client.post("/inventory/999999/adjust", json={"delta": -1}).status_code == 404
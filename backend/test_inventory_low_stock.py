@@ -0,0 +1,68 @@
+"""
+Low-stock feed and the set-based status sweep.
+"""
+from sqlalchemy import event
+from app.main import sweep_inventory_status
+from app.core.database import engine
+
+def new_item(client, name, quantity, restock_level):
+    return client.post("/inventory/", json={
+        "item_name": name, "quantity_in_stock": quantity, "restock_level": restock_level,
+        "cost_price": 1, "selling_price": 2, "status": "In Stock"
+    }).json()
+
+def test_low_stock_is_ordered_by_shortfall(client):
+    new_item(client, "plenty", 50, 5)
+    new_item(client, "at level", 5, 5)
+    new_item(client, "short by 8", 2, 10)
+    new_item(client, "empty", 0, 3)
+    response = client.get("/inventory/low-stock")
+    assert response.status_code == 200
+    feed = response.json()
+    assert [i["item_name"] for i in feed] == ["short by 8", "empty", "at level"]
+    assert [i["shortfall"] for i in feed] == [8, 3, 0]
+    assert len(client.get("/inventory/low-stock", params={"limit": 1}).json()) == 1
+
+def test_edits_recompute_status(client):
+    items = client.get("/inventory/", params={"all": "true"}).json()
+    by_name = {i["item_name"]: i for i in items}
+
+    plenty = client.put(f"/inventory/{by_name['plenty']['id']}", json={"quantity_in_stock": 4}).json()
+    assert plenty["status"] == "Low Stock"
+    plenty = client.put(f"/inventory/{by_name['plenty']['id']}", json={"restock_level": 3}).json()
+    assert plenty["status"] == "In Stock"
+    # Other edits leave the status alone
+    renamed = client.put(f"/inventory/{by_name['at level']['id']}", json={"unit": "kg"}).json()
+    assert renamed["status"] == "In Stock"
+
+    response = client.put("/inventory/bulk", json=[
+        {"id": by_name["plenty"]["id"], "quantity_in_stock": 0},
+        {"id": by_name["empty"]["id"], "quantity_in_stock": 40},
+        {"id": by_name["short by 8"]["id"], "restock_level": 1},
+        {"id": by_name["at level"]["id"], "unit": "bags"},
+    ])
+    assert response.status_code == 200, response.text
+    assert [i["status"] for i in response.json()["items"]] == ["Out of Stock", "In Stock", "In Stock", "In Stock"]
+
+def test_sweep_fixes_stale_status_in_one_statement(client):
+    # Creates keep the status they were given, however low the stock
+    new_item(client, "stale empty", 0, 2)
+
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        changed = sweep_inventory_status()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert [s.split()[0] for s in statements] == ["UPDATE"]
+    # The seeded "In Stock" of "at level" and the new empty item was stale
+    statuses = {i["item_name"]: i["status"] for i in client.get("/inventory/", params={"all": "true"}).json()}
+    assert statuses == {
+        "plenty": "Out of Stock", "at level": "Low Stock",
+        "short by 8": "In Stock", "empty": "In Stock", "stale empty": "Out of Stock"
+    }
+    assert changed == 2
+    assert sweep_inventory_status() == 0
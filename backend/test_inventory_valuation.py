@@ -0,0 +1,56 @@
+"""
+Inventory valuation: exact sums in SQL, cached until inventory is written.
+"""
+from decimal import Decimal
+from app.core.cache import inventory_cache
+
+def new_item(client, name, quantity, cost, price, category=None, supplier=None):
+    return client.post("/inventory/", json={
+        "item_name": name, "quantity_in_stock": quantity, "cost_price": cost,
+        "selling_price": price, "category": category, "supplier": supplier
+    }).json()
+
+def test_valuation_is_exact(client):
+    # 0.1 and 0.7 have no exact float form; 3 * 0.1 summed as floats is 0.30000000000000004
+    new_item(client, "seed a", 3, 0.1, 0.7, "Seeds", "Agro")
+    new_item(client, "seed b", 7, 19.99, 24.99, "Seeds", "Farmco")
+    new_item(client, "rake", 2, 1500.5, 2000, "Tools", "Agro")
+    new_item(client, "loose", 5, 1, 1)
+
+    response = client.get("/inventory/valuation")
+    assert response.status_code == 200
+    body = response.json()
+    # Amounts are decimal strings, so clients never see them as floats
+    assert body["totals"] == {
+        "items": 4, "units": 17, "cost_value": "3146.23", "retail_value": "4182.03",
+        "margin": "1035.80", "margin_pct": "24.77"
+    }
+    by_category = {row["category"]: row for row in body["by_category"]}
+    assert list(by_category) == ["Seeds", "Tools", None]
+    assert by_category["Seeds"]["cost_value"] == "140.23"
+    assert by_category["Seeds"]["retail_value"] == "177.03"
+    assert by_category["Seeds"]["margin"] == "36.80"
+    by_supplier = {row["supplier"]: row for row in body["by_supplier"]}
+    assert list(by_supplier) == ["Agro", "Farmco", None]
+    assert by_supplier["Agro"]["cost_value"] == "3001.30"
+    assert by_supplier["Farmco"]["units"] == 7
+    assert by_supplier[None]["margin"] == "0.00"
+    assert by_supplier[None]["margin_pct"] == "0.00"
+
+def test_valuation_is_cached_until_inventory_changes(client):
+    first = client.get("/inventory/valuation").json()
+    hits = inventory_cache.hits
+    assert client.get("/inventory/valuation").json() == first
+    assert inventory_cache.hits == hits + 1
+
+    item = client.get("/inventory/", params={"limit": 1}).json()[0]
+    client.post(f"/inventory/{item['id']}/adjust", json={"delta": 1})
+    after_adjust = client.get("/inventory/valuation").json()
+    assert after_adjust["totals"]["units"] == first["totals"]["units"] + 1
+
+    client.put(f"/inventory/{item['id']}", json={"cost_price": 0})
+    after_update = client.get("/inventory/valuation").json()
+    assert Decimal(after_update["totals"]["cost_value"]) < Decimal(after_adjust["totals"]["cost_value"])
+
+    client.put("/inventory/bulk", json=[{"id": item["id"], "quantity_in_stock": 0}])
+    assert client.get("/inventory/valuation").json()["totals"]["units"] == first["totals"]["units"] - 3
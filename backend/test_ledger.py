@@ -0,0 +1,92 @@
+"""
+The daily ledger rollup, maintained record by record, always equals a full rebuild.
+"""
+from datetime import date
+from sqlalchemy import delete
+from app.core.database import SessionLocal, session_scope
+from app.crud import ledger as crud_ledger
+from app.models.ledger import DailyLedgerRollup
+
+day = date(2024, 3, 1)
+next_day = date(2024, 3, 2)
+
+def buckets(db):
+    return sorted(
+        (r.date, r.transaction_type, r.category, round(r.total_amount, 2), r.record_count)
+        for r in db.query(DailyLedgerRollup)
+    )
+
+def stored():
+    with SessionLocal() as db:
+        return buckets(db)
+
+def rebuilt():
+    """What rebuild() would produce, without keeping it."""
+    with SessionLocal() as db:
+        crud_ledger.rebuild(db)
+        rows = buckets(db)
+        db.rollback()
+    return rows
+
+def record(client, amount, on=day, transaction_type="Income", category="Sales"):
+    response = client.post("/financial/", json={
+        "date": str(on), "transaction_type": transaction_type, "category": category, "amount": amount
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+def test_incremental_buckets_match_rebuild(client):
+    a = record(client, 100)
+    b = record(client, 250)
+    c = record(client, 40, transaction_type="Expense", category="Fuel")
+    d = record(client, 15, category=None)
+    assert stored() == rebuilt() == [
+        (day, "Expense", "Fuel", 40.0, 1),
+        (day, "Income", "", 15.0, 1),
+        (day, "Income", "Sales", 350.0, 2),
+    ]
+
+    for record_id, changes in [
+        (a, {"amount": 120}),
+        (b, {"date": str(next_day)}),
+        (c, {"transaction_type": "Income"}),
+        (d, {"category": "Sales"}),
+        (a, {"notes": "not a rollup field"}),
+    ]:
+        assert client.put(f"/financial/{record_id}", json=changes).status_code == 200
+        assert stored() == rebuilt(), changes
+
+    # Emptied buckets are removed rather than left at zero
+    assert (day, "Expense", "Fuel", 40.0, 1) not in stored()
+    client.delete(f"/financial/{b}")
+    assert stored() == rebuilt() == [
+        (day, "Income", "Fuel", 40.0, 1),
+        (day, "Income", "Sales", 135.0, 2),
+    ]
+    for record_id in (a, c, d):
+        client.delete(f"/financial/{record_id}")
+    assert stored() == rebuilt() == []
+
+def test_fallback_upsert_matches_rebuild(client, monkeypatch):
+    # Databases without ON CONFLICT use UPDATE, then INSERT for new buckets
+    monkeypatch.setattr(crud_ledger, "_upsert_insert", lambda db: None)
+    a = record(client, 10)
+    record(client, 20)
+    client.put(f"/financial/{a}", json={"date": str(next_day), "category": "Seeds"})
+    assert stored() == rebuilt() == [(day, "Income", "Sales", 20.0, 1), (next_day, "Income", "Seeds", 10.0, 1)]
+    client.delete(f"/financial/{a}")
+    assert stored() == rebuilt() == [(day, "Income", "Sales", 20.0, 1)]
+
+def test_backfill_only_fills_an_empty_rollup(client):
+    record(client, 5, on=next_day, category="Tools")
+    expected = stored()
+    with session_scope() as db:
+        crud_ledger.backfill_if_empty(db)
+    assert stored() == expected
+
+    with session_scope() as db:
+        db.execute(delete(DailyLedgerRollup))
+    for _ in range(2):
+        with session_scope() as db:
+            crud_ledger.backfill_if_empty(db)
+        assert stored() == expected
@@ -0,0 +1,105 @@
+"""
+Check the background mail queue against the local SMTP stand-in.
+"""
+import time
+
+import pytest
+from smtp_standin import StandInSMTPServer
+from app.core import email
+from app.core.database import session_scope
+from app.core.email import MailQueue, build_login_notification
+from app.core.security import hash_password
+from app.models.user import User
+
+
+@pytest.fixture(scope="module")
+def smtp_server():
+    server = StandInSMTPServer().start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def mail_queue(smtp_server, monkeypatch):
+    """A queue with SMTP credentials in place of the app's (normally unconfigured) one."""
+    mail = make_queue(smtp_server)
+    monkeypatch.setattr(email, "mail_queue", mail)
+    yield mail
+    mail.stop()
+
+def make_queue(smtp_server, **options):
+    return MailQueue("127.0.0.1", smtp_server.port, "crm@example.com", "secret",
+                     starttls=False, batch_wait=0.05, backoff=0.01, **options)
+
+def reset_server(smtp_server):
+    smtp_server.messages.clear()
+    smtp_server.connections = 0
+    smtp_server.fail_data = smtp_server.drop_data = 0
+    smtp_server.delay = 0.0
+
+def test_messages_share_one_connection(smtp_server):
+    reset_server(smtp_server)
+    mail = make_queue(smtp_server, batch_size=10)
+    for i in range(25):
+        assert mail.enqueue(build_login_notification(f"user{i}@example.com", "crm@example.com"))
+    assert mail.flush(timeout=10)
+    mail.stop()
+    stats = mail.stats()
+    assert len(smtp_server.messages) == 25
+    assert stats["sent"] == 25 and stats["failed"] == 0
+    assert stats["connections"] == 1 and smtp_server.connections == 1
+    assert stats["batches"] >= 3
+
+def test_transient_failures_are_retried(smtp_server):
+    reset_server(smtp_server)
+    smtp_server.fail_data = 2
+    smtp_server.drop_data = 1
+    mail = make_queue(smtp_server)
+    for i in range(3):
+        mail.enqueue(build_login_notification(f"retry{i}@example.com", "crm@example.com"))
+    assert mail.flush(timeout=10)
+    mail.stop()
+    stats = mail.stats()
+    assert len(smtp_server.messages) == 3
+    assert stats["sent"] == 3 and stats["retries"] == 3 and stats["failed"] == 0
+
+def test_gives_up_after_max_attempts(smtp_server):
+    reset_server(smtp_server)
+    smtp_server.fail_data = 10
+    mail = make_queue(smtp_server, max_attempts=3)
+    mail.enqueue(build_login_notification("never@example.com", "crm@example.com"))
+    assert mail.flush(timeout=10)
+    mail.stop()
+    assert mail.stats()["failed"] == 1 and mail.stats()["retries"] == 2
+    assert smtp_server.messages == []
+
+def test_unexpected_errors_cost_only_their_message(smtp_server):
+    reset_server(smtp_server)
+    mail = make_queue(smtp_server)
+    mail.enqueue(build_login_notification("before@example.com", "crm@example.com"))
+    mail.enqueue("not a message")  # send_message raises AttributeError
+    mail.enqueue(build_login_notification("after@example.com", "crm@example.com"))
+    assert mail.flush(timeout=10)
+    assert mail.stats()["sent"] == 2 and mail.stats()["failed"] == 1
+    # The worker is still running
+    mail.enqueue(build_login_notification("later@example.com", "crm@example.com"))
+    assert mail.flush(timeout=10)
+    mail.stop()
+    assert [rcpts for _, rcpts, _ in smtp_server.messages] == [
+        ["before@example.com"], ["after@example.com"], ["later@example.com"]
+    ]
+
+def test_token_returns_before_the_mail_is_sent(client, smtp_server, mail_queue):
+    reset_server(smtp_server)
+    smtp_server.delay = 1.0
+    with session_scope() as db:
+        db.add(User(username="ada", email="ada@example.com", hashed_password=hash_password("pw")))
+
+    start = time.perf_counter()
+    response = client.post("/token", data={"username": "ada", "password": "pw"})
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200
+    assert elapsed < 0.5, f"/token waited {elapsed:.2f}s for SMTP"
+
+    assert mail_queue.flush(timeout=10)
+    assert [rcpts for _, rcpts, _ in smtp_server.messages] == [["ada@example.com"]]
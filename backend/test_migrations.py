@@ -0,0 +1,35 @@
+"""
+Upgrading a database created before schema versioning.
+"""
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from app.core import migrations
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    yield engine
+    engine.dispose()
+
+def test_legacy_tables_gain_the_released_columns(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE customers (id INTEGER PRIMARY KEY, customer_name VARCHAR NOT NULL, phone_number VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO customers (customer_name, phone_number) VALUES ('Ada Obi', '+234 803 000 0001')"))
+
+    assert migrations.upgrade(legacy_engine) == migrations.LATEST_VERSION
+    columns = {c["name"] for c in inspect(legacy_engine).get_columns("customers")}
+    assert set(migrations.LEGACY_COLUMNS["customers"]) | {"phone_key", "primary_record_id"} <= columns
+    with legacy_engine.connect() as conn:
+        assert conn.execute(text("SELECT phone_key FROM customers")).scalar() == "08030000001"
+    assert migrations.current_version(legacy_engine) == migrations.LATEST_VERSION
+
+def test_missing_required_columns_stop_the_upgrade(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE suppliers (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL)"))
+
+    with pytest.raises(RuntimeError, match="suppliers lacks the NOT NULL column.*supplier_name"):
+        migrations.upgrade(legacy_engine)
+    # Only the migration before it is stamped, and nothing was added to the table
+    assert migrations.current_version(legacy_engine) == 1
+    assert {c["name"] for c in inspect(legacy_engine).get_columns("suppliers")} == {"id", "name"}
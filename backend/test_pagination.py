@@ -0,0 +1,112 @@
+"""
+Keyset pagination: walking every page in either order returns each row exactly
+once, in the same order as ?all=true, including NULL dates and ties on the sort
+key; bad cursors and page sizes are client errors.
+"""
+from datetime import date
+import pytest
+from app.core.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, encode_cursor
+
+day = date(2024, 6, 1)
+later = date(2024, 6, 2)
+
+def walk(client, path, **params):
+    """Every page of `path`, following X-Next-Cursor until it is absent."""
+    pages, cursor = [], None
+    while True:
+        response = client.get(path, params=dict(params, **({"cursor": cursor} if cursor else {})))
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        assert len(pages) < 50, "pagination did not terminate"
+
+@pytest.fixture(scope="module")
+def campaigns(client):
+    # Three posts share a day, two share the next, and three have no date at all
+    post_dates = [day, later, None, day, later, None, day, None]
+    response = client.post("/marketing/bulk", json=[
+        {"platform": "Instagram", "post_date": str(d) if d else None, "description": f"post {i}"}
+        for i, d in enumerate(post_dates)
+    ])
+    assert response.status_code == 200, response.text
+    return [(c["id"], c["post_date"]) for c in response.json()["items"]]
+
+@pytest.fixture(scope="module")
+def customers(client):
+    response = client.post("/customers/bulk", json=[
+        {"customer_name": f"Customer {i}", "phone_number": f"0805000000{i}",
+         "purchase_date": str(day) if i % 2 else None}
+        for i in range(7)
+    ])
+    assert response.status_code == 200, response.text
+    return [c["id"] for c in response.json()["items"]]
+
+def expected_campaigns(campaigns, descending):
+    """(post_date, id) in the requested direction, NULL dates last either way."""
+    dated = sorted((c for c in campaigns if c[1]), key=lambda c: (c[1], c[0]), reverse=descending)
+    undated = sorted((c for c in campaigns if not c[1]), reverse=descending)
+    return [c[0] for c in dated + undated]
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("limit", [1, 2, 3, 8])
+def test_campaign_pages_cover_every_row_once(client, campaigns, order, limit):
+    pages = walk(client, "/marketing/", order=order, limit=limit)
+    ids = [c["id"] for page in pages for c in page]
+    assert ids == expected_campaigns(campaigns, order == "desc")
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 1 <= len(pages[-1]) <= limit
+
+    everything = client.get("/marketing/", params={"order": order, "all": "true"})
+    assert NEXT_CURSOR_HEADER not in everything.headers
+    assert [c["id"] for c in everything.json()] == ids
+
+    # Sparse rows page the same way (the cursor columns are selected even if not asked for)
+    sparse = walk(client, "/marketing/", order=order, limit=limit, fields="description")
+    assert [c["description"] for page in sparse for c in page] == [
+        c["description"] for page in pages for c in page
+    ]
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("fast", [False, True])
+def test_customer_pages_include_undated_purchases(client, customers, order, fast):
+    pages = walk(client, "/customers/", order=order, limit=3, fast=fast)
+    ids = [c["id"] for page in pages for c in page]
+    assert ids == sorted(customers, reverse=order == "desc")
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(c["purchase_date"] is None for page in pages for c in page) == 4
+
+def test_last_page_has_no_cursor(client, campaigns):
+    full = client.get("/marketing/", params={"limit": len(campaigns)})
+    assert len(full.json()) == len(campaigns)
+    assert NEXT_CURSOR_HEADER not in full.headers
+
+    short = client.get("/marketing/", params={"limit": len(campaigns) - 1})
+    cursor = short.headers[NEXT_CURSOR_HEADER]
+    last = client.get("/marketing/", params={"limit": len(campaigns) - 1, "cursor": cursor})
+    assert len(last.json()) == 1
+    assert NEXT_CURSOR_HEADER not in last.headers
+
+def test_page_size_is_bounded(client, campaigns):
+    assert client.get("/marketing/", params={"limit": MAX_PAGE_SIZE}).status_code == 200
+    for limit in (0, MAX_PAGE_SIZE + 1):
+        assert client.get("/marketing/", params={"limit": limit}).status_code == 422
+        assert client.get("/customers/", params={"limit": limit}).status_code == 422
+
+@pytest.mark.parametrize("path,cursor", [
+    ("/marketing/", "not a cursor!"),
+    ("/marketing/", "e30"),                              # {}
+    ("/marketing/", encode_cursor([1])),                 # missing the date
+    ("/marketing/", encode_cursor(["June", 1])),
+    ("/marketing/", encode_cursor([5, 1])),
+    ("/marketing/", encode_cursor([str(day), "one"])),
+    ("/customers/", encode_cursor([None])),
+    ("/customers/", encode_cursor([[1]])),
+    ("/customers/", encode_cursor([1, 2])),
+    ("/customers/", encode_cursor([10 ** 30])),
+])
+def test_malformed_cursors_are_rejected(client, path, cursor):
+    response = client.get(path, params={"cursor": cursor})
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,64 @@
+"""
+The password hashing pool sheds logins with a 503 once its queue is full,
+while sync callers hash directly; its counters are admin-only.
+"""
+import threading
+import time
+
+import pytest
+from app.core import security
+from app.core.database import session_scope
+from app.core.security import HashPool, hash_password, verify_password
+from app.models.user import User
+from app.routers import auth
+
+
+@pytest.fixture(scope="module", autouse=True)
+def users():
+    with session_scope() as db:
+        db.add(User(username="admin", email="admin@example.com", hashed_password=hash_password("pw"), is_admin=True))
+        db.add(User(username="staff", email="staff@example.com", hashed_password=hash_password("pw")))
+
+@pytest.fixture
+def full_pool(monkeypatch):
+    """A one-worker pool whose worker is busy and whose one queue slot is taken."""
+    pool = HashPool(workers=1, max_queue=1)
+    monkeypatch.setattr(security, "hash_pool", pool)
+    monkeypatch.setattr(auth, "hash_pool", pool)
+    gate = threading.Event()
+    pool.submit(gate.wait)
+    deadline = time.monotonic() + 5
+    while pool.running == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pool.submit(gate.wait)
+    assert (pool.running, pool.queued) == (1, 1)
+    yield pool
+    gate.set()
+    pool._executor.shutdown(wait=True)
+
+def login(client, username):
+    return client.post("/token", data={"username": username, "password": "pw"})
+
+def test_logins_are_shed_when_the_queue_is_full(client, full_pool):
+    response = login(client, "staff")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert full_pool.stats()["rejected"] == 1
+
+    # Scripts and crud code hash inline, so a busy pool never blocks or rejects them
+    assert verify_password("secret", hash_password("secret"))
+    assert full_pool.stats()["rejected"] == 1
+
+def test_pool_stats_require_an_admin(client):
+    assert client.get("/token/pool-stats").status_code == 401
+
+    staff = login(client, "staff").json()["access_token"]
+    response = client.get("/token/pool-stats", headers={"Authorization": f"Bearer {staff}"})
+    assert response.status_code == 400
+
+    admin = login(client, "admin").json()["access_token"]
+    response = client.get("/token/pool-stats", headers={"Authorization": f"Bearer {admin}"})
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["workers"] == security.hash_pool.workers
+    assert stats["completed"] >= 2
@@ -0,0 +1,69 @@
+"""
+Sales trend: SQL buckets, zero-filled calendar, downsampling, range limits.
+"""
+import random
+from datetime import date, timedelta
+from app.crud.dashboard import _bucket_start
+
+today = date.today()
+random.seed(18)
+
+def trend(client, **params):
+    response = client.get("/dashboard/sales-trend", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def seed(client):
+    # Scattered sales over three years, with long gaps; one expense to ignore
+    sales = {}
+    for _ in range(300):
+        d = today - timedelta(days=random.randint(0, 1095))
+        sales[d] = sales.get(d, 0) + 100
+    rows = [
+        {"date": str(d), "transaction_type": "Income", "amount": amount, "category": "Sales"}
+        for d, amount in sales.items()
+    ]
+    rows.append({"date": str(today), "transaction_type": "Expense", "amount": 999})
+    assert client.post("/financial/bulk", json=rows).status_code == 200
+    return sales
+
+def expected(sales, days, granularity):
+    start = today - timedelta(days=days)
+    totals = {}
+    for d, amount in sales.items():
+        if start <= d <= today:
+            key = _bucket_start(d, granularity).isoformat()
+            totals[key] = totals.get(key, 0) + amount
+    return totals
+
+def test_buckets_match_the_calendar(client):
+    sales = seed(client)
+    for granularity in ("day", "week", "month", "quarter"):
+        body = trend(client, days=900, granularity=granularity, points=1000)
+        assert body["granularity"] == granularity
+        assert not body["downsampled"]
+        series = dict(zip(body["dates"], body["amounts"]))
+        # Gaps are zero-filled, and nothing is lost or misplaced
+        assert sum(series.values()) == sum(expected(sales, 900, granularity).values())
+        for key, amount in expected(sales, 900, granularity).items():
+            assert series[key] == amount, (granularity, key)
+        assert body["dates"] == sorted(body["dates"])
+        assert body["dates"][0] == _bucket_start(today - timedelta(days=900), granularity).isoformat()
+
+    days = trend(client, days=30)
+    assert len(days["dates"]) == 31
+    assert days["dates"][-1] == today.isoformat()
+    assert days["amounts"][-1] == sales.get(today, 0)
+
+def test_long_ranges_are_downsampled(client):
+    body = trend(client, days=3650, points=100)
+    assert body["downsampled"]
+    assert len(body["dates"]) == len(body["amounts"]) == 100
+    full = trend(client, days=3650, points=1000)
+    # The biggest day survives downsampling
+    assert max(body["amounts"]) == max(full["amounts"]) or not full["downsampled"]
+
+def test_range_and_points_are_bounded(client):
+    assert client.get("/dashboard/sales-trend", params={"days": 100000}).status_code == 422
+    assert client.get("/dashboard/sales-trend", params={"points": 2}).status_code == 422
+    assert client.get("/dashboard/sales-trend", params={"granularity": "year"}).status_code == 422
@@ -0,0 +1,88 @@
+"""
+/search: partial matches across tables, ranking, paging and index sync.
+"""
+from datetime import date
+from types import SimpleNamespace
+from sqlalchemy import create_engine, inspect
+from app.core.pagination import encode_cursor
+from app.crud import search as crud_search
+
+def search(client, q, **params):
+    response = client.get("/search/", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response
+
+def hits(client, q, **params):
+    return [(r["type"], r["name"]) for r in search(client, q, **params).json()]
+
+def seed(client):
+    customers = client.post("/customers/bulk", json=[
+        {"customer_name": "Adaeze Okafor", "phone_number": "08031234567", "address": "12 Palm Close, Enugu"},
+        {"customer_name": "Tunde Bello", "phone_number": "07019876543", "notes": "Friend of Adaeze"},
+    ]).json()["items"]
+    client.post("/suppliers/", json={"supplier_name": "Palm Agro Ltd", "product_supplied": "Compost"})
+    client.post("/inventory/", json={"item_name": "Palm seedling", "cost_price": 1, "selling_price": 2})
+    client.post("/deliveries/", json={"date": str(date.today()), "customer_name": "Tunde Bello", "location": "Enugu"})
+    return customers
+
+def test_partial_matches_across_tables(client):
+    customers = seed(client)
+    assert hits(client, "okaf") == [("customer", "Adaeze Okafor")]
+    # Partial phone number
+    assert hits(client, "1234") == [("customer", "Adaeze Okafor")]
+    assert {kind for kind, _ in hits(client, "palm")} == {"customer", "supplier", "inventory"}
+    # Every term must match
+    assert hits(client, "tunde enugu") == [("delivery", "Tunde Bello")]
+    # A name match outranks a mention in the notes
+    assert hits(client, "adaeze")[0] == ("customer", "Adaeze Okafor")
+    result = search(client, "adaeze").json()[0]
+    assert result["id"] == customers[0]["id"]
+    assert "08031234567" in result["details"]
+
+def test_short_queries_are_rejected(client):
+    assert client.get("/search/", params={"q": "ab"}).status_code == 400
+
+def test_pages_follow_the_cursor(client):
+    first = search(client, "palm", limit=2)
+    cursor = first.headers["X-Next-Cursor"]
+    second = search(client, "palm", limit=2, cursor=cursor)
+    assert "X-Next-Cursor" not in second.headers
+    names = [r["name"] for r in first.json() + second.json()]
+    assert len(names) == len(set(names)) == 3
+
+def test_forged_cursors_are_rejected(client):
+    for values in (["x"], [-5], [None], [10 ** 30], [1, 2]):
+        cursor = encode_cursor(values)
+        response = client.get("/search/", params={"q": "palm", "cursor": cursor})
+        assert response.status_code == 400, values
+    assert client.get("/search/", params={"q": "palm", "cursor": "%%%"}).status_code == 400
+
+def test_index_follows_writes(client):
+    customer = search(client, "okafor").json()[0]
+    client.put(f"/customers/{customer['id']}", json={"customer_name": "Adaeze Nwosu"})
+    assert hits(client, "okafor") == []
+    assert hits(client, "nwosu") == [("customer", "Adaeze Nwosu")]
+    client.delete(f"/customers/{customer['id']}")
+    assert hits(client, "nwosu") == []
+
+def test_old_sqlite_skips_the_index(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(crud_search, "sqlite3", SimpleNamespace(sqlite_version="3.31.1", sqlite_version_info=(3, 31, 1)))
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        crud_search.create_search_index(conn)
+    assert not inspect(engine).has_table("search_index")
+    engine.dispose()
+    assert "SQLite 3.31.1 has no FTS5 trigram tokenizer" in capsys.readouterr().out
+
+def test_scan_without_the_index_matches_and_ranks(client, monkeypatch):
+    monkeypatch.setattr(crud_search, "_fts_index_exists", lambda db: False)
+    client.post("/customers/bulk", json=[
+        {"customer_name": "Chiamaka Eze", "phone_number": "08065554321", "address": "4 Mango Lane, Owerri"},
+        {"customer_name": "Musa Danjuma", "phone_number": "08129990000", "notes": "Neighbour of Chiamaka"},
+    ])
+    client.post("/deliveries/", json={"date": str(date.today()), "customer_name": "Musa Danjuma", "location": "Owerri"})
+    assert hits(client, "5543") == [("customer", "Chiamaka Eze")]
+    assert hits(client, "musa owerri") == [("delivery", "Musa Danjuma")]
+    # The name match comes before the mention in Musa's notes
+    assert hits(client, "chiamaka") == [("customer", "Chiamaka Eze"), ("customer", "Musa Danjuma")]
+    assert [r["score"] for r in search(client, "chiamaka").json()] == [1.0, 0.0]
@@ -0,0 +1,85 @@
+"""
+?fields= returns only the requested fields and selects only their columns.
+"""
+from datetime import date, timedelta
+
+def seed(client):
+    client.post("/customers/bulk", json=[
+        {"customer_name": f"Customer {i}", "phone_number": f"080{i:08d}", "total_amount": 100 * i,
+         "purchase_date": str(date.today() - timedelta(days=i % 7)), "address": "12 Long Garden Road",
+         "notes": "Call before delivery " * 10}
+        for i in range(1, 40)
+    ])
+    client.post("/deliveries/bulk", json=[
+        {"date": str(date.today() - timedelta(days=i % 4)), "customer_name": f"Customer {i}", "notes": "Gate code 1234"}
+        for i in range(25)
+    ])
+    client.post("/marketing/bulk", json=[
+        {"platform": "Instagram", "post_date": str(date.today() - timedelta(days=i % 3)) if i % 4 else None}
+        for i in range(25)
+    ])
+    client.post("/suppliers/bulk", json=[{"supplier_name": f"Supplier {i}", "contact": "0809"} for i in range(25)])
+    client.post("/inventory/bulk", json=[
+        {"item_name": f"Item {i}", "cost_price": 10, "selling_price": 15, "quantity_in_stock": i} for i in range(25)
+    ])
+
+def pages(client, path, **params):
+    """Every page of a list endpoint, following the cursor header."""
+    items, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        items += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items
+
+def trimmed(items, fields):
+    return [{name: item[name] for name in fields} for item in items]
+
+def test_lists_return_only_the_requested_fields(client):
+    seed(client)
+    for path, fields in [
+        ("/customers/", ["customer_name", "phone_number", "payment_status", "purchase_date"]),
+        ("/financial/", ["amount", "customer_name"]),
+        ("/deliveries/", ["customer_name"]),
+        ("/marketing/", ["platform"]),
+        ("/suppliers/", ["supplier_name", "balance"]),
+        ("/inventory/", ["item_name", "selling_price"]),
+    ]:
+        full = client.get(path, params={"all": "true"}).json()
+        sparse = client.get(path, params={"all": "true", "fields": ",".join(fields)})
+        assert sparse.status_code == 200, sparse.text
+        assert sparse.json() == trimmed(full, fields), path
+        # Paging works even though the cursor's columns weren't asked for
+        assert pages(client, path, fields=",".join(fields), limit=6) == trimmed(full, fields), path
+
+def test_detail_returns_only_the_requested_fields(client):
+    full = client.get("/customers/3").json()
+    sparse = client.get("/customers/3", params={"fields": "customer_name,total_amount"})
+    assert sparse.json() == {"customer_name": full["customer_name"], "total_amount": full["total_amount"]}
+    record = client.get("/financial/", params={"limit": 1}).json()[0]
+    assert client.get(f"/financial/{record['id']}", params={"fields": "customer_name"}).json() == {
+        "customer_name": record["customer_name"]
+    }
+    assert client.get("/suppliers/9999", params={"fields": "supplier_name"}).status_code == 404
+
+def test_unknown_fields_are_rejected(client):
+    response = client.get("/customers/", params={"fields": "customer_name,phone_key"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["fields"] == ["phone_key"]
+    assert client.get("/customers/1", params={"fields": ","}).status_code == 400
+
+def test_only_the_requested_columns_are_selected(client, count_queries):
+    with count_queries() as statements:
+        client.get("/customers/", params={"fields": "customer_name,phone_number", "all": "true"})
+    assert len(statements) == 1
+    assert "customers.notes" not in statements[0] and "customers.address" not in statements[0]
+    # The customers table is only joined when customer_name is asked for
+    with count_queries() as statements:
+        client.get("/financial/", params={"fields": "amount", "limit": 5})
+    assert "JOIN customers" not in statements[0]
+    with count_queries() as statements:
+        client.get("/financial/1", params={"fields": "customer_name"})
+    assert "LEFT OUTER JOIN customers" in statements[0]
+    assert "financial_records.notes" not in statements[0]
@@ -0,0 +1,62 @@
+"""
+Check that each write request is a single transaction.
+"""
+from contextlib import contextmanager
+from datetime import date
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.database import engine
+from app.crud import financial as crud_financial
+
+@contextmanager
+def count_commits():
+    commits = []
+    listener = lambda conn: commits.append(conn)
+    event.listen(engine, "commit", listener)
+    try:
+        yield commits
+    finally:
+        event.remove(engine, "commit", listener)
+
+def new_customer(name, amount=1500):
+    return {
+        "customer_name": name,
+        "phone_number": "08000000000",
+        "total_amount": amount,
+        "purchase_date": str(date.today())
+    }
+
+def test_create_customer_commits_once(client):
+    with count_commits() as commits:
+        response = client.post("/customers/", json=new_customer("Ada"))
+    assert response.status_code == 200
+    customer_id = response.json()["id"]
+    records = client.get("/financial/", params={"customer_id": customer_id}).json()
+    assert len(records) == 1
+    assert len(commits) == 1, f"expected 1 commit, got {len(commits)}"
+
+def test_failed_request_rolls_back_everything(client):
+    before = len(client.get("/customers/", params={"all": "true"}).json())
+    original = crud_financial.create_record
+
+    def failing_create_record(db, data):
+        raise RuntimeError("simulated failure after the customer was flushed")
+
+    crud_financial.create_record = failing_create_record
+    try:
+        with TestClient(app, raise_server_exceptions=False) as failing_client:
+            response = failing_client.post("/customers/", json=new_customer("Bola"))
+    finally:
+        crud_financial.create_record = original
+    assert response.status_code == 500
+    after = len(client.get("/customers/", params={"all": "true"}).json())
+    assert after == before, "customer insert was not rolled back"
+
+def test_delete_customer_unlinks_and_deletes_in_one_commit(client):
+    customer_id = client.post("/customers/", json=new_customer("Chidi")).json()["id"]
+    with count_commits() as commits:
+        response = client.delete(f"/customers/{customer_id}")
+    assert response.status_code == 200
+    assert len(commits) == 1, f"expected 1 commit, got {len(commits)}"
+    assert client.get("/financial/", params={"customer_id": customer_id}).json() == []
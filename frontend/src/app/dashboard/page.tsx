@@ -43,6 +43,12 @@ interface SalesTrendData {
   amount: number;
 }
 
+// /dashboard/sales-trend answers in columns: { dates: [...], amounts: [...] }
+interface SalesTrendSeries {
+  dates: string[];
+  amounts: number[];
+}
+
 interface ExpenseBreakdown {
   category: string;
   amount: number;
@@ -72,7 +78,8 @@ export default function DashboardPage() {
       ]);
 
       setStats(statsRes.data);
-      setSalesTrend(trendRes.data);
+      const trend: SalesTrendSeries = trendRes.data;
+      setSalesTrend(trend.dates.map((date, i) => ({ date, amount: trend.amounts[i] })));
       setExpenseBreakdown(breakdownRes.data);
     } catch (error) {
       console.error("Failed to fetch dashboard data:", error);
@@ -78,7 +78,8 @@ export const invoicesAPI = {
 }
 
 export const inventoryAPI = {
-  getAll: () => api.get('/inventory/'),
+  // all=true: the list endpoints return one page (X-Next-Cursor) by default
+  getAll: () => api.get('/inventory/', { params: { all: true } }),
   getById: (id: number) => api.get(`/inventory/${id}`),
   create: (data: any) => api.post('/inventory/', data),
   update: (id: number, data: any) => api.put(`/inventory/${id}`, data),
@@ -86,15 +87,16 @@ export const inventoryAPI = {
 }
 
 export const customerAPI = {
-  getAll: () => api.get('/customers/'),
+  getAll: (params?: { fields?: string }) => api.get('/customers/', { params: { all: true, ...params } }),
   getById: (id: number) => api.get(`/customers/${id}`),
+  getSummary: (id: number) => api.get(`/customers/${id}/summary`),
   create: (data: any) => api.post('/customers/', data),
   update: (id: number, data: any) => api.put(`/customers/${id}`, data),
   delete: (id: number) => api.delete(`/customers/${id}`),
 }
 
 export const financialAPI = {
-  getAll: () => api.get('/financial/'),
+  getAll: () => api.get('/financial/', { params: { all: true } }),
   getById: (id: number) => api.get(`/financial/${id}`),
   create: (data: any) => api.post('/financial/', data),
   update: (id: number, data: any) => api.put(`/financial/${id}`, data),
@@ -109,3 +111,8 @@ export const dashboardAPI = {
 }
 
 
+
+export const searchAPI = {
+  search: (q: string, params?: { limit?: number; cursor?: string }) =>
+    api.get('/search/', { params: { q, ...params } }),
+}